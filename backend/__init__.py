@@ -20,6 +20,8 @@ from .viewer import (
     login_linkedin,
     scrape_posts,
     extract_post_content,
+    extract_posts_batch,
+    extract_posts_windowed,
     construct_posts_url
 )
 
@@ -30,5 +32,7 @@ __all__ = [
     "login_linkedin",
     "scrape_posts",
     "extract_post_content",
+    "extract_posts_batch",
+    "extract_posts_windowed",
     "construct_posts_url"
 ]
\ No newline at end of file
@@ -0,0 +1,200 @@
+# auth_store.py
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # persisted sessions are disabled without cryptography
+    Fernet = None
+    InvalidToken = Exception
+
+logger = logging.getLogger(__name__)
+
+# Kept apart from the scrape output in linkedin_posts/, which is meant to be shared
+AUTH_STORE_DIR = os.environ.get("AUTH_STORE_DIR", ".auth")
+# Point at a local replay server (benchmarks/replay_server.py) for offline load tests
+LINKEDIN_URL = os.environ.get("LINKEDIN_URL", "https://www.linkedin.com").rstrip("/")
+LINKEDIN_HOST = urlparse(LINKEDIN_URL).hostname or ""
+LOGGED_OUT_MARKERS = ("/login", "/checkpoint", "/authwall", "/uas/login")
+COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "expiry", "sameSite")
+
+
+def account_key(email, password):
+    """Key for an account; includes the password so a wrong one never reuses a session."""
+    digest = hashlib.sha256(f"{email}\0{password}".encode()).hexdigest()[:16]
+    return f"{email.strip().lower()}:{digest}"
+
+
+def is_logged_out_url(url):
+    return any(marker in (url or "") for marker in LOGGED_OUT_MARKERS)
+
+
+def is_linkedin_url(url):
+    """True for LinkedIn URLs and URLs of the configured LINKEDIN_URL host."""
+    host = urlparse(url or "").hostname or ""
+    return 'linkedin.com' in (url or "") or (bool(host) and host == LINKEDIN_HOST)
+
+
+def is_linkedin_cookie(cookie):
+    domain = cookie.get('domain', '').lstrip('.')
+    return 'linkedin.com' in domain or domain == LINKEDIN_HOST
+
+
+def load_or_create_key(key_path):
+    """Fernet key from AUTH_STORE_KEY, else from key_path (created with mode 0600)."""
+    env_key = os.environ.get("AUTH_STORE_KEY")
+    if env_key:
+        return env_key.encode()
+    if os.path.exists(key_path):
+        with open(key_path, 'rb') as f:
+            return f.read().strip()
+    os.makedirs(os.path.dirname(key_path), exist_ok=True)
+    key = Fernet.generate_key()
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    return key
+
+
+class AuthStore:
+    """Encrypted on-disk LinkedIn cookies per account, so new drivers can skip the login form.
+
+    restore() loads the cookies into a fresh driver and checks them with one navigation
+    to the feed; save() is called after a login and after each successful scrape so the
+    stored session keeps LinkedIn's refreshed cookies. Files are Fernet-encrypted and
+    named by a hash of the account, never the email.
+    """
+
+    def __init__(self, root=AUTH_STORE_DIR, max_age=14 * 24 * 3600, validate_timeout=10):
+        self.root = root
+        self.max_age = max_age
+        self.validate_timeout = validate_timeout
+        self.lock = threading.Lock()
+        self.fernet = None
+        if Fernet is None:
+            logger.warning("cryptography is not installed; browser sessions will not be persisted")
+        else:
+            self.fernet = Fernet(load_or_create_key(os.path.join(root, ".key")))
+
+    @property
+    def enabled(self):
+        return self.fernet is not None
+
+    def restore(self, driver, account):
+        """Load the stored cookies for account into driver; True if the session is still logged in."""
+        session = self.load(account)
+        if not session:
+            return False
+
+        self._set_cookies(driver, session["cookies"])
+        driver.get(f"{LINKEDIN_URL}/feed/")
+        try:
+            WebDriverWait(driver, self.validate_timeout).until(
+                lambda d: is_logged_out_url(d.current_url) or d.find_elements(
+                    By.CSS_SELECTOR, 'div.feed-container-theme, main#main-content'
+                )
+            )
+        except TimeoutException:
+            pass
+        if is_logged_out_url(driver.current_url) or not driver.find_elements(
+            By.CSS_SELECTOR, 'div.feed-container-theme, main#main-content'
+        ):
+            logger.info("Stored LinkedIn session expired; logging in again")
+            self.forget(account)
+            return False
+
+        logger.info("Restored stored LinkedIn session")
+        return True
+
+    def save(self, driver, account):
+        """Persist the driver's current LinkedIn cookies for account."""
+        if not self.enabled:
+            return
+        if is_logged_out_url(driver.current_url):
+            return
+        cookies = [
+            {field: cookie[field] for field in COOKIE_FIELDS if field in cookie}
+            for cookie in driver.get_cookies()
+            if is_linkedin_cookie(cookie)
+        ]
+        if not cookies:
+            return
+
+        payload = self.fernet.encrypt(json.dumps({"saved_at": time.time(), "cookies": cookies}).encode())
+        path = self._path(account)
+        with self.lock:
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+    def load(self, account):
+        if not self.enabled:
+            return None
+        path = self._path(account)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                session = json.loads(self.fernet.decrypt(f.read()))
+        except (OSError, ValueError, InvalidToken) as e:
+            logger.warning(f"Ignoring unreadable stored session: {e}")
+            return None
+        if time.time() - session.get("saved_at", 0) > self.max_age:
+            return None
+        return session
+
+    def forget(self, account):
+        try:
+            os.remove(self._path(account))
+        except OSError:
+            pass
+
+    def _path(self, account):
+        return os.path.join(self.root, hashlib.sha256(account.encode()).hexdigest()[:32] + ".session")
+
+    def _set_cookies(self, driver, cookies):
+        # CDP sets cookies for any domain without loading a page first
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            for cookie in cookies:
+                params = {k: v for k, v in cookie.items() if k not in ("expiry", "sameSite")}
+                if "expiry" in cookie:
+                    params["expires"] = cookie["expiry"]
+                if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+                    params["sameSite"] = cookie["sameSite"]
+                driver.execute_cdp_cmd("Network.setCookie", params)
+            return
+        except Exception as e:
+            logger.debug(f"CDP cookie restore unavailable, falling back to add_cookie: {e}")
+
+        driver.get(f"{LINKEDIN_URL}/robots.txt")
+        for cookie in cookies:
+            try:
+                driver.add_cookie(cookie)
+            except Exception as e:
+                logger.debug(f"Skipping cookie {cookie.get('name')}: {e}")
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_auth_store():
+    """Process-wide AuthStore under AUTH_STORE_DIR."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = AuthStore()
+        return _default_store
@@ -0,0 +1,75 @@
+# driver_profiles.py
+"""Compare page-load and scroll time of the driver profiles against the local fixture feed.
+
+Run from backend/ (needs Chrome and chromedriver, no LinkedIn account):
+
+    python benchmarks/driver_profiles.py --posts 100 --runs 3
+"""
+import os
+import sys
+import time
+import json
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from viewer import setup_driver, load_posts, DRIVER_PROFILES
+from fixture_server import start_fixture_server
+
+
+def measure(profile, feed_url, posts, headless=True):
+    driver = setup_driver(headless=headless, profile=profile)
+    try:
+        started = time.time()
+        driver.get(feed_url)
+        page_load = time.time() - started
+
+        scroll_stats = load_posts(driver, posts, max_scrolls=posts, idle_timeout=3.0)
+        transferred = driver.execute_script(
+            "return performance.getEntriesByType('resource')"
+            ".reduce((total, entry) => total + (entry.transferSize || 0), 0)"
+        )
+        return {
+            "page_load_seconds": round(page_load, 3),
+            "scroll_seconds": scroll_stats["seconds"],
+            "posts_loaded": scroll_stats["posts_loaded"],
+            "transferred_kb": round((transferred or 0) / 1024, 1),
+        }
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    feed_url = f"{base_url}/feed.html?posts={args.posts}"
+    results = {}
+    try:
+        for profile in DRIVER_PROFILES:
+            runs = [measure(profile, feed_url, args.posts, headless=not args.headed) for _ in range(args.runs)]
+            results[profile] = {
+                key: statistics.median(run[key] for run in runs)
+                for key in runs[0]
+            }
+            print(f"{profile:>8}: {json.dumps(results[profile])}")
+    finally:
+        server.shutdown()
+
+    baseline = results["default"]
+    for profile, result in results.items():
+        if profile == "default":
+            continue
+        for key in ("page_load_seconds", "scroll_seconds"):
+            if baseline[key]:
+                change = (result[key] - baseline[key]) / baseline[key] * 100
+                print(f"{profile} {key}: {change:+.0f}% vs default")
+
+
+if __name__ == "__main__":
+    main()
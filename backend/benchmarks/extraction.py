@@ -0,0 +1,244 @@
+# extraction.py
+"""Offline extraction and session-save benchmarks, compared against a stored baseline.
+
+Runs the scraper against a fake driver serving fixtures/feed_snapshot.html (no
+Chrome, no LinkedIn account) and saves generated sessions of each size. Run from
+backend/:
+
+    python benchmarks/extraction.py                  # compare with benchmarks/baseline.json
+    python benchmarks/extraction.py --save-baseline  # record a new baseline
+    python benchmarks/extraction.py --posts 100 --sizes 30,1000
+
+Exits with status 1 if WebDriver calls per post went up at all. Those counts are
+deterministic for the same --posts; posts/sec and MB/s depend on the machine and
+load, so they are only shown next to the baseline. A baseline recorded with other
+--posts/--sizes/--round-trip-ms is not compared against (status 2).
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import contextlib
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+
+import viewer
+import selector_registry
+from fake_driver import FakeDriver, NullDownloader
+from session_fixtures import generate_posts
+
+BASELINE_PATH = os.path.join(BENCHMARKS_DIR, "baseline.json")
+PROFILE_URL = "https://www.linkedin.com/in/fixture-author/"
+
+# Shown for information only; wall-clock numbers are not comparable across machines
+THROUGHPUT_METRICS = ("posts_per_second", "modelled_posts_per_second", "mb_per_second", "json_mb_per_second")
+# Deterministic for the same parameters; any increase is a regression
+GATED_METRICS = ("calls_per_post",)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the scraper's per-post prints while timing it."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def fresh_selector_registry(workdir):
+    # Every run starts from the default selector order, so call counts are comparable
+    selector_registry._default_registry = selector_registry.SelectorRegistry(
+        path=os.path.join(workdir, "selector_stats.json"), save_interval=3600
+    )
+
+
+def run_extraction(name, posts, runs, workdir, extract, setup=None, round_trip_ms=2.0):
+    """Best of runs timings of extract(driver, downloader); calls are counted on the last run.
+
+    setup(driver) runs untimed first, e.g. to load the feed for the extraction-only cases.
+    The fake driver answers instantly, so modelled_posts_per_second adds round_trip_ms
+    per WebDriver call to approximate a real browser.
+    """
+    seconds = []
+    for _ in range(runs):
+        fresh_selector_registry(workdir)
+        driver = FakeDriver(total=posts)
+        downloader = NullDownloader()
+        if setup:
+            setup(driver)
+        driver.reset_counts()
+        started = time.perf_counter()
+        with quiet():
+            extracted = extract(driver, downloader)
+        seconds.append(time.perf_counter() - started)
+        if len(extracted) != posts:
+            raise RuntimeError(f"{name}: extracted {len(extracted)} of {posts} posts")
+    elapsed = min(seconds)
+    modelled = elapsed + driver.round_trips * round_trip_ms / 1000
+    return {
+        "posts": posts,
+        "seconds": round(elapsed, 4),
+        "posts_per_second": round(posts / elapsed, 1),
+        "modelled_posts_per_second": round(posts / modelled, 1),
+        "calls_per_post": round(driver.round_trips / posts, 3),
+        "calls": dict(sorted(driver.calls.items())),
+    }
+
+
+def extraction_benchmarks(posts, runs, workdir, round_trip_ms):
+    def loaded_elements(driver):
+        driver.get(PROFILE_URL)
+        driver.load_all()
+        driver.elements = driver.find_elements("css selector", "div.feed-shared-update-v2")
+
+    def per_element(driver, downloader):
+        return viewer.extract_post_elements(driver.elements, driver, "bench", downloader, batch=False)
+
+    def batched(driver, downloader):
+        return viewer.extract_post_elements(driver.elements, driver, "bench", downloader, batch=True)
+
+    def scrape(driver, downloader):
+        return viewer.scrape_posts(
+            driver, PROFILE_URL, scrolls=posts, max_posts=posts, session_id="bench",
+            downloader=downloader, scroll_idle_timeout=0
+        )
+
+    def scrape_windowed(driver, downloader):
+        return viewer.scrape_posts(
+            driver, PROFILE_URL, scrolls=posts, max_posts=posts, session_id="bench",
+            downloader=downloader, scroll_idle_timeout=0, window_size=10
+        )
+
+    cases = {
+        "extract_per_element": (per_element, loaded_elements),
+        "extract_batched": (batched, loaded_elements),
+        "scrape_posts": (scrape, None),
+        "scrape_posts_windowed": (scrape_windowed, None),
+    }
+    return {
+        name: run_extraction(name, posts, runs, workdir, extract, setup=setup, round_trip_ms=round_trip_ms)
+        for name, (extract, setup) in cases.items()
+    }
+
+
+def save_benchmarks(sizes, runs, workdir):
+    """Time main.save_scrape_results (session JSON plus SQLite index) per session size."""
+    os.chdir(workdir)
+    import main
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = {}
+    for size in sizes:
+        posts = generate_posts(size)
+        profiles = sorted({post["profile_url"] for post in posts})
+        encode_seconds, save_seconds = [], []
+        for run in range(runs if size <= 1000 else 1):
+            started = time.perf_counter()
+            encoded = json.dumps(posts, ensure_ascii=False).encode("utf-8")
+            encode_seconds.append(time.perf_counter() - started)
+
+            session_id = f"bench_{size}_{run}"
+            started = time.perf_counter()
+            main.save_scrape_results(session_id, posts, profiles, timings={})
+            save_seconds.append(time.perf_counter() - started)
+
+        path = os.path.join("linkedin_posts", f"linkedin_posts_{session_id}.json")
+        file_mb = os.path.getsize(path) / 1024 / 1024
+        save_elapsed = min(save_seconds)
+        encode_elapsed = min(encode_seconds)
+        results[f"save_session_{size}"] = {
+            "posts": size,
+            "seconds": round(save_elapsed, 4),
+            "posts_per_second": round(size / save_elapsed, 1),
+            "mb_per_second": round(file_mb / save_elapsed, 2),
+            "json_mb_per_second": round(len(encoded) / 1024 / 1024 / encode_elapsed, 2),
+            "file_mb": round(file_mb, 2),
+        }
+    return results
+
+
+def compare(results, baseline):
+    """Print every metric against the baseline; returns the list of gated regressions."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            print(f"{name:<24} (no baseline)")
+            continue
+        for metric in GATED_METRICS + THROUGHPUT_METRICS:
+            if metric not in result or not previous.get(metric):
+                continue
+            change = (result[metric] - previous[metric]) / previous[metric]
+            regressed = metric in GATED_METRICS and result[metric] > previous[metric] + 1e-9
+            flag = "  REGRESSION" if regressed else ("" if metric in GATED_METRICS else "  (info)")
+            print(f"{name:<24} {metric:<20} {previous[metric]:>12} -> {result[metric]:>12} ({change:+.0%}){flag}")
+            if regressed:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=200, help="posts per extraction benchmark")
+    parser.add_argument("--sizes", default="30,1000,100000", help="session sizes to save")
+    parser.add_argument("--runs", type=int, default=5, help="runs per benchmark; the fastest counts")
+    parser.add_argument("--round-trip-ms", type=float, default=2.0, help="modelled WebDriver call latency")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    parameters = {"posts": args.posts, "sizes": sizes, "round_trip_ms": args.round_trip_ms}
+    workdir = tempfile.mkdtemp(prefix="scraper-bench-")
+    cwd = os.getcwd()
+    try:
+        results = extraction_benchmarks(args.posts, args.runs, workdir, args.round_trip_ms)
+        for name, result in results.items():
+            print(f"{name:<24} {result['posts_per_second']:>10} posts/s  {result['calls_per_post']:>7} calls/post  "
+                  f"({result['modelled_posts_per_second']} posts/s at {args.round_trip_ms}ms per call)")
+        results.update(save_benchmarks(sizes, args.runs, workdir))
+        for name, result in results.items():
+            if name.startswith("save_session_"):
+                print(f"{name:<24} {result['posts_per_second']:>10} posts/s  {result['mb_per_second']:>7} MB/s  "
+                      f"(json encode {result['json_mb_per_second']} MB/s)")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "parameters": parameters,
+                "results": results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; run with --save-baseline")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("parameters") != parameters:
+        print(f"\nThe baseline was recorded with {baseline.get('parameters')}, this run used {parameters}; "
+              f"not comparing. Rerun with the baseline's parameters or use --save-baseline.")
+        return 2
+    print()
+    regressions = compare(results, baseline["results"])
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,524 @@
+# fake_driver.py
+"""A WebDriver stand-in that serves a recorded feed snapshot and counts round trips.
+
+The snapshot is parsed with html.parser into a small DOM, and a subset of CSS
+(tag, .class, #id, [attr], [attr=v], [attr*=v], [attr^=v], [attr$=v], descendant
+and child combinators, selector lists) covers every selector the scraper uses.
+The scripts viewer.py runs with execute_script are recognised and answered by
+Python ports of the same logic, so the scraper code runs unchanged. Every call
+that would be a WebDriver round trip is counted in driver.calls.
+"""
+import os
+import re
+import copy
+from collections import Counter
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+
+import viewer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SNAPSHOT_PATH = os.path.join(FIXTURES_DIR, "feed_snapshot.html")
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+BLOCK_TAGS = {"div", "p", "br", "li", "ul", "ol", "article", "section", "main", "header", "footer", "h1", "h2", "h3"}
+URN_PATTERN = re.compile(r"urn:li:(?:activity|ugcPost|share):\d+")
+ACTIVITY_ID_PATTERN = re.compile(r"(urn:li:(?:activity|ugcPost|share):)(\d+)")
+
+
+class Node:
+    def __init__(self, tag, attrs=None, parent=None, text=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.parent = parent
+        self.children = []
+        self.text = text
+
+    @property
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+    def descendants(self):
+        for child in self.children:
+            if child.tag is not None:
+                yield child
+                yield from child.descendants()
+
+    def inner_text(self):
+        parts = []
+        self._collect_text(parts)
+        lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def _collect_text(self, parts):
+        if self.tag is None:
+            parts.append(self.text)
+            return
+        if self.attrs.get("style", "").replace(" ", "") == "display:none":
+            return
+        for child in self.children:
+            child._collect_text(parts)
+        if self.tag in BLOCK_TAGS:
+            parts.append("\n")
+
+    def clone(self, parent=None):
+        node = copy.copy(self)
+        node.attrs = dict(self.attrs)
+        node.parent = parent
+        node.children = [child.clone(node) for child in self.children]
+        return node
+
+
+class DomBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#document")
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value or "" for name, value in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(Node(tag, {name: value or "" for name, value in attrs}, self.current))
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(Node(None, parent=self.current, text=data))
+
+
+def parse_html(html):
+    builder = DomBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# --- CSS selectors ---------------------------------------------------------------
+
+COMPOUND_PART = re.compile(
+    r"""(?P<tag>^[a-zA-Z*][\w-]*)|\.(?P<cls>[\w-]+)|\#(?P<id>[\w-]+)"""
+    r"""|\[(?P<attr>[\w-]+)(?:(?P<op>[*^$~]?=)(?P<quote>["']?)(?P<value>.*?)(?P=quote))?\]"""
+)
+
+
+def split_outside_brackets(text, separators):
+    parts, current, depth, quote = [], "", 0, None
+    for char in text:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "\"'":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif depth == 0 and char in separators:
+            parts.append(current)
+            current = ""
+            if char == ">":
+                parts.append(">")
+            continue
+        current += char
+    parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_compound(text):
+    tests, position = [], 0
+    while position < len(text):
+        match = COMPOUND_PART.match(text, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Unsupported selector: {text}")
+        tests.append(match)
+        position = match.end()
+    return tests
+
+
+_selector_cache = {}
+
+
+def parse_selector(selector):
+    """Selector list -> list of complex selectors, each a list of (combinator, compound)."""
+    parsed = _selector_cache.get(selector)
+    if parsed is None:
+        parsed = []
+        for complex_selector in split_outside_brackets(selector, ","):
+            steps, combinator = [], " "
+            for token in split_outside_brackets(complex_selector, " >"):
+                if token == ">":
+                    combinator = ">"
+                    continue
+                steps.append((combinator, parse_compound(token)))
+                combinator = " "
+            parsed.append(steps)
+        _selector_cache[selector] = parsed
+    return parsed
+
+
+def matches_compound(node, tests):
+    for test in tests:
+        if test.group("tag"):
+            if test.group("tag") != "*" and node.tag != test.group("tag").lower():
+                return False
+        elif test.group("cls"):
+            if test.group("cls") not in node.classes:
+                return False
+        elif test.group("id"):
+            if node.attrs.get("id") != test.group("id"):
+                return False
+        else:
+            value = node.attrs.get(test.group("attr"))
+            if value is None:
+                return False
+            op, expected = test.group("op"), test.group("value")
+            if op == "=" and value != expected:
+                return False
+            if op == "*=" and expected not in value:
+                return False
+            if op == "^=" and not value.startswith(expected):
+                return False
+            if op == "$=" and not value.endswith(expected):
+                return False
+            if op == "~=" and expected not in value.split():
+                return False
+    return True
+
+
+def matches_steps(node, steps):
+    combinator, tests = steps[-1]
+    if not matches_compound(node, tests):
+        return False
+    if len(steps) == 1:
+        return True
+    ancestor = node.parent
+    while ancestor is not None and ancestor.tag != "#document":
+        if matches_steps(ancestor, steps[:-1]):
+            return True
+        if combinator == ">":
+            return False
+        ancestor = ancestor.parent
+    return False
+
+
+def matches(node, selector):
+    return any(matches_steps(node, steps) for steps in parse_selector(selector))
+
+
+def select_all(root, selector):
+    parsed = parse_selector(selector)
+    return [node for node in root.descendants() if any(matches_steps(node, steps) for steps in parsed)]
+
+
+def select_one(root, selector):
+    parsed = parse_selector(selector)
+    for node in root.descendants():
+        if any(matches_steps(node, steps) for steps in parsed):
+            return node
+    return None
+
+
+def closest(node, selector):
+    while node is not None and node.tag != "#document":
+        if matches(node, selector):
+            return node
+        node = node.parent
+    return None
+
+
+# --- WebDriver ---------------------------------------------------------------------
+
+class FakeElement:
+    def __init__(self, node, driver):
+        self.node = node
+        self.driver = driver
+
+    @property
+    def text(self):
+        self.driver.count("text")
+        return self.node.inner_text()
+
+    def get_attribute(self, name):
+        self.driver.count("get_attribute")
+        return self.node.attrs.get(name)
+
+    def find_element(self, by, value):
+        self.driver.count("find_element")
+        node = select_one(self.node, self.driver.css(by, value))
+        if node is None:
+            raise NoSuchElementException(value)
+        return self.driver.wrap(node)
+
+    def find_elements(self, by, value):
+        self.driver.count("find_elements")
+        return [self.driver.wrap(node) for node in select_all(self.node, self.driver.css(by, value))]
+
+    def click(self):
+        self.driver.count("click")
+
+
+class FakeDriver:
+    """Serves total posts cloned from the snapshot, page_size more after each scroll."""
+
+    def __init__(self, snapshot_path=SNAPSHOT_PATH, total=100, page_size=10):
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            self.snapshot = parse_html(f.read())
+        self.templates = select_all(self.snapshot, "div.feed-shared-update-v2")
+        self.feed = select_one(self.snapshot, ".scaffold-finite-scroll__content")
+        self.total = total
+        self.page_size = page_size
+        self.current_url = "about:blank"
+        self.calls = Counter()
+        self.posts = [self._clone_post(i) for i in range(total)]
+        self.wrappers = {}
+        self.get("about:blank")
+
+    def _clone_post(self, i):
+        template = self.templates[i % len(self.templates)]
+        post = template.clone()
+        offset = i // len(self.templates) * 1000003
+
+        def renumber(match):
+            return f"{match.group(1)}{int(match.group(2)) + offset}"
+
+        for node in [post] + list(post.descendants()):
+            for name, value in node.attrs.items():
+                if "urn:li:" in value:
+                    node.attrs[name] = ACTIVITY_ID_PATTERN.sub(renumber, value)
+        return post
+
+    def count(self, kind):
+        self.calls[kind] += 1
+
+    @property
+    def round_trips(self):
+        return sum(self.calls.values())
+
+    def reset_counts(self):
+        self.calls.clear()
+
+    def css(self, by, value):
+        if by == By.CSS_SELECTOR:
+            return value
+        if by == By.TAG_NAME:
+            return value
+        if by == By.ID:
+            return f"#{value}"
+        raise ValueError(f"FakeDriver does not support {by} lookups")
+
+    def wrap(self, node):
+        element = self.wrappers.get(id(node))
+        if element is None:
+            element = self.wrappers[id(node)] = FakeElement(node, self)
+        return element
+
+    # Navigation and lookups
+
+    def get(self, url):
+        self.count("get")
+        self.current_url = url
+        self.feed.children = []
+        self.loaded = 0
+        self._load_page()
+
+    def load_all(self):
+        """Append every remaining post, as if the feed had been scrolled to the end."""
+        while self.loaded < self.total:
+            self._load_page()
+
+    def _load_page(self):
+        for post in self.posts[self.loaded:self.loaded + self.page_size]:
+            post.parent = self.feed
+            self.feed.children.append(post)
+        self.loaded = min(self.total, self.loaded + self.page_size)
+
+    def find_element(self, by, value):
+        self.count("find_element")
+        node = select_one(self.snapshot, self.css(by, value))
+        if node is None:
+            raise NoSuchElementException(value)
+        return self.wrap(node)
+
+    def find_elements(self, by, value):
+        self.count("find_elements")
+        return [self.wrap(node) for node in select_all(self.snapshot, self.css(by, value))]
+
+    def get_cookies(self):
+        self.count("get_cookies")
+        return []
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def quit(self):
+        pass
+
+    # Scripts
+
+    def execute_script(self, script, *args):
+        self.count("execute_script")
+        handler = {
+            viewer.LOAD_STATE_JS: self._load_state,
+            viewer.WINDOW_STATE_JS: self._window_state,
+            viewer.RECYCLE_POSTS_JS: self._recycle_posts,
+            viewer.EXTRACT_POSTS_JS: self._extract_posts,
+            viewer.DERIVE_URNS_JS: self._derive_urns,
+        }.get(script)
+        if handler:
+            return handler(*args)
+        if "getAttribute('data-urn')" in script and args:
+            return [element.node.attrs.get("data-urn", "") for element in args[0]]
+        if "navigator.userAgent" in script:
+            return "Mozilla/5.0 (FakeDriver)"
+        return None
+
+    def _scroll(self):
+        if self.loaded < self.total:
+            self._load_page()
+
+    def _first_selector_match(self, selectors):
+        for selector in selectors:
+            found = select_all(self.snapshot, selector)
+            if found:
+                return found
+        return []
+
+    def _load_state(self, selectors, scroll, with_urns):
+        if scroll:
+            self._scroll()
+        state = {
+            "count": len(self._first_selector_match(selectors)),
+            "height": self.loaded * 600,
+            "empty": select_one(self.snapshot, ".artdeco-empty-state") is not None,
+        }
+        if with_urns:
+            state["urns"] = [node.attrs["data-urn"] for node in select_all(self.snapshot, '[data-urn*="activity:"]')]
+        return state
+
+    def _window_state(self, selectors, scroll, limit, done_attr):
+        if scroll:
+            self._scroll()
+        pending = [
+            node for node in self._first_selector_match(selectors)
+            if closest(node, f"[{done_attr}]") is None
+        ]
+        window = pending[:limit]
+        return {
+            "posts": [self.wrap(node) for node in window],
+            "urns": [node.attrs.get("data-urn", "") for node in window],
+            "pending": len(pending),
+            "height": self.loaded * 600,
+        }
+
+    def _recycle_posts(self, elements, done_attr):
+        for element in elements:
+            element.node.attrs[done_attr] = "1"
+            element.node.children = []
+            element.node.attrs["style"] = "display: none;"
+
+    def _derive_urns(self, elements):
+        return [find_urn(element.node) for element in elements]
+
+    def _extract_posts(self, elements, selectors):
+        stats = {field: [[0, 0, 0] for _ in selectors[field]] for field in ("author", "avatar", "content")}
+
+        def first_value(post, field, read):
+            for i, selector in enumerate(selectors[field]):
+                node = select_one(post, selector)
+                value = read(node) if node is not None else ""
+                stats[field][i][0] += 1
+                if value:
+                    stats[field][i][1] += 1
+                    return value
+            return ""
+
+        def avatar_src(node):
+            src = node.attrs.get("src", "")
+            return "" if "data:image" in src else src
+
+        posts = []
+        for element in elements:
+            post = element.node
+            fields = {
+                "author_name": first_value(post, "author", lambda node: node.inner_text().split("\n")[0]),
+                "author_avatar": first_value(post, "avatar", avatar_src),
+                "content": first_value(post, "content", Node.inner_text),
+                "timestamp": "",
+                "engagement": {},
+                "urn": find_urn(post),
+            }
+            time_node = select_one(post, selectors["time"])
+            if time_node is not None:
+                fields["timestamp"] = time_node.attrs.get("datetime") or time_node.inner_text()
+            reactions = select_one(post, selectors["reactions"])
+            if reactions is not None:
+                fields["engagement"]["reactions"] = reactions.inner_text()
+            comments = select_one(post, selectors["comments"])
+            if comments is not None:
+                fields["engagement"]["comments"] = comments.inner_text()
+            fields["images"] = [
+                {"src": img.attrs.get("src", ""), "alt": img.attrs.get("alt", ""), "classes": img.attrs.get("class", "")}
+                for img in select_all(post, "img")
+            ]
+            fields["videos"] = [video.attrs.get("src", "") for video in select_all(post, "video")]
+            fields["has_article"] = select_one(post, selectors["article"]) is not None
+            posts.append(fields)
+        return {"posts": posts, "selectorStats": stats}
+
+
+NESTED_UPDATE_SELECTOR = "[data-urn], .update-components-mini-update-v2, .feed-shared-mini-update-v2"
+
+
+def owned_by(post, node):
+    nested = closest(node, NESTED_UPDATE_SELECTOR)
+    return nested is None or nested is post or closest(post, NESTED_UPDATE_SELECTOR) is nested
+
+
+def find_urn(post):
+    """Port of FIND_URN_JS."""
+    holder = closest(post, '[data-urn*="urn:li:"]')
+    own = URN_PATTERN.search(holder.attrs.get("data-urn", "")) if holder is not None else None
+    if own:
+        return own.group(0)
+    for value in post.attrs.values():
+        match = URN_PATTERN.search(value)
+        if match:
+            return match.group(0)
+    for anchor in select_all(post, 'a[href*="urn:li:"], a[href*="/feed/update/"]'):
+        match = URN_PATTERN.search(unquote(anchor.attrs.get("href", "")))
+        if match and owned_by(post, anchor):
+            return match.group(0)
+    return ""
+
+
+class NullDownloader:
+    """MediaDownloader stand-in that only counts the media it is given."""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, post_data, url, media_index, driver):
+        self.submitted += 1
+
+    def add_local(self, post_data, media_index, local_path):
+        pass
+
+    def wait_for(self, posts):
+        pass
+
+    def when_done(self, post_data, callback):
+        callback(post_data)
+
+    def close(self):
+        pass
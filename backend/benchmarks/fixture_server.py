@@ -0,0 +1,63 @@
+# fixture_server.py
+import os
+import sys
+import time
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Sizes and latencies of the heavy resources the fixture feed references
+IMAGE_BYTES = 200 * 1024
+FONT_BYTES = 100 * 1024
+IMAGE_LATENCY = 0.05
+TRACKING_LATENCY = 0.2
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Serves fixtures/ plus synthetic images, fonts and tracking endpoints."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path.startswith("/img/"):
+            time.sleep(IMAGE_LATENCY)
+            self._send_bytes(b"\xff\xd8\xff" + b"\0" * IMAGE_BYTES, "image/jpeg")
+        elif path.startswith("/fonts/"):
+            self._send_bytes(b"\0" * FONT_BYTES, "font/woff2")
+        elif path.startswith("/li/track"):
+            time.sleep(TRACKING_LATENCY)
+            self._send_bytes(b"", "application/javascript")
+        else:
+            super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_bytes(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_fixture_server(port=0):
+    """Start the fixture server on a background thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server, base_url = start_fixture_server(port)
+    print(f"Serving fixture feed at {base_url}/feed.html?posts=100")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
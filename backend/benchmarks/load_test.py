@@ -0,0 +1,255 @@
+# load_test.py
+"""Concurrent /scrape load against the replay server: throughput, driver pool and API latency.
+
+Needs Chrome and chromedriver, like the scraper itself. Run from backend/:
+
+    python benchmarks/load_test.py --jobs 20 --concurrency 4        # starts replay server and API
+    python benchmarks/load_test.py --api http://127.0.0.1:8000 --replay http://127.0.0.1:8766
+
+With --api the API must already be running against the replay server (see
+replay_server.py); otherwise one is started with uvicorn in a temporary directory,
+so the load test never touches linkedin_posts/ or the saved browser sessions.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from replay_server import start_replay_server, add_site_arguments, site_options
+
+
+def percentiles(values):
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def at(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 4)
+
+    return {"count": len(ordered), "p50": at(0.5), "p90": at(0.9), "p99": at(0.99), "max": round(ordered[-1], 4)}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ApiClient:
+    """requests against the API, timing every call by endpoint."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.latencies = defaultdict(list)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def call(self, method, path, endpoint, **kwargs):
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        started = time.perf_counter()
+        response = session.request(method, self.base_url + path, timeout=60, **kwargs)
+        with self.lock:
+            self.latencies[endpoint].append(time.perf_counter() - started)
+        return response
+
+
+def start_api(replay_url, port, workdir, workers):
+    """uvicorn main:app in workdir, pointed at the replay server with rate limits out of the way."""
+    env = dict(
+        os.environ,
+        LINKEDIN_URL=replay_url,
+        LINKEDIN_MEDIA_HOSTS=urlparse(replay_url).netloc,
+        SCRAPE_WORKERS=str(workers),
+        SCRAPE_MAX_QUEUED="1000",
+        SCROLL_IDLE_TIMEOUT="2",
+        RATE_NAVIGATIONS_PER_MINUTE="6000",
+        RATE_SCROLLS_PER_SECOND="100",
+        RATE_INTERACTIONS_PER_SECOND="100",
+        RATE_MEDIA_PER_SECOND="1000",
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", BACKEND_DIR,
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API exited with status {process.returncode}")
+        try:
+            requests.get(base_url + "/drivers", timeout=2)
+            return process, base_url
+        except requests.ConnectionError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("API did not start within 60 seconds")
+
+
+def run_job(client, index, profile_urls, args, pool_samples):
+    """Submit one scrape job (waiting out 429s) and poll it to the end."""
+    body = {
+        "email": f"load{index % args.accounts}@example.com",
+        "password": "replay",
+        "profile_urls": profile_urls,
+        "scrolls": args.scrolls,
+        "max_posts": args.max_posts,
+        "force_refresh": not args.allow_cache,
+    }
+    submitted = time.perf_counter()
+    while True:
+        response = client.call("POST", "/scrape", "POST /scrape", json=body)
+        if response.status_code != 429:
+            break
+        time.sleep(1)
+    response.raise_for_status()
+    job_id = response.json()["job_id"]
+
+    while True:
+        time.sleep(args.poll_interval)
+        job = client.call("GET", f"/jobs/{job_id}", "GET /jobs/{id}").json()
+        pool_samples.append(client.call("GET", "/drivers", "GET /drivers").json())
+        if job["status"] not in ("queued", "running"):
+            break
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "posts": job["posts_scraped"],
+        "profiles_failed": sum(1 for profile in job["profiles"] if profile["status"] == "failed"),
+        "seconds": time.perf_counter() - submitted,
+        "error": job["error"],
+    }
+
+
+def in_use(snapshot):
+    return sum(state["in_use"] for profiles in snapshot.get("accounts", {}).values() for state in profiles.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--api", help="running API to load; default starts one")
+    parser.add_argument("--replay", help="running replay server; default starts one in-process")
+    parser.add_argument("--jobs", type=int, default=10, help="scrape jobs to run")
+    parser.add_argument("--concurrency", type=int, default=4, help="jobs submitted at once")
+    parser.add_argument("--workers", type=int, default=4, help="SCRAPE_WORKERS of a started API")
+    parser.add_argument("--accounts", type=int, default=2, help="distinct logins the jobs rotate through")
+    parser.add_argument("--profiles-per-job", type=int, default=1)
+    parser.add_argument("--max-posts", type=int, default=30)
+    parser.add_argument("--scrolls", type=int, default=10)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--allow-cache", action="store_true", help="let repeated profiles hit the result cache")
+    parser.add_argument("--out", help="write the report as JSON here")
+    parser.add_argument("--replay-port", type=int, default=0)
+    add_site_arguments(parser)
+    args = parser.parse_args()
+
+    replay_server = None
+    if args.replay:
+        replay_url = args.replay.rstrip("/")
+    else:
+        replay_server, replay_url = start_replay_server(args.replay_port, **site_options(args))
+    slugs = list(requests.get(replay_url + "/__replay/stats", timeout=10).json()["profiles"])
+    if not slugs:
+        print("The replay server has no profiles")
+        return 1
+
+    api_process = None
+    workdir = tempfile.mkdtemp(prefix="scraper-load-")
+    try:
+        if args.api:
+            api_url = args.api
+        else:
+            api_process, api_url = start_api(replay_url, free_port(), workdir, args.workers)
+        client = ApiClient(api_url)
+        pool_samples = []
+
+        def job_profiles(index):
+            start = index * args.profiles_per_job
+            return [f"{replay_url}/in/{slugs[(start + i) % len(slugs)]}/"
+                    for i in range(args.profiles_per_job)]
+
+        print(f"Running {args.jobs} jobs, {args.concurrency} at a time, against {api_url} (replay {replay_url})")
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = [executor.submit(run_job, client, i, job_profiles(i), args, pool_samples)
+                       for i in range(args.jobs)]
+            jobs = []
+            for future in futures:
+                try:
+                    jobs.append(future.result())
+                except Exception as e:
+                    jobs.append({"status": "client_error", "posts": 0, "profiles_failed": 0, "seconds": 0, "error": str(e)})
+        elapsed = time.perf_counter() - started
+
+        statuses = defaultdict(int)
+        for job in jobs:
+            statuses[job["status"]] += 1
+        posts = sum(job["posts"] for job in jobs)
+        drivers = client.call("GET", "/drivers", "GET /drivers").json()
+        report = {
+            "jobs": len(jobs),
+            "concurrency": args.concurrency,
+            "seconds": round(elapsed, 2),
+            "statuses": dict(statuses),
+            "posts": posts,
+            "profiles_failed": sum(job["profiles_failed"] for job in jobs),
+            "posts_per_second": round(posts / elapsed, 2) if elapsed else 0,
+            "job_seconds": percentiles([job["seconds"] for job in jobs if job["status"] != "client_error"]),
+            "api_latency": {endpoint: percentiles(values) for endpoint, values in sorted(client.latencies.items())},
+            "driver_pool": {
+                "max_per_account": drivers.get("max_per_account"),
+                "peak_in_use": max((in_use(sample) for sample in pool_samples), default=0),
+                "counters": {k: v for k, v in drivers.items()
+                             if k not in ("max_per_account", "max_uses", "max_memory_mb", "accounts")},
+                "accounts": drivers.get("accounts", {}),
+            },
+            "replay": requests.get(replay_url + "/__replay/stats", timeout=10).json()["requests"],
+            "errors": [job["error"] for job in jobs if job.get("error")][:10],
+        }
+    finally:
+        if api_process:
+            api_process.terminate()
+            try:
+                api_process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                api_process.kill()
+        if replay_server:
+            replay_server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{report['posts']} posts in {report['seconds']}s ({report['posts_per_second']} posts/s); "
+          f"jobs: {', '.join(f'{status}={count}' for status, count in report['statuses'].items())}; "
+          f"failed profiles: {report['profiles_failed']}")
+    print(f"job seconds: {report['job_seconds']}")
+    for endpoint, stats in report["api_latency"].items():
+        print(f"{endpoint:<16} {stats}")
+    print(f"driver pool: peak in use {report['driver_pool']['peak_in_use']}, {report['driver_pool']['counters']}")
+    print(f"replay requests: {report['replay']}")
+    for error in report["errors"]:
+        print(f"error: {error}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    return 0 if statuses.get("completed", 0) == len(jobs) and not report["profiles_failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
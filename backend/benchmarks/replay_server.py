@@ -0,0 +1,463 @@
+# replay_server.py
+"""Local LinkedIn stand-in that replays saved sessions, for end-to-end and load tests.
+
+Serves a login form, /feed/, and a lazily paginated /in/<slug>/recent-activity/all/
+for every profile found in linkedin_posts/linkedin_posts_*.json (or generated
+posts when there are none). Post images are served from the saved media_<id>/
+folders, and videos reach the page as blob: URLs like on LinkedIn. Latency and
+failures can be injected. Run from backend/:
+
+    python benchmarks/replay_server.py --port 8766 --latency 50 --error-rate 0.01
+
+then start the API against it:
+
+    LINKEDIN_URL=http://127.0.0.1:8766 LINKEDIN_MEDIA_HOSTS=127.0.0.1:8766 uvicorn main:app
+"""
+import os
+import re
+import sys
+import json
+import glob
+import html
+import time
+import random
+import secrets
+import argparse
+import threading
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from session_fixtures import generate_posts
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+POSTS_DIR = os.path.join(BACKEND_DIR, "linkedin_posts")
+ACTIVITY_ID_RE = re.compile(r"activity[:-](\d+)")
+PROFILE_SLUG_RE = re.compile(r"/in/([^/?#]+)")
+CONTENT_TYPES = {
+    ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png",
+    ".gif": "image/gif", ".mp4": "video/mp4",
+}
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>LinkedIn Login (replay)</title></head>
+<body>
+  <form method="post" action="/login">
+    <input id="username" name="session_key" type="text">
+    <input id="password" name="session_password" type="password">
+    <button type="submit">Sign in</button>
+  </form>
+</body></html>
+"""
+
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Feed (replay)</title></head>
+<body><main id="main-content"><div class="feed-container-theme">Replay feed</div></main></body></html>
+"""
+
+CHALLENGE_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Security Verification (replay)</title></head>
+<body><h1>Let's do a quick security check</h1></body></html>
+"""
+
+FEED_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Activity | {slug} (replay)</title>
+<style>.feed-shared-update-v2 {{ min-height: 400px; margin: 12px 0; }}</style></head>
+<body>
+<main id="main-content" class="scaffold-layout__main">
+  <div class="scaffold-finite-scroll__content">
+{posts}
+  </div>
+</main>
+<script>
+  // Next pages arrive after pageDelay ms once the user scrolls near the bottom
+  const feed = document.querySelector('.scaffold-finite-scroll__content');
+  const pageDelay = {page_delay};
+  let next = {next};
+  let done = {done};
+  let loading = false;
+
+  // LinkedIn plays videos from blob: URLs; fetch the file and hand the element one
+  function hydrateVideos(root) {{
+    root.querySelectorAll('video[data-replay-src]').forEach((video) => {{
+      const src = video.getAttribute('data-replay-src');
+      video.removeAttribute('data-replay-src');
+      fetch(src).then((r) => r.blob()).then((blob) => {{ video.src = URL.createObjectURL(blob); }});
+    }});
+  }}
+
+  function loadMore() {{
+    if (loading || done) return;
+    loading = true;
+    setTimeout(() => {{
+      fetch('page?start=' + next, {{credentials: 'same-origin'}})
+        .then((r) => {{
+          if (!r.ok) throw new Error('HTTP ' + r.status);
+          done = r.headers.get('X-Has-More') !== '1';
+          next += parseInt(r.headers.get('X-Count') || '0', 10);
+          return r.text();
+        }})
+        .then((fragment) => {{
+          feed.insertAdjacentHTML('beforeend', fragment);
+          hydrateVideos(feed);
+        }})
+        .catch(() => {{}})
+        .finally(() => {{ loading = false; }});
+    }}, pageDelay);
+  }}
+
+  window.addEventListener('scroll', () => {{
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 800) loadMore();
+  }});
+  hydrateVideos(document);
+</script>
+</body></html>
+"""
+
+EMPTY_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Activity (replay)</title></head>
+<body><main id="main-content"><div class="artdeco-empty-state">Nothing to see for now</div></main></body></html>
+"""
+
+
+def profile_slug(profile_url):
+    match = PROFILE_SLUG_RE.search(profile_url or "")
+    return match.group(1).lower() if match else None
+
+
+def media_route(local_path):
+    """Replay URL path for a saved media file: /dms/<kind>/<media dir>/<file>."""
+    kind = "video" if local_path.lower().endswith(".mp4") else "image"
+    return f"/dms/{kind}/{os.path.basename(os.path.dirname(local_path))}/{os.path.basename(local_path)}"
+
+
+def replay_post(post, activity_id):
+    """The fields the replay pages render for one saved post."""
+    local_paths = [path for path in post.get("local_media_paths") or [] if path]
+    media = [media_route(path) for path in local_paths]
+    if not media:
+        # Media that was never downloaded is served as synthetic bytes
+        for index, url in enumerate(post.get("media_urls") or []):
+            ext = "mp4" if "video" in url.lower() or "mp4" in url.lower() else "jpg"
+            kind = "video" if ext == "mp4" else "image"
+            media.append(f"/dms/{kind}/synthetic/{activity_id}-{index}.{ext}")
+    engagement = post.get("engagement") or {}
+    return {
+        "activity_id": activity_id,
+        "author_name": post.get("author_name") or "Replay Author",
+        "content": post.get("content") or "",
+        "timestamp": post.get("timestamp") or "",
+        "reactions": engagement.get("reactions", ""),
+        "comments": engagement.get("comments", ""),
+        "images": [path for path in media if path.startswith("/dms/image/")],
+        "videos": [path for path in media if path.startswith("/dms/video/")],
+    }
+
+
+def load_profiles(posts_dir=POSTS_DIR, posts_per_profile=None):
+    """{slug: [replay post]} from the saved sessions, newest first, deduplicated by activity id.
+
+    Without saved sessions three generated profiles are used. posts_per_profile repeats
+    a profile's posts (with new activity ids) until it has that many.
+    """
+    saved = OrderedDict()
+    for path in sorted(glob.glob(os.path.join(posts_dir, "linkedin_posts_*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for post in data if isinstance(data, list) else data.get("posts", []):
+            slug = profile_slug(post.get("profile_url"))
+            if slug:
+                saved.setdefault(slug, []).append(post)
+    if not saved:
+        for post in generate_posts(90):
+            saved.setdefault(profile_slug(post["profile_url"]), []).append(post)
+
+    profiles = OrderedDict()
+    synthetic_id = 7100000000000000000
+    for slug, posts in saved.items():
+        seen = set()
+        unique = []
+        for post in sorted(posts, key=lambda p: p.get("timestamp") or "", reverse=True):
+            match = ACTIVITY_ID_RE.search(post.get("post_url") or "")
+            if match:
+                activity_id = int(match.group(1))
+            else:
+                synthetic_id += 1
+                activity_id = synthetic_id
+            if activity_id not in seen:
+                seen.add(activity_id)
+                unique.append((post, activity_id))
+
+        count = posts_per_profile or len(unique)
+        profiles[slug] = [
+            replay_post(post, activity_id + (i // len(unique)) * 1000003)
+            for i, (post, activity_id) in ((i, unique[i % len(unique)]) for i in range(count))
+        ]
+    return profiles
+
+
+def render_post(post):
+    e = html.escape
+    images = "".join(
+        f'<div class="update-components-image"><img class="update-components-image__image" '
+        f'src="{e(src)}" alt="post image"></div>'
+        for src in post["images"]
+    )
+    videos = "".join(
+        f'<div class="update-components-linkedin-video"><video class="vjs-tech" preload="none" '
+        f'data-replay-src="{e(src)}"></video></div>'
+        for src in post["videos"]
+    )
+    content = "<br>".join(e(line) for line in post["content"].split("\n"))
+    return f"""    <div class="feed-shared-update-v2 artdeco-card" data-urn="urn:li:activity:{post['activity_id']}" role="article">
+      <div class="feed-shared-control-menu"><button aria-label="Open control menu for post by {e(post['author_name'])}" type="button"></button></div>
+      <div class="update-components-actor">
+        <div class="update-components-actor__image"><img src="/avatars/{post['activity_id'] % 7}.jpg" alt="profile photo"></div>
+        <span class="update-components-actor__name"><span dir="ltr"><span aria-hidden="true">{e(post['author_name'])}</span></span></span>
+        <span class="update-components-actor__sub-description"><time datetime="{e(post['timestamp'])}">{e(post['timestamp'][:10])}</time></span>
+      </div>
+      <div class="update-components-text"><span class="break-words"><span dir="ltr">{content}</span></span></div>
+      {images}{videos}
+      <div class="social-details-social-counts">
+        <span class="social-counts-reactions__count">{e(str(post['reactions']))}</span>
+        <button class="social-counts-comments" type="button"><span>{e(str(post['comments']))}</span></button>
+      </div>
+    </div>"""
+
+
+class ReplaySite:
+    """Data and failure-injection settings shared by all request handlers."""
+
+    def __init__(self, posts_dir=POSTS_DIR, posts_per_profile=None, page_size=10, latency=0.0,
+                 page_delay=0.3, media_latency=0.0, media_bytes=50 * 1024, error_rate=0.0,
+                 throttle_rate=0.0, challenge_rate=0.0, seed=None):
+        self.posts_dir = posts_dir
+        self.profiles = load_profiles(posts_dir, posts_per_profile)
+        self.page_size = page_size
+        self.latency = latency
+        self.page_delay = page_delay
+        self.media_latency = media_latency
+        self.media_bytes = media_bytes
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.challenge_rate = challenge_rate
+        self.random = random.Random(seed)
+        self.sessions = set()
+        self.lock = threading.Lock()
+        self.counters = Counter()
+
+    def chance(self, rate):
+        if rate <= 0:
+            return False
+        with self.lock:
+            return self.random.random() < rate
+
+    def count(self, key):
+        with self.lock:
+            self.counters[key] += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                "profiles": {slug: len(posts) for slug, posts in self.profiles.items()},
+                "sessions": len(self.sessions),
+                "requests": dict(self.counters),
+            }
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def site(self):
+        return self.server.site
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        if path.rstrip("/") != "/login":
+            return self._send(404, b"Not found", "text/plain")
+        self.site.count("login")
+        if self.site.chance(self.site.challenge_rate):
+            self.site.count("challenge_injected")
+            return self._redirect("/checkpoint/challenge/")
+        token = secrets.token_hex(16)
+        with self.site.lock:
+            self.site.sessions.add(token)
+        self._redirect("/feed/", cookie=f"li_at={token}; Path=/; HttpOnly")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path
+        if path == "/__replay/stats":
+            return self._send(200, json.dumps(self.site.stats()).encode(), "application/json")
+        if path in ("/login", "/login/"):
+            self.site.count("login_page")
+            return self._page(LOGIN_PAGE)
+        if path == "/robots.txt":
+            return self._send(200, b"User-agent: *\nDisallow:\n", "text/plain")
+        if path.startswith("/checkpoint/"):
+            return self._page(CHALLENGE_PAGE)
+        if path.startswith("/avatars/"):
+            return self._media(path, avatar=True)
+        if path.startswith("/dms/"):
+            return self._media(path)
+
+        if not self._logged_in():
+            self.site.count("authwall")
+            return self._redirect("/login" if path.startswith("/feed") else "/authwall?trk=replay")
+        if path.startswith("/feed/"):
+            self.site.count("feed_home")
+            return self._page(HOME_PAGE)
+
+        match = re.match(r"^/in/([^/]+)/recent-activity/all/(page)?$", path)
+        if not match:
+            return self._send(404, b"Not found", "text/plain")
+        if self.site.chance(self.site.error_rate):
+            self.site.count("error_injected")
+            return self._send(500, b"Replay error", "text/plain")
+
+        posts = self.site.profiles.get(match.group(1).lower(), [])
+        if match.group(2):
+            self.site.count("feed_page")
+            start = int(parse_qs(url.query).get("start", ["0"])[0])
+            page = posts[start:start + self.site.page_size]
+            body = "\n".join(render_post(post) for post in page).encode("utf-8")
+            headers = {
+                "X-Count": str(len(page)),
+                "X-Has-More": "1" if start + len(page) < len(posts) else "0",
+            }
+            return self._send(200, body, "text/html; charset=utf-8", headers=headers, latency=self.site.latency)
+
+        self.site.count("activity")
+        if not posts:
+            return self._page(EMPTY_PAGE)
+        first = posts[:self.site.page_size]
+        self._page(FEED_PAGE.format(
+            slug=html.escape(match.group(1)),
+            posts="\n".join(render_post(post) for post in first),
+            page_delay=int(self.site.page_delay * 1000),
+            next=len(first),
+            done="true" if len(first) >= len(posts) else "false",
+        ))
+
+    def _logged_in(self):
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "li_at":
+                with self.site.lock:
+                    return value in self.site.sessions
+        return False
+
+    def _media(self, path, avatar=False):
+        self.site.count("media")
+        if self.site.chance(self.site.throttle_rate):
+            self.site.count("throttle_injected")
+            return self._send(429, b"Too many requests", "text/plain", headers={"Retry-After": "1"})
+        if self.site.chance(self.site.error_rate):
+            self.site.count("error_injected")
+            return self._send(500, b"Replay error", "text/plain")
+
+        ext = os.path.splitext(path)[1].lower()
+        content_type = CONTENT_TYPES.get(ext, "application/octet-stream")
+        body = None
+        parts = path.split("/")
+        if not avatar and len(parts) == 5 and parts[3] != "synthetic":
+            file_path = os.path.join(self.site.posts_dir, os.path.basename(parts[3]), os.path.basename(parts[4]))
+            if os.path.isfile(file_path):
+                with open(file_path, "rb") as f:
+                    body = f.read()
+        if body is None:
+            size = 2 * 1024 if avatar else self.site.media_bytes
+            body = b"\xff\xd8\xff\xe0" + b"\0" * size if content_type == "image/jpeg" else b"\0" * size
+        self._send(200, body, content_type, latency=self.site.media_latency)
+
+    def _page(self, text):
+        self._send(200, text.encode("utf-8"), "text/html; charset=utf-8", latency=self.site.latency)
+
+    def _redirect(self, location, cookie=None):
+        headers = {"Location": location}
+        if cookie:
+            headers["Set-Cookie"] = cookie
+        self._send(302, b"", "text/plain", headers=headers)
+
+    def _send(self, status, body, content_type, headers=None, latency=0.0):
+        if latency:
+            time.sleep(latency)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_replay_server(port=0, host="127.0.0.1", **site_options):
+    """Start the replay server on a background thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer((host, port), ReplayHandler)
+    server.site = ReplaySite(**site_options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_site_arguments(parser):
+    parser.add_argument("--posts-dir", default=POSTS_DIR, help="saved sessions to replay")
+    parser.add_argument("--posts-per-profile", type=int, default=None, help="repeat posts up to this many")
+    parser.add_argument("--page-size", type=int, default=10, help="posts per lazily loaded page")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every page")
+    parser.add_argument("--page-delay", type=float, default=0.3, help="seconds before a scrolled page appears")
+    parser.add_argument("--media-latency", type=float, default=0.0, help="seconds added to every media file")
+    parser.add_argument("--media-bytes", type=int, default=50 * 1024, help="size of synthetic media")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of pages and media answered with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of media answered with 429")
+    parser.add_argument("--challenge-rate", type=float, default=0.0, help="share of logins sent to a checkpoint")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def site_options(args):
+    return {
+        "posts_dir": args.posts_dir,
+        "posts_per_profile": args.posts_per_profile,
+        "page_size": args.page_size,
+        "latency": args.latency,
+        "page_delay": args.page_delay,
+        "media_latency": args.media_latency,
+        "media_bytes": args.media_bytes,
+        "error_rate": args.error_rate,
+        "throttle_rate": args.throttle_rate,
+        "challenge_rate": args.challenge_rate,
+        "seed": args.seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--host", default="127.0.0.1")
+    add_site_arguments(parser)
+    args = parser.parse_args()
+
+    server, base_url = start_replay_server(args.port, args.host, **site_options(args))
+    for slug, count in server.site.stats()["profiles"].items():
+        print(f"{base_url}/in/{slug}/  ({count} posts)")
+    print(f"\nLINKEDIN_URL={base_url} LINKEDIN_MEDIA_HOSTS={urlparse(base_url).netloc} uvicorn main:app")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# session_fixtures.py
+"""Generated scrape results shaped like linkedin_posts_<session_id>.json.
+
+    python benchmarks/session_fixtures.py 1000 --out /tmp/sessions
+    python benchmarks/session_fixtures.py 100 --out linkedin_posts --media   # plus media_<session_id>/ files
+
+local_media_paths are named as the scraper names them (media_<session_id>/post_<n>_media_<i>_<hash>.<ext>,
+i from 1), so /media and its image variants can be exercised against the generated files.
+"""
+import os
+import sys
+import json
+import random
+import argparse
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from media_downloader import media_filename
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it --media writes placeholder bytes
+    Image = None
+
+POST_TYPES = ("text", "image", "image", "video", "article")
+WORDS = (
+    "engineering team launch hiring platform data pipeline lessons customers product "
+    "leadership scaling browser automation quarterly review mentoring growth"
+).split()
+
+
+def generate_posts(count, profiles=3, seed=0, session_id="bench"):
+    """count post dicts as scrape_posts returns them, spread over profiles profiles, newest first."""
+    rng = random.Random(seed)
+    started = datetime(2025, 1, 1)
+    posts = []
+    for i in range(count):
+        profile = i % profiles
+        post_type = POST_TYPES[i % len(POST_TYPES)]
+        activity_id = 7300000000000000000 + i
+        media_urls = []
+        local_media_paths = []
+        if post_type in ("image", "video"):
+            for media_index in range(1, 2 + (i % 3 == 0)):
+                ext = "mp4" if post_type == "video" else "jpg"
+                url = f"https://media.licdn.com/dms/image/D4E22AQ{i:08d}/feedshare-shrink_800/{media_index}"
+                media_urls.append(url)
+                local_media_paths.append(f"media_{session_id}/{media_filename(i + 1, media_index, url, ext)}")
+        posts.append({
+            "post_number": i + 1,
+            "content": " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 120))),
+            "timestamp": (started - timedelta(hours=i)).isoformat() + ".000Z",
+            "engagement": {"reactions": str(rng.randint(0, 5000)), "comments": f"{rng.randint(0, 300)} comments"},
+            "post_type": post_type,
+            "media_urls": media_urls,
+            "local_media_paths": local_media_paths,
+            "post_url": f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}",
+            "author_name": f"Fixture Author {profile}",
+            "author_avatar": f"https://media.licdn.com/dms/image/C4E03AQ{profile:04d}/profile-displayphoto-shrink_100_100/0",
+            "profile_url": f"https://www.linkedin.com/in/fixture-author-{profile}/",
+        })
+    return posts
+
+
+def generate_session(count, session_id=None, profiles=3, seed=0):
+    """A whole session file's content, as main.save_scrape_results writes it."""
+    session_id = session_id or f"bench_{count}"
+    posts = generate_posts(count, profiles=profiles, seed=seed, session_id=session_id)
+    return {
+        "session_id": session_id,
+        "timestamp": datetime.now().isoformat(),
+        "profiles_scraped": sorted({post["profile_url"] for post in posts}),
+        "total_posts": len(posts),
+        "timings": {},
+        "posts": posts,
+    }
+
+
+def write_media_files(session, root):
+    """Create every local_media_paths file of session under root: small JPEGs, and stub bytes for videos."""
+    written = 0
+    for post in session["posts"]:
+        for index, local_path in enumerate(post["local_media_paths"]):
+            path = os.path.join(root, local_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if local_path.endswith(".jpg") and Image is not None:
+                shade = (post["post_number"] * 37 + index * 91) % 256
+                Image.new("RGB", (1200, 800), (shade, 120, 255 - shade)).save(path, format="JPEG", quality=70)
+            else:
+                with open(path, "wb") as f:
+                    f.write(os.urandom(4096))
+            written += 1
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("count", type=int)
+    parser.add_argument("--out", default="linkedin_posts")
+    parser.add_argument("--profiles", type=int, default=3)
+    parser.add_argument("--media", action="store_true", help="also write the media files under --out")
+    args = parser.parse_args()
+
+    session = generate_session(args.count, profiles=args.profiles)
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"linkedin_posts_{session['session_id']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(session, f, indent=2, ensure_ascii=False)
+    print(f"Wrote {args.count} posts to {path}")
+    if args.media:
+        print(f"Wrote {write_media_files(session, args.out)} media files to {args.out}/media_{session['session_id']}/")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+# driver_pool.py
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import psutil
+except ImportError:  # psutil is optional; without it drivers are only recycled by use count
+    psutil = None
+
+from viewer import setup_driver, login_linkedin
+from auth_store import account_key, is_logged_out_url
+
+logger = logging.getLogger(__name__)
+
+
+def browser_memory_bytes(driver):
+    """Memory of a driver's chromedriver process and every Chrome process under it; None if unknown.
+
+    Counts each process's unique set size where the platform reports it (memory that
+    would be freed by quitting it), falling back to resident size.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return None
+    root = psutil.Process(process.pid)
+    total = 0
+    for proc in [root] + root.children(recursive=True):
+        try:
+            try:
+                total += proc.memory_full_info().uss
+            except (psutil.AccessDenied, AttributeError):
+                total += proc.memory_info().rss
+        except psutil.NoSuchProcess:
+            continue
+    return total
+
+
+class DriverPoolTimeout(Exception):
+    """Raised when no driver becomes available for an account in time."""
+
+
+class PooledDriver:
+    """A logged-in WebDriver plus the bookkeeping the pool needs to recycle it."""
+
+    def __init__(self, driver, account, profile="default"):
+        self.driver = driver
+        self.account = account
+        self.profile = profile
+        self.uses = 0
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+    def to_dict(self):
+        return {
+            "profile": self.profile,
+            "uses": self.uses,
+            "age_seconds": round(time.time() - self.created_at, 1),
+            "idle_seconds": round(time.time() - self.last_used, 1),
+        }
+
+
+class DriverPool:
+    """Keeps authenticated Chrome instances warm and shares them between scrape jobs.
+
+    max_per_account caps all of an account's browsers together, whatever their driver
+    profile (see viewer.DRIVER_PROFILES); a borrower only reuses an idle driver of the
+    profile it asked for. When the account is at its cap and only drivers of another
+    profile are idle, one of them is retired to make room.
+    """
+
+    def __init__(self, max_per_account=2, max_uses=20, max_memory_mb=1024,
+                 idle_timeout=900, headless=True, auth_store=None):
+        self.max_per_account = max_per_account
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.idle_timeout = idle_timeout
+        self.headless = headless
+        self.auth_store = auth_store
+        self.idle = {}
+        self.in_use = {}
+        self.condition = threading.Condition()
+        self.counters = {"created": 0, "reused": 0, "recycled": 0, "unhealthy": 0, "restored": 0, "logins": 0}
+        if max_memory_mb and psutil is None:
+            logger.warning("psutil is not installed; pooled drivers are not recycled by memory use")
+
+    @contextmanager
+    def driver(self, email, password, timeout=None, profile="default", check_cancelled=None):
+        """Borrow a logged-in driver for an account and give it back afterwards.
+
+        When the block finishes without error, the account's stored session is refreshed
+        with the driver's current cookies.
+        """
+        pooled = self.acquire(email, password, timeout=timeout, profile=profile, check_cancelled=check_cancelled)
+        healthy = True
+        try:
+            yield pooled.driver
+            self._save_session(pooled)
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            self.release(pooled, healthy=healthy)
+
+    def acquire(self, email, password, timeout=None, profile="default", check_cancelled=None, poll_interval=0.5):
+        """Borrow a driver, waiting up to timeout seconds (forever if None) for a free slot.
+
+        check_cancelled is called every poll_interval seconds while waiting and may raise.
+        """
+        account = account_key(email, password)
+        deadline = None if timeout is None else time.time() + timeout
+
+        while True:
+            with self.condition:
+                stale = self._evict_idle(account)
+                idle = self.idle[account]
+                candidate = next((pooled for pooled in reversed(idle) if pooled.profile == profile), None)
+                if candidate is not None:
+                    idle.remove(candidate)
+                elif idle and self._count(account) >= self.max_per_account:
+                    stale.append(idle.pop(0))
+                    self.counters["recycled"] += 1
+                reserved = candidate is not None or self._count(account) < self.max_per_account
+                if reserved:
+                    # Reserve the slot; health checks, quits and Chrome start-up all run
+                    # outside the lock so other accounts are never held up by a slow browser
+                    self._add_in_use(account, profile, 1)
+                elif not stale:
+                    if check_cancelled:
+                        check_cancelled()
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        raise DriverPoolTimeout(f"No driver available for {email}")
+                    if check_cancelled:
+                        remaining = poll_interval if remaining is None else min(remaining, poll_interval)
+                    self.condition.wait(remaining)
+
+            for pooled in stale:
+                self._quit(pooled)
+            if not reserved:
+                continue
+            if candidate is None:
+                break
+            if self._is_healthy(candidate):
+                candidate.uses += 1
+                candidate.last_used = time.time()
+                with self.condition:
+                    self.counters["reused"] += 1
+                return candidate
+
+            self._quit(candidate)
+            with self.condition:
+                self.counters["unhealthy"] += 1
+                self._add_in_use(account, profile, -1)
+                self.condition.notify_all()
+
+        try:
+            pooled = self._create(account, email, password, profile)
+        except Exception:
+            with self.condition:
+                self._add_in_use(account, profile, -1)
+                self.condition.notify_all()
+            raise
+
+        pooled.uses += 1
+        pooled.last_used = time.time()
+        return pooled
+
+    def release(self, pooled, healthy=True):
+        recycle = not healthy or pooled.uses >= self.max_uses or self._over_memory(pooled)
+        with self.condition:
+            self._add_in_use(pooled.account, pooled.profile, -1)
+            if recycle:
+                self.counters["recycled"] += 1
+            else:
+                pooled.last_used = time.time()
+                self.idle.setdefault(pooled.account, []).append(pooled)
+            self.condition.notify_all()
+        if recycle:
+            logger.info(f"Recycling driver after {pooled.uses} uses")
+            self._quit(pooled)
+
+    def close_all(self):
+        with self.condition:
+            drivers = [pooled for idle in self.idle.values() for pooled in idle]
+            self.idle.clear()
+        for pooled in drivers:
+            self._quit(pooled)
+
+    def stats(self):
+        with self.condition:
+            accounts = {}
+            for account in set(self.idle) | set(self.in_use):
+                idle = self.idle.get(account, [])
+                in_use = self.in_use.get(account, {})
+                profiles = accounts.setdefault(account.split(":")[0], {})
+                for profile in set(in_use) | {pooled.profile for pooled in idle}:
+                    profiles[profile] = {
+                        "idle": [pooled.to_dict() for pooled in idle if pooled.profile == profile],
+                        "in_use": in_use.get(profile, 0),
+                    }
+            return {
+                "max_per_account": self.max_per_account,
+                "max_uses": self.max_uses,
+                "max_memory_mb": self.max_memory_mb,
+                "accounts": accounts,
+                **self.counters,
+            }
+
+    def _create(self, account, email, password, profile):
+        driver = setup_driver(headless=self.headless, profile=profile)
+        pooled = PooledDriver(driver, account, profile)
+        try:
+            # A stored session skips the login form; fall back to a full login when it expired
+            if self._restore_session(pooled):
+                self._count_event("restored")
+            else:
+                login_linkedin(driver, email, password)
+                self._count_event("logins")
+                self._save_session(pooled)
+        except Exception:
+            try:
+                driver.quit()
+            except:
+                pass
+            raise
+        self._count_event("created")
+        logger.info("Started and logged in a new pooled driver")
+        return pooled
+
+    def _restore_session(self, pooled):
+        if not self.auth_store:
+            return False
+        try:
+            return self.auth_store.restore(pooled.driver, pooled.account)
+        except Exception as e:
+            logger.warning(f"Could not restore stored session: {e}")
+            return False
+
+    def _save_session(self, pooled):
+        if not self.auth_store:
+            return
+        try:
+            self.auth_store.save(pooled.driver, pooled.account)
+        except Exception as e:
+            logger.warning(f"Could not refresh stored session: {e}")
+
+    def _count_event(self, counter):
+        with self.condition:
+            self.counters[counter] += 1
+
+    def _count(self, account):
+        """Drivers of an account, borrowed or idle, across all profiles."""
+        return sum(self.in_use.get(account, {}).values()) + len(self.idle.get(account, []))
+
+    def _add_in_use(self, account, profile, delta):
+        profiles = self.in_use.setdefault(account, {})
+        profiles[profile] = profiles.get(profile, 0) + delta
+
+    def _evict_idle(self, account):
+        """Drop drivers idle past idle_timeout from the pool; the caller quits them outside the lock."""
+        now = time.time()
+        fresh, stale = [], []
+        for pooled in self.idle.get(account, []):
+            (stale if now - pooled.last_used > self.idle_timeout else fresh).append(pooled)
+        self.idle[account] = fresh
+        return stale
+
+    def _is_healthy(self, pooled):
+        """Cheap liveness check: the browser answers and is not bounced to a login page."""
+        try:
+            pooled.driver.execute_script("return document.readyState")
+            current_url = pooled.driver.current_url or ""
+        except Exception:
+            return False
+        return not is_logged_out_url(current_url)
+
+    def _over_memory(self, pooled):
+        if not self.max_memory_mb or psutil is None:
+            return False
+        try:
+            used = browser_memory_bytes(pooled.driver)
+        except psutil.NoSuchProcess:
+            # chromedriver is gone, so the driver is no use anyway
+            return True
+        except Exception as e:
+            logger.warning(f"Could not measure browser memory: {e}")
+            return False
+        return used is not None and used / (1024 * 1024) > self.max_memory_mb
+
+    def _quit(self, pooled):
+        try:
+            pooled.driver.quit()
+        except:
+            pass
@@ -0,0 +1,193 @@
+# jobs.py
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from metrics import StageTimings, JOBS_FINISHED
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker once its job has been cancelled."""
+
+
+class QueueFull(Exception):
+    """Raised when no more jobs can be queued."""
+
+
+class ScrapeJob:
+    """State and progress of a single queued scrape request."""
+
+    def __init__(self, request, session_id=None, streaming=False):
+        self.job_id = uuid.uuid4().hex
+        self.request = request
+        # Jobs run concurrently, so the timestamp alone is not unique
+        self.session_id = session_id or f"{datetime.now():%Y%m%d_%H%M%S}_{self.job_id[:8]}"
+        self.streaming = streaming
+        self.listeners = []
+        self.status = JOB_QUEUED
+        self.created_at = datetime.now().isoformat()
+        self.started_at = None
+        self.finished_at = None
+        self.profiles = OrderedDict(
+            (url, {"status": "pending", "posts": 0, "error": None})
+            for url in request.profile_urls
+        )
+        self.result = None
+        self.error = None
+        self.future = None
+        self.timings = StageTimings()
+        self.lock = threading.Lock()
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+    def add_listener(self, listener):
+        """Register a callable that receives every event dict this job emits."""
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def emit(self, event, **data):
+        payload = {"event": event, "job_id": self.job_id, **data}
+        for listener in list(self.listeners):
+            try:
+                listener(payload)
+            except Exception as e:
+                logger.warning(f"Job listener failed: {e}")
+
+    def update_profile(self, profile_url, **fields):
+        with self.lock:
+            self.profiles.setdefault(profile_url, {"status": "pending", "posts": 0, "error": None})
+            self.profiles[profile_url].update(fields)
+            state = dict(self.profiles[profile_url])
+        self.emit("progress", profile_url=profile_url, **state)
+
+    def add_posts(self, profile_url, count=1):
+        with self.lock:
+            self.profiles[profile_url]["posts"] += count
+
+    def to_dict(self):
+        with self.lock:
+            profiles = [dict(profile_url=url, **state) for url, state in self.profiles.items()]
+        return {
+            "job_id": self.job_id,
+            "session_id": self.session_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "profiles": profiles,
+            "profiles_done": sum(1 for p in profiles if p["status"] in ("done", "failed")),
+            "total_profiles": len(profiles),
+            "posts_scraped": sum(p["posts"] for p in profiles),
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+class ScrapeJobManager:
+    """Runs scrape jobs on a bounded pool of worker threads."""
+
+    def __init__(self, runner, max_workers=2, max_queued=20, max_finished=100):
+        self.runner = runner
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape-worker")
+
+    def submit(self, request, session_id=None, streaming=False, listener=None):
+        job = ScrapeJob(request, session_id, streaming=streaming)
+        if listener is not None:
+            job.add_listener(listener)
+        with self.lock:
+            pending = sum(1 for j in self.jobs.values() if j.status in (JOB_QUEUED, JOB_RUNNING))
+            if pending >= self.max_queued:
+                raise QueueFull(f"{pending} scrape jobs already pending")
+            self.jobs[job.job_id] = job
+            self._evict_finished()
+        job.future = self.executor.submit(self._run, job)
+        logger.info(f"Queued scrape job {job.job_id} for {len(request.profile_urls)} profiles")
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status in FINISHED_STATES:
+            return job
+        job.cancel()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, JOB_CANCELLED)
+        logger.info(f"Cancellation requested for scrape job {job_id}")
+        return job
+
+    def shutdown(self):
+        for job in list(self.jobs.values()):
+            job.cancel()
+            if job.future is not None:
+                job.future.cancel()
+        self.executor.shutdown(wait=False)
+
+    def _run(self, job):
+        if job.cancelled:
+            self._finish(job, JOB_CANCELLED)
+            return
+        job.status = JOB_RUNNING
+        job.started_at = datetime.now().isoformat()
+        try:
+            job.result = self.runner(job)
+            self._finish(job, JOB_CANCELLED if job.cancelled else JOB_COMPLETED)
+        except JobCancelled:
+            self._finish(job, JOB_CANCELLED)
+        except Exception as e:
+            logger.error(f"Scrape job {job.job_id} failed: {str(e)}")
+            job.error = str(e)
+            self._finish(job, JOB_FAILED)
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished_at = datetime.now().isoformat()
+        JOBS_FINISHED.inc(status=status)
+        logger.info(f"Scrape job {job.job_id} {status}")
+        summary = job.to_dict()
+        job.emit(
+            "done",
+            status=status,
+            session_id=job.session_id,
+            posts_scraped=summary["posts_scraped"],
+            profiles=summary["profiles"],
+            error=job.error
+        )
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
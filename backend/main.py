@@ -1,17 +1,35 @@
 # main.py
-from fastapi import FastAPI, HTTPException, Body, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse, PlainTextResponse, Response
 from pydantic import BaseModel, validator
 from typing import List, Optional
 import logging
 from datetime import datetime
 import os
+import re
 import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Import your scraper functions from viewer.py
-from viewer import setup_driver, login_linkedin, scrape_posts
+from viewer import scrape_posts, construct_posts_url, DRIVER_PROFILES
+from jobs import ScrapeJobManager, JobCancelled, QueueFull
+from driver_pool import DriverPool
+from media_downloader import MediaDownloader
+from watermarks import ActivityWatermarks
+from session_store import SessionStore
+from auth_store import get_auth_store, is_linkedin_url
+from result_cache import ResultCache, CACHE_MISS
+from rate_governor import RateGovernor
+from selector_registry import get_selector_registry
+from metrics import collect_timings, render_metrics
+from media_manifest import (
+    get_media_manifest, etag_matches, parse_range, iter_file_range, RangeNotSatisfiable,
+    IMMUTABLE_CACHE_CONTROL
+)
+from media_variants import MediaVariants
+from media_store import get_media_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -39,10 +57,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files directory for media
-if os.path.exists("linkedin_posts"):
-    app.mount("/linkedin_posts", StaticFiles(directory="linkedin_posts"), name="linkedin_posts")
-
 # Request/Response models
 class ScrapeRequest(BaseModel):
     email: str
@@ -50,14 +64,31 @@ class ScrapeRequest(BaseModel):
     profile_urls: List[str]
     scrolls: int = 10
     max_posts: int = 50
+    concurrency: Optional[int] = None  # drivers used in parallel; capped per account
+    incremental: bool = False  # only extract posts not seen in earlier scrapes
+    windowed: Optional[bool] = None  # extract while scrolling, recycling DOM nodes; auto for large max_posts
+    driver_profile: Optional[str] = None  # "default" or "lean" (blocks fonts, images and trackers)
+    force_refresh: bool = False  # scrape again even if a cached result exists
     
     @validator('profile_urls')
     def validate_linkedin_urls(cls, v):
         for url in v:
-            if 'linkedin.com' not in url:
+            if not is_linkedin_url(url):
                 raise ValueError('All URLs must be LinkedIn profile URLs')
         return v
 
+    @validator('driver_profile')
+    def validate_driver_profile(cls, v):
+        if v is not None and v not in DRIVER_PROFILES:
+            raise ValueError(f"driver_profile must be one of {', '.join(DRIVER_PROFILES)}")
+        return v
+
+    @validator('concurrency')
+    def validate_concurrency(cls, v):
+        if v is not None and v < 1:
+            raise ValueError('concurrency must be at least 1')
+        return v
+
 class PostData(BaseModel):
     post_number: int
     content: str
@@ -78,8 +109,286 @@ class ScrapeResponse(BaseModel):
     profiles_scraped: List[str]
     error: Optional[str] = None
 
-# In-memory storage for demo (use Redis or DB in production)
-scrape_sessions = {}
+class ScrapeJobResponse(BaseModel):
+    job_id: str
+    session_id: str
+    status: str
+
+SCRAPE_WORKERS = int(os.environ.get("SCRAPE_WORKERS", "2"))
+SCRAPE_MAX_QUEUED = int(os.environ.get("SCRAPE_MAX_QUEUED", "20"))
+SCRAPE_PROFILE_CONCURRENCY = int(os.environ.get("SCRAPE_PROFILE_CONCURRENCY", "2"))
+DEFAULT_SESSION_PAGE_SIZE = 20
+MAX_SESSION_PAGE_SIZE = 500
+SCROLL_IDLE_TIMEOUT = float(os.environ.get("SCROLL_IDLE_TIMEOUT", "3"))
+MEDIA_DOWNLOAD_WORKERS = int(os.environ.get("MEDIA_DOWNLOAD_WORKERS", "8"))
+MEDIA_PER_HOST = int(os.environ.get("MEDIA_PER_HOST", "4"))
+MEDIA_VARIANT_WIDTHS = [int(w) for w in os.environ.get("MEDIA_VARIANT_WIDTHS", "320,640,1080").split(",") if w.strip()]
+MEDIA_VARIANT_WORKERS = int(os.environ.get("MEDIA_VARIANT_WORKERS", "2"))
+DRIVER_POOL_MAX_PER_ACCOUNT = int(os.environ.get("DRIVER_POOL_MAX_PER_ACCOUNT", "2"))
+DRIVER_MAX_USES = int(os.environ.get("DRIVER_MAX_USES", "20"))
+DRIVER_MAX_MEMORY_MB = int(os.environ.get("DRIVER_MAX_MEMORY_MB", "1024"))
+DRIVER_IDLE_TIMEOUT = int(os.environ.get("DRIVER_IDLE_TIMEOUT", "900"))
+DRIVER_PROFILE = os.environ.get("DRIVER_PROFILE", "default")
+PERSIST_BROWSER_SESSIONS = os.environ.get("PERSIST_BROWSER_SESSIONS", "1") != "0"
+SCRAPE_WINDOW_SIZE = int(os.environ.get("SCRAPE_WINDOW_SIZE", "10"))
+WINDOWED_MIN_POSTS = int(os.environ.get("WINDOWED_MIN_POSTS", "150"))
+SCRAPE_CACHE_TTL = int(os.environ.get("SCRAPE_CACHE_TTL", "600"))
+SCRAPE_CACHE_MAX_ENTRIES = int(os.environ.get("SCRAPE_CACHE_MAX_ENTRIES", "128"))
+RATE_NAVIGATIONS_PER_MINUTE = float(os.environ.get("RATE_NAVIGATIONS_PER_MINUTE", "20"))
+RATE_SCROLLS_PER_SECOND = float(os.environ.get("RATE_SCROLLS_PER_SECOND", "2"))
+RATE_INTERACTIONS_PER_SECOND = float(os.environ.get("RATE_INTERACTIONS_PER_SECOND", "1"))
+RATE_MEDIA_PER_SECOND = float(os.environ.get("RATE_MEDIA_PER_SECOND", "10"))
+RATE_MAX_SLOWDOWN = float(os.environ.get("RATE_MAX_SLOWDOWN", "16"))
+RATE_CHALLENGE_COOLDOWN = float(os.environ.get("RATE_CHALLENGE_COOLDOWN", "60"))
+SLOW_LOAD_SECONDS = float(os.environ.get("SLOW_LOAD_SECONDS", "8"))
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get("STREAM_HEARTBEAT_SECONDS", "15"))
+
+# Logged-in Chrome instances shared by all jobs, keyed by account
+driver_pool = DriverPool(
+    max_per_account=DRIVER_POOL_MAX_PER_ACCOUNT,
+    max_uses=DRIVER_MAX_USES,
+    max_memory_mb=DRIVER_MAX_MEMORY_MB,
+    idle_timeout=DRIVER_IDLE_TIMEOUT,
+    auth_store=get_auth_store() if PERSIST_BROWSER_SESSIONS else None
+)
+
+def get_timestamp(post):
+    """Sort key for posts: parsed ISO timestamp, oldest possible if missing"""
+    ts = post.get('timestamp', '')
+    if not ts:
+        return datetime.min
+    try:
+        return datetime.fromisoformat(ts.replace('Z', '+00:00')).replace(tzinfo=None)
+    except:
+        return datetime.min
+
+def build_scrape_response(posts: List[dict], profiles: List[str]) -> ScrapeResponse:
+    """Convert raw post dicts into a ScrapeResponse"""
+    post_models = []
+    for post in posts:
+        try:
+            post_model = PostData(**post)
+            post_models.append(post_model)
+        except Exception as e:
+            logger.warning(f"Could not convert post to model: {e}")
+            # Add with defaults
+            post_model = PostData(
+                post_number=post.get('post_number', 0),
+                content=post.get('content', ''),
+                timestamp=post.get('timestamp'),
+                engagement=post.get('engagement', {}),
+                post_type=post.get('post_type', 'text'),
+                media_urls=post.get('media_urls', []),
+                local_media_paths=post.get('local_media_paths', []),
+                post_url=post.get('post_url'),
+                profile_url=post.get('profile_url'),
+                author_name=post.get('author_name'),
+                author_avatar=post.get('author_avatar')
+            )
+            post_models.append(post_model)
+
+    return ScrapeResponse(
+        success=True,
+        posts=post_models,
+        total_posts=len(post_models),
+        profiles_scraped=profiles
+    )
+
+def scrape_cache_key(profile_url, request):
+    """Cache key for one profile of a request: normalized posts URL, scrolls and max_posts"""
+    posts_url = construct_posts_url(profile_url.split('#')[0].split('?')[0]).lower()
+    posts_url = re.sub(r'^(https?://)?(www\.)?', '', posts_url)
+    return (posts_url, request.scrolls, request.max_posts)
+
+def scrape_profile(job, profile_url, downloader=None) -> List[dict]:
+    """Scrape a single profile of a job, or reuse a cached or in-flight scrape of it"""
+    request = job.request
+    job.check_cancelled()
+    job.update_profile(profile_url, status="running")
+
+    stats = {}
+    load = lambda: fetch_profile_posts(job, profile_url, downloader, stats)
+    if request.incremental:
+        # Incremental results depend on the watermarks, so they are never shared
+        posts, cache_status = load(), CACHE_MISS
+    else:
+        posts, cache_status = scrape_cache.get_or_load(
+            scrape_cache_key(profile_url, request), load,
+            force_refresh=request.force_refresh,
+            check_cancelled=job.check_cancelled
+        )
+
+    if cache_status != CACHE_MISS:
+        logger.info(f"Reused {len(posts)} posts of {profile_url} ({cache_status})")
+        if job.streaming:
+            for post in posts:
+                job.emit("post", profile_url=profile_url, post=post)
+
+    job.update_profile(profile_url, status="done", posts=len(posts), timings=stats, cache=cache_status)
+    return posts
+
+def fetch_profile_posts(job, profile_url, downloader, stats) -> List[dict]:
+    """Scrape a single profile of a job on a pooled driver"""
+    request = job.request
+    logger.info(f"Scraping profile: {profile_url}")
+
+    known_activity_ids = activity_watermarks.known_activity_ids(profile_url) if request.incremental else None
+    windowed = request.windowed if request.windowed is not None else request.max_posts >= WINDOWED_MIN_POSTS
+
+    def on_post(post):
+        job.add_posts(profile_url)
+        if job.streaming:
+            post.setdefault('profile_url', profile_url)
+            # Sent once the post's media is saved, so local_media_paths is already filled in
+            downloader.when_done(post, lambda ready: job.emit("post", profile_url=profile_url, post=ready))
+
+    # Borrow a warm, logged-in driver for this account; driver setup and login count
+    # towards the job's timing breakdown too
+    # A job cancelled while every driver of the account is busy stops waiting for one
+    with collect_timings(job.timings), driver_pool.driver(
+        request.email, request.password, profile=request.driver_profile or DRIVER_PROFILE,
+        check_cancelled=job.check_cancelled
+    ) as driver:
+        posts = scrape_posts(
+            driver, profile_url, request.scrolls, request.max_posts,
+            session_id=job.session_id,
+            on_post=on_post,
+            should_stop=lambda: job.cancelled,
+            downloader=downloader,
+            known_activity_ids=known_activity_ids,
+            scroll_idle_timeout=SCROLL_IDLE_TIMEOUT,
+            stats=stats,
+            window_size=SCRAPE_WINDOW_SIZE if windowed else None,
+            governor=rate_governor.for_account(request.email)
+        )
+
+    # A cancelled scrape stops early; never hand its partial result to other jobs
+    job.check_cancelled()
+
+    # Ensure each post has the profile URL
+    for post in posts:
+        if not post.get('profile_url'):
+            post['profile_url'] = profile_url
+
+    logger.info(f"Scraped {len(posts)} posts from {profile_url}")
+    return posts
+
+def run_scrape_job(job) -> ScrapeResponse:
+    """Worker entry point: scrape every profile of a queued job"""
+    request = job.request
+    session_id = job.session_id
+    concurrency = max(1, min(
+        request.concurrency or SCRAPE_PROFILE_CONCURRENCY,
+        driver_pool.max_per_account,
+        len(request.profile_urls)
+    ))
+    logger.info(
+        f"Starting scrape session {session_id} for {len(request.profile_urls)} profiles "
+        f"on {concurrency} drivers"
+    )
+
+    results = {}
+    errors = []
+
+    # One media downloader per job: shared connection pool, cookies captured once
+    downloader = MediaDownloader(
+        session_id, max_workers=MEDIA_DOWNLOAD_WORKERS, per_host=MEDIA_PER_HOST,
+        governor=rate_governor.for_account(request.email), timings=job.timings
+    )
+
+    # Spread profiles across drivers; a failing profile never affects the others
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"profile-{job.job_id[:8]}") as executor:
+            futures = {
+                executor.submit(scrape_profile, job, profile_url, downloader): profile_url
+                for profile_url in request.profile_urls
+            }
+            for future in as_completed(futures):
+                profile_url = futures[future]
+                try:
+                    results[profile_url] = future.result()
+                except JobCancelled:
+                    continue
+                except Exception as profile_error:
+                    logger.error(f"Error scraping {profile_url}: {str(profile_error)}")
+                    job.update_profile(profile_url, status="failed", error=str(profile_error))
+                    errors.append(str(profile_error))
+    finally:
+        downloader.close()
+
+    job.check_cancelled()
+
+    if errors and not results:
+        return ScrapeResponse(
+            success=False,
+            posts=[],
+            total_posts=0,
+            profiles_scraped=[],
+            error=errors[0]
+        )
+
+    # Merge in request order, then sort by timestamp (most recent first)
+    scraped_profiles = [url for url in request.profile_urls if url in results]
+    all_posts = [post for url in scraped_profiles for post in results[url]]
+    all_posts = sorted(all_posts, key=get_timestamp, reverse=True)
+
+    timings = {
+        "stages": job.timings.to_dict(),
+        "profiles": {url: job.profiles[url].get("timings") for url in scraped_profiles}
+    }
+    if save_scrape_results(session_id, all_posts, scraped_profiles, timings=timings):
+        # Only posts that made it into a saved session count as seen for incremental scrapes
+        for profile_url in scraped_profiles:
+            activity_watermarks.record(profile_url, results[profile_url])
+    if job.streaming:
+        # Posts were already sent as they were extracted; keep only a summary on the job
+        return ScrapeResponse(success=True, posts=[], total_posts=len(all_posts), profiles_scraped=scraped_profiles)
+    return build_scrape_response(all_posts, scraped_profiles)
+
+# Indexed store behind /sessions and /session/{id}; imports the JSON session files
+session_store = SessionStore()
+
+# Files of every media_<session_id>/ directory, so /media lookups and misses skip the disk
+media_manifest = get_media_manifest()
+
+# Thumbnails and WebP copies of saved images; new downloads are rendered in the background
+media_variants = MediaVariants(widths=MEDIA_VARIANT_WIDTHS, workers=MEDIA_VARIANT_WORKERS)
+get_media_store().add_listener(media_variants.schedule)
+
+# Per-account pacing shared by every scrape using the same credentials
+rate_governor = RateGovernor(
+    navigations_per_minute=RATE_NAVIGATIONS_PER_MINUTE,
+    scrolls_per_second=RATE_SCROLLS_PER_SECOND,
+    interactions_per_second=RATE_INTERACTIONS_PER_SECOND,
+    media_per_second=RATE_MEDIA_PER_SECOND,
+    max_slowdown=RATE_MAX_SLOWDOWN,
+    slow_load_seconds=SLOW_LOAD_SECONDS,
+    challenge_cooldown=RATE_CHALLENGE_COOLDOWN
+)
+
+# Recent per-profile results; identical concurrent scrapes share one browser
+scrape_cache = ResultCache(ttl=SCRAPE_CACHE_TTL, max_entries=SCRAPE_CACHE_MAX_ENTRIES)
+
+# Activity ids already scraped per profile, for incremental scrapes
+activity_watermarks = ActivityWatermarks()
+
+# Scrape jobs by job id; workers run them off the event loop
+scrape_sessions = ScrapeJobManager(
+    run_scrape_job,
+    max_workers=SCRAPE_WORKERS,
+    max_queued=SCRAPE_MAX_QUEUED
+)
+
+@app.on_event("startup")
+def import_session_files():
+    session_store.refresh()
+
+@app.on_event("shutdown")
+def shutdown_scrape_workers():
+    scrape_sessions.shutdown()
+    driver_pool.close_all()
+    get_selector_registry().flush()
+    media_variants.close()
 
 @app.get("/")
 def root():
@@ -90,202 +399,250 @@ def root():
         "status": "running"
     }
 
-@app.post("/scrape", response_model=ScrapeResponse)
-async def scrape_linkedin_posts(request: ScrapeRequest, background_tasks: BackgroundTasks):
+def format_stream_event(event, event_format):
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    if event_format == "sse":
+        return f"event: {event['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+async def stream_job_events(job, events, listener, event_format):
+    """Relay job events from the worker threads to a streaming response until the job is done"""
+    try:
+        yield format_stream_event(
+            {"event": "job", "job_id": job.job_id, "session_id": job.session_id, "status": job.status},
+            event_format
+        )
+        while True:
+            try:
+                event = await asyncio.wait_for(events.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Keep proxies from closing a quiet connection while the feed loads
+                yield ": keepalive\n\n" if event_format == "sse" else format_stream_event(
+                    {"event": "heartbeat", "job_id": job.job_id}, event_format
+                )
+                continue
+            yield format_stream_event(event, event_format)
+            if event["event"] == "done":
+                break
+    finally:
+        job.remove_listener(listener)
+
+@app.post("/scrape", response_model=ScrapeJobResponse, status_code=202)
+async def scrape_linkedin_posts(request: ScrapeRequest, http_request: Request, stream: bool = False):
     """
-    Scrape LinkedIn posts from one or more profiles
+    Queue a scrape of one or more LinkedIn profiles; poll /jobs/{job_id} for progress
+
+    With stream=true or an Accept: application/x-ndjson header the response is instead
+    a stream of NDJSON events (job, progress, post, heartbeat, done) sent as posts are
+    extracted; Accept: text/event-stream gets the same events as Server-Sent Events.
     """
-    session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    try:
-        logger.info(f"Starting scrape session {session_id} for {len(request.profile_urls)} profiles")
-        
-        all_posts = []
-        scraped_profiles = []
-        driver = None
-        
+    accept = http_request.headers.get("accept", "")
+    if "text/event-stream" in accept:
+        event_format = "sse"
+    elif stream or "application/x-ndjson" in accept:
+        event_format = "ndjson"
+    else:
+        event_format = None
+
+    if event_format is None:
         try:
-            # Setup driver
-            driver = setup_driver(headless=True)  # Use headless for API
-            
-            # Login once
-            login_linkedin(driver, request.email, request.password)
-            logger.info("Successfully logged into LinkedIn")
-            
-            # Scrape each profile
-            for profile_url in request.profile_urls:
-                try:
-                    logger.info(f"Scraping profile: {profile_url}")
-                    posts = scrape_posts(driver, profile_url, request.scrolls, request.max_posts)
-                    
-                    # Ensure each post has the profile URL
-                    for post in posts:
-                        if not post.get('profile_url'):
-                            post['profile_url'] = profile_url
-                    
-                    all_posts.extend(posts)
-                    scraped_profiles.append(profile_url)
-                    logger.info(f"Scraped {len(posts)} posts from {profile_url}")
-                    
-                except Exception as profile_error:
-                    logger.error(f"Error scraping {profile_url}: {str(profile_error)}")
-                    continue
-            
-            # Sort posts by timestamp (most recent first)
-            def get_timestamp(post):
-                ts = post.get('timestamp', '')
-                if not ts:
-                    return datetime.min
-                try:
-                    return datetime.fromisoformat(ts.replace('Z', '+00:00'))
-                except:
-                    return datetime.min
-            
-            all_posts = sorted(all_posts, key=get_timestamp, reverse=True)
-            
-            # Save to file in background
-            background_tasks.add_task(save_scrape_results, session_id, all_posts, scraped_profiles)
-            
-            # Convert to PostData models for response
-            post_models = []
-            for post in all_posts:
-                try:
-                    post_model = PostData(**post)
-                    post_models.append(post_model)
-                except Exception as e:
-                    logger.warning(f"Could not convert post to model: {e}")
-                    # Add with defaults
-                    post_model = PostData(
-                        post_number=post.get('post_number', 0),
-                        content=post.get('content', ''),
-                        timestamp=post.get('timestamp'),
-                        engagement=post.get('engagement', {}),
-                        post_type=post.get('post_type', 'text'),
-                        media_urls=post.get('media_urls', []),
-                        local_media_paths=post.get('local_media_paths', []),
-                        post_url=post.get('post_url'),
-                        profile_url=post.get('profile_url'),
-                        author_name=post.get('author_name'),
-                        author_avatar=post.get('author_avatar')
-                    )
-                    post_models.append(post_model)
-            
-            return ScrapeResponse(
-                success=True,
-                posts=post_models,
-                total_posts=len(post_models),
-                profiles_scraped=scraped_profiles
-            )
-            
-        except Exception as e:
-            logger.error(f"Scraping error: {str(e)}")
-            return ScrapeResponse(
-                success=False,
-                posts=[],
-                total_posts=0,
-                profiles_scraped=[],
-                error=str(e)
-            )
-            
-    except Exception as e:
-        logger.error(f"Request processing error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-        
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
+            job = scrape_sessions.submit(request)
+        except QueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        return ScrapeJobResponse(job_id=job.job_id, session_id=job.session_id, status=job.status)
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def listener(event):
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    try:
+        job = scrape_sessions.submit(request, streaming=True, listener=listener)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return StreamingResponse(
+        stream_job_events(job, events, listener, event_format),
+        media_type="text/event-stream" if event_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/jobs/{job_id}")
+def get_scrape_job(job_id: str):
+    """Get status, per-profile progress and (when finished) the result of a scrape job"""
+    job = scrape_sessions.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.delete("/jobs/{job_id}")
+def cancel_scrape_job(job_id: str):
+    """Cancel a queued or running scrape job"""
+    job = scrape_sessions.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.get("/drivers")
+def get_driver_pool():
+    """Inspect the warm driver pool"""
+    return driver_pool.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Scrape stage histograms and counters in the Prometheus text format"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/rate-limits")
+def get_rate_limits():
+    """Current pacing, slowdown and backoff signals per account"""
+    return rate_governor.stats()
+
+@app.get("/cache")
+def get_scrape_cache():
+    """Hit, shared and miss counts of the per-profile scrape result cache"""
+    return scrape_cache.stats()
+
+@app.get("/selectors")
+def get_selector_stats():
+    """Hit rate and latency of every candidate selector; dead ones never match anymore"""
+    return {"fields": get_selector_registry().stats()}
+
+@app.get("/watermarks")
+def get_activity_watermarks():
+    """Number of known posts per profile used by incremental scrapes"""
+    return {"profiles": activity_watermarks.stats()}
 
 @app.get("/sessions")
 def get_scrape_sessions():
     """Get list of previous scrape sessions"""
-    sessions_dir = "linkedin_posts"
-    if not os.path.exists(sessions_dir):
-        return {"sessions": []}
-    
-    sessions = []
-    for filename in os.listdir(sessions_dir):
-        if filename.endswith('.json'):
-            filepath = os.path.join(sessions_dir, filename)
-            try:
-                # Get file modification time
-                mtime = os.path.getmtime(filepath)
-                sessions.append({
-                    "session_id": filename.replace('linkedin_posts_', '').replace('.json', ''),
-                    "filename": filename,
-                    "timestamp": datetime.fromtimestamp(mtime).isoformat()
-                })
-            except:
-                continue
-    
-    # Sort by timestamp (most recent first)
-    sessions.sort(key=lambda x: x['timestamp'], reverse=True)
-    return {"sessions": sessions}
+    return {"sessions": session_store.list_sessions()}
 
 @app.get("/session/{session_id}")
-def get_session_data(session_id: str):
-    """Get data from a specific scrape session"""
-    # Try different filename patterns
-    filenames = [
-        f"linkedin_posts/linkedin_posts_{session_id}.json",
-        f"linkedin_posts/{session_id}.json",
-        f"linkedin_posts/session_{session_id}.json"
-    ]
-    
-    for filename in filenames:
-        if os.path.exists(filename):
-            try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Ensure proper structure
-                if isinstance(data, list):
-                    # Old format - just array of posts
-                    return {
-                        "session_id": session_id,
-                        "data": {
-                            "posts": data,
-                            "total_posts": len(data),
-                            "profiles_scraped": []
-                        }
-                    }
-                else:
-                    # New format with metadata
-                    return {"session_id": session_id, "data": data}
-                    
-            except Exception as e:
-                logger.error(f"Error reading session data: {str(e)}")
-                continue
-    
-    raise HTTPException(status_code=404, detail="Session not found")
+def get_session_data(
+    session_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_SESSION_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """Get data from a specific scrape session
 
-@app.get("/media/{session_id}/{filename}")
-async def serve_media_file(session_id: str, filename: str):
-    """Serve downloaded media files"""
-    file_path = f"linkedin_posts/media_{session_id}/{filename}"
-    
-    logger.info(f" Looking for media file: {file_path}")
-    
-    if not os.path.exists(file_path):
-        logger.error(f" Media file not found: {file_path}")
-        
-        # Check if media directory exists
-        media_dir = f"linkedin_posts/media_{session_id}"
-        if os.path.exists(media_dir):
-            files = os.listdir(media_dir)
-            logger.info(f" Files in {media_dir}: {files}")
-        else:
-            logger.info(f" Directory doesn't exist: {media_dir}")
-            
+    Without limit, cursor or fields the whole session is returned. Otherwise posts
+    are paged (limit defaults to 20): pass the returned next_cursor to get the
+    following page. fields is a comma-separated list of post fields to return
+    (e.g. fields=content,timestamp).
+    """
+    field_list = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+    if limit is None and cursor is None and field_list is None:
+        data = session_store.get_session(session_id)
+    else:
+        try:
+            data = session_store.get_session_page(
+                session_id, limit or DEFAULT_SESSION_PAGE_SIZE, cursor=cursor, fields=field_list
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if data is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"session_id": session_id, "data": data}
+
+@app.get("/search")
+def search_posts(
+    q: Optional[str] = None,
+    profile: Optional[str] = None,
+    post_type: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = Query(DEFAULT_SESSION_PAGE_SIZE, ge=1, le=MAX_SESSION_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    """Full-text search across all stored posts
+
+    q matches post content, author names and hashtags (ranked by relevance);
+    profile, post_type and the ISO since/until dates narrow the results.
+    """
+    return session_store.search(
+        q, profile_url=profile, post_type=post_type, since=since, until=until,
+        limit=limit, offset=offset
+    )
+
+@app.get("/posts")
+def get_canonical_posts(
+    profile: Optional[str] = None,
+    limit: int = Query(DEFAULT_SESSION_PAGE_SIZE, ge=1, le=MAX_SESSION_PAGE_SIZE),
+    offset: int = Query(0, ge=0)
+):
+    """Latest version of each scraped post, deduplicated across sessions by activity URN"""
+    return session_store.list_posts(profile_url=profile, limit=limit, offset=offset)
+
+# The engagement route comes first: {urn:path} also matches slashes, so post URLs work
+@app.get("/posts/{urn:path}/engagement")
+def get_post_engagement(urn: str):
+    """Reactions and comments of a post at every scrape that saw it"""
+    history = session_store.engagement_history(urn)
+    if history is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return history
+
+@app.get("/posts/{urn:path}")
+def get_canonical_post(urn: str):
+    """Latest stored version of one post (URN, post URL or activity id)"""
+    post = session_store.get_post(urn)
+    if post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return post
+
+@app.api_route("/media/{session_id}/{filename}", methods=["GET", "HEAD"])
+def serve_media_file(session_id: str, filename: str, request: Request, w: Optional[int] = Query(None, ge=1)):
+    """
+    Serve downloaded media files
+
+    Images are resized to the next width bucket at or above w and sent as WebP when
+    the Accept header allows it (needs Pillow; the original is sent otherwise).
+    Files never change once saved, so responses are cacheable for good and carry an
+    ETag for If-None-Match revalidation; Range requests get 206 partial content.
+    """
+    media = media_manifest.lookup(session_id, filename)
+    if media is None:
         raise HTTPException(status_code=404, detail=f"Media file not found: {filename}")
-    
-    logger.info(f" Serving media file: {file_path}")
-    return FileResponse(file_path)
 
-def save_scrape_results(session_id: str, posts: List[dict], profiles: List[str]):
-    """Background task to save scrape results"""
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "Accept-Ranges": "bytes"}
+    if media_variants.varies(media.content_type):
+        headers["Vary"] = "Accept"
+        choice = media_variants.select(media.content_type, w, request.headers.get("accept"))
+        if choice:
+            media = media_variants.get(media, *choice) or media
+    headers["ETag"] = media.etag
+    if etag_matches(request.headers.get("if-none-match"), media.etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range == media.etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), media.size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{media.size}"})
+
+    if byte_range is None:
+        return FileResponse(
+            media.path, headers=headers, media_type=media.content_type,
+            stat_result=media.stat_result, method=request.method
+        )
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{media.size}"
+    headers["Content-Length"] = str(end - start + 1)
+    if request.method == "HEAD":
+        return Response(status_code=206, headers=headers, media_type=media.content_type)
+    return StreamingResponse(
+        iter_file_range(media.path, start, end), status_code=206,
+        headers=headers, media_type=media.content_type
+    )
+
+def save_scrape_results(session_id: str, posts: List[dict], profiles: List[str], timings: Optional[dict] = None):
+    """Save scrape results for a finished session, with the scrape's timing breakdown; True if saved"""
     try:
         os.makedirs("linkedin_posts", exist_ok=True)
         filename = f"linkedin_posts/linkedin_posts_{session_id}.json"
@@ -295,16 +652,27 @@ def save_scrape_results(session_id: str, posts: List[dict], profiles: List[str])
             "timestamp": datetime.now().isoformat(),
             "profiles_scraped": profiles,
             "total_posts": len(posts),
+            "timings": timings or {},
             "posts": posts
         }
         
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+
+        session_store.save_session(
+            session_id, posts, profiles,
+            created_at=data["timestamp"],
+            meta={"session_id": session_id, "timestamp": data["timestamp"], "timings": data["timings"]},
+            filename=os.path.basename(filename),
+            source_mtime=os.path.getmtime(filename)
+        )
             
         logger.info(f"Saved scrape results to {filename}")
+        return True
         
     except Exception as e:
         logger.error(f"Error saving scrape results: {str(e)}")
+        return False
 
 if __name__ == "__main__":
     import uvicorn
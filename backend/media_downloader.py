@@ -0,0 +1,231 @@
+import os
+import time
+import hashlib
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from media_store import get_media_store
+from auth_store import LINKEDIN_URL
+from rate_governor import THROTTLED
+from metrics import MEDIA_DOWNLOAD_SECONDS, MEDIA_BYTES, MEDIA_REUSED, collect_timings
+
+MEDIA_EXTENSIONS = {
+    'video/mp4': 'mp4',
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif'
+}
+
+def media_extension(content_type):
+    """File extension for a media Content-Type; unknown types are assumed to be video."""
+    content_type = (content_type or '').lower()
+    for ct, extension in MEDIA_EXTENSIONS.items():
+        if ct in content_type:
+            return extension
+    return 'mp4'
+
+def browser_headers(driver):
+    """Cookies and request headers that make plain HTTP requests look like the browser session."""
+    cookie_dict = {cookie['name']: cookie['value'] for cookie in driver.get_cookies()}
+    headers = {
+        'User-Agent': driver.execute_script("return navigator.userAgent"),
+        'Referer': f'{LINKEDIN_URL}/',
+        'Accept': '*/*'
+    }
+    return cookie_dict, headers
+
+def media_filename(post_number, media_index, url, ext, kind="media"):
+    url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+    return f"post_{post_number}_{kind}_{media_index}_{url_hash}.{ext}"
+
+def save_media_response(response, session_id, post_number, media_index, url, store=None):
+    """Store a 200 media response in the blob store and link it into linkedin_posts/media_<session_id>/."""
+    store = store or get_media_store()
+    ext = media_extension(response.headers.get('content-type', ''))
+    blob = store.put_stream(response.iter_content(chunk_size=8192), ext)
+    store.remember(url, blob)
+
+    filename = media_filename(post_number, media_index, url, ext)
+    print(f"Downloaded: {filename}")
+    return store.link(blob, session_id, filename)
+
+def reuse_stored_media(url, session_id, post_number, media_index, store=None):
+    """Link media that an earlier session already downloaded; returns None if it is not stored."""
+    store = store or get_media_store()
+    blob = store.lookup(url)
+    if not blob:
+        return None
+    filename = media_filename(post_number, media_index, url, store.blob_ext(blob))
+    print(f"Reused stored media: {filename}")
+    return store.link(blob, session_id, filename)
+
+
+class MediaDownloader:
+    """Downloads post media in the background on a pooled HTTP session.
+
+    Extraction only queues URLs with submit(); the scraper keeps going and calls
+    wait_for(posts) once it needs local_media_paths filled in. Browser cookies and
+    headers are read from the driver once, on the first submit. URLs already in the
+    MediaStore are linked into the session without any request. An optional rate
+    governor paces the fetches and is told about 429 responses.
+    """
+
+    def __init__(self, session_id, max_workers=8, per_host=4, retries=3, timeout=(10, 60), store=None,
+                 governor=None, timings=None):
+        self.session_id = session_id
+        self.governor = governor
+        self.timings = timings
+        self.store = store or get_media_store()
+        self.timeout = timeout
+        self.http = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            # 429 is left to the caller so the rate governor hears about it and slows down
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=["GET"]
+        )
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+        self.http.mount("https://", adapter)
+        self.http.mount("http://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="media")
+        self.host_slots = defaultdict(lambda: threading.Semaphore(per_host))
+        self.lock = threading.Lock()
+        self.pending = {}
+        # Posts handed to when_done() whose callback has not finished yet
+        self.notifying = {}
+        self.browser_state_loaded = False
+
+    def capture_browser_state(self, driver):
+        with self.lock:
+            if self.browser_state_loaded:
+                return
+            cookie_dict, headers = browser_headers(driver)
+            self.http.cookies.update(cookie_dict)
+            self.http.headers.update(headers)
+            self.browser_state_loaded = True
+
+    def submit(self, post_data, url, media_index, driver):
+        """Queue an HTTP download for one media URL of a post."""
+        local_path = reuse_stored_media(url, self.session_id, post_data['post_number'], media_index, self.store)
+        if local_path:
+            MEDIA_REUSED.inc()
+            self.add_local(post_data, media_index, local_path)
+            return None
+        self.capture_browser_state(driver)
+        future = self.executor.submit(self._download, url, post_data['post_number'], media_index)
+        self._track(post_data, media_index, future)
+        return future
+
+    def add_local(self, post_data, media_index, local_path):
+        """Record media that was already saved inline (e.g. blob captures) so order is kept."""
+        self._track(post_data, media_index, local_path)
+
+    def wait_for(self, posts):
+        """Block until media queued for these posts is done and fill their local_media_paths.
+
+        Posts already handed to when_done() are waited for until their callback has run.
+        """
+        for post_data in posts:
+            with self.lock:
+                _, entries = self.pending.pop(id(post_data), (None, []))
+                _, notified = self.notifying.pop(id(post_data), (None, None))
+            if entries:
+                self._fill_local_paths(post_data, entries)
+            if notified:
+                notified.wait()
+
+    def when_done(self, post_data, callback):
+        """Call callback(post_data) once all media queued for the post is saved, without blocking.
+
+        The callback runs on a download thread (or right away if nothing is pending).
+        """
+        with self.lock:
+            _, entries = self.pending.pop(id(post_data), (None, []))
+        futures = [result for _, result in entries if hasattr(result, 'add_done_callback')]
+        if not futures:
+            self._fill_local_paths(post_data, entries)
+            callback(post_data)
+            return
+
+        remaining = [len(futures)]
+        remaining_lock = threading.Lock()
+        notified = threading.Event()
+        with self.lock:
+            self.notifying[id(post_data)] = (post_data, notified)
+
+        def on_future_done(_):
+            with remaining_lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            try:
+                self._fill_local_paths(post_data, entries)
+                callback(post_data)
+            finally:
+                notified.set()
+
+        for future in futures:
+            future.add_done_callback(on_future_done)
+
+    def _fill_local_paths(self, post_data, entries):
+        local_media_paths = []
+        for media_index, result in sorted(entries, key=lambda entry: entry[0]):
+            local_path = result if isinstance(result, str) or result is None else result.result()
+            if local_path:
+                local_media_paths.append(local_path)
+
+        if local_media_paths:
+            post_data['local_media_paths'] = local_media_paths
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.http.close()
+
+    def _track(self, post_data, media_index, result):
+        with self.lock:
+            # Holding post_data keeps its id() from being reused while downloads are pending
+            _, entries = self.pending.setdefault(id(post_data), (post_data, []))
+            entries.append((media_index, result))
+
+    def _host_slot(self, host):
+        with self.lock:
+            return self.host_slots[host]
+
+    def _download(self, url, post_number, media_index):
+        if self.timings is None:
+            return self._fetch(url, post_number, media_index)
+        # Worker threads add their timings to the job's breakdown
+        with collect_timings(self.timings):
+            return self._fetch(url, post_number, media_index)
+
+    def _fetch(self, url, post_number, media_index):
+        print(f"Downloading regular URL: {url[:100]}...")
+        host = urlparse(url).netloc
+        try:
+            if self.governor:
+                self.governor.acquire('media')
+            with self._host_slot(host):
+                started = time.time()
+                with self.http.get(url, timeout=self.timeout, stream=True) as response:
+                    if response.status_code == 429 and self.governor:
+                        self.governor.report(THROTTLED)
+                    if response.status_code != 200:
+                        print(f"Download failed with HTTP {response.status_code}: {url[:100]}")
+                        return None
+                    local_path = save_media_response(
+                        response, self.session_id, post_number, media_index, url, self.store
+                    )
+                    MEDIA_DOWNLOAD_SECONDS.observe(time.time() - started, source='http')
+                    # local_path is relative to the store root (media_<session_id>/<file>)
+                    MEDIA_BYTES.inc(os.path.getsize(os.path.join(self.store.root, local_path)), source='http')
+                    return local_path
+        except Exception as req_error:
+            print(f"Request error: {req_error}")
+            return None
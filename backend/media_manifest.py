@@ -0,0 +1,155 @@
+# media_manifest.py
+import os
+import mimetypes
+import threading
+
+MEDIA_ROOT = "linkedin_posts"
+# Session media files are never rewritten (MediaStore.link keeps an existing file), so
+# clients may keep them for good
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+class MediaFile:
+    __slots__ = ("path", "size", "mtime", "etag", "content_type", "stat_result")
+
+    def __init__(self, path, stat_result):
+        self.path = path
+        self.size = stat_result.st_size
+        self.mtime = stat_result.st_mtime
+        # Hardlinks of one blob share size and mtime, so the same content gets the same tag
+        self.etag = f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+        self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.stat_result = stat_result
+
+
+class MediaManifest:
+    """In-memory index of the files in every media_<session_id>/ directory.
+
+    A session directory is listed once, on its first request. Lookups of unknown
+    files only stat the directory: when its mtime is unchanged the file cannot have
+    appeared, so misses cost O(1) instead of a listing. Directories that changed
+    (a scrape still adding media) are listed again.
+    """
+
+    def __init__(self, root=MEDIA_ROOT):
+        self.root = root
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "scans": 0}
+
+    def lookup(self, session_id, filename):
+        """MediaFile for media_<session_id>/<filename>, or None."""
+        with self.lock:
+            session = self.sessions.get(session_id)
+            entry = session[1].get(filename) if session else None
+        if entry is not None:
+            self._count("hits")
+            return entry
+
+        media_dir = os.path.join(self.root, f"media_{session_id}")
+        try:
+            dir_mtime = os.stat(media_dir).st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            self._count("misses")
+            return None
+        if session is not None and session[0] == dir_mtime:
+            self._count("misses")
+            return None
+
+        files = self._scan(media_dir)
+        with self.lock:
+            self.sessions[session_id] = (dir_mtime, files)
+        entry = files.get(filename)
+        self._count("hits" if entry else "misses")
+        return entry
+
+    def forget(self, session_id):
+        with self.lock:
+            self.sessions.pop(session_id, None)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "sessions": len(self.sessions),
+                "files": sum(len(files) for _, files in self.sessions.values()),
+                **self.counters,
+            }
+
+    def _scan(self, media_dir):
+        self._count("scans")
+        files = {}
+        with os.scandir(media_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.endswith(".part"):
+                    files[entry.name] = MediaFile(entry.path, entry.stat())
+        return files
+
+    def _count(self, counter):
+        with self.lock:
+            self.counters[counter] += 1
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header names etag (weak comparison, as RFC 9110 asks)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def parse_range(header, size):
+    """(start, end) inclusive for a single "bytes=" range, or None to send the whole file.
+
+    Multiple ranges and malformed headers are answered with the whole file, which the
+    spec allows; a range starting past the end raises RangeNotSatisfiable.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    if not (start_text or end_text).isdigit() or (end_text and not end_text.isdigit()):
+        return None
+    if start_text:
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+        if end_text and end < start:
+            return None
+    else:
+        # bytes=-N is the last N bytes
+        length = int(end_text)
+        if length == 0:
+            raise RangeNotSatisfiable(header)
+        start, end = max(size - length, 0), size - 1
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+def iter_file_range(path, start, end, chunk_size=64 * 1024):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+_default_manifest = None
+_default_manifest_lock = threading.Lock()
+
+
+def get_media_manifest():
+    """Process-wide manifest of linkedin_posts/media_* directories."""
+    global _default_manifest
+    with _default_manifest_lock:
+        if _default_manifest is None:
+            _default_manifest = MediaManifest()
+        return _default_manifest
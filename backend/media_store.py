@@ -0,0 +1,181 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+MEDIA_ROOT = "linkedin_posts"
+
+
+def media_url_key(url):
+    """Stable key for a media URL.
+
+    LinkedIn CDN URLs carry an expiring signature in the query string (e=, t=) while the
+    path already identifies the file, so the query is dropped for media.licdn.com/dms.
+    """
+    if 'media.licdn.com/dms' in url:
+        parts = urlsplit(url)
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, '', ''))
+    return url
+
+
+class MediaStore:
+    """Content-addressed blob store for downloaded media, shared by all sessions.
+
+    Blobs live under <root>/blobs/<first two hex chars>/<sha256>.<ext>. Session media
+    directories only hold hardlinks (or copies where links are unsupported), so
+    /media/{session_id}/{filename} keeps working. An append-only index maps media
+    URLs to blobs so rescrapes skip files that were already downloaded.
+    """
+
+    def __init__(self, root=MEDIA_ROOT):
+        self.root = root
+        self.blob_root = os.path.join(root, "blobs")
+        self.index_path = os.path.join(self.blob_root, "index.jsonl")
+        self.lock = threading.Lock()
+        self.url_index = None
+        self.listeners = []
+
+    def lookup(self, url):
+        """Blob path already stored for this URL, or None."""
+        self._load_index()
+        blob = self.url_index.get(media_url_key(url))
+        if blob and os.path.exists(os.path.join(self.blob_root, blob)):
+            return blob
+        return None
+
+    def remember(self, url, blob):
+        self._load_index()
+        key = media_url_key(url)
+        with self.lock:
+            if self.url_index.get(key) == blob:
+                return
+            self.url_index[key] = blob
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({"url": key, "blob": blob}) + "\n")
+
+    def put_bytes(self, data, ext):
+        return self.put_stream([data], ext)
+
+    def put_stream(self, chunks, ext):
+        """Store streamed content and return its blob path (relative to the blob root)."""
+        os.makedirs(self.blob_root, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.blob_root, suffix=".part")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    if chunk:
+                        digest.update(chunk)
+                        f.write(chunk)
+
+            blob = self.blob_name(digest.hexdigest(), ext)
+            blob_path = os.path.join(self.blob_root, blob)
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            if os.path.exists(blob_path):
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, blob_path)
+            return blob
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def link(self, blob, session_id, filename):
+        """Expose a blob as media_<session_id>/<filename> and return that relative path."""
+        media_dir = os.path.join(self.root, f"media_{session_id}")
+        os.makedirs(media_dir, exist_ok=True)
+        target = os.path.join(media_dir, filename)
+        if not os.path.exists(target):
+            source = os.path.join(self.blob_root, blob)
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copyfile(source, target)
+            for listener in self.listeners:
+                listener(blob, target)
+        return f"media_{session_id}/{filename}"
+
+    def add_listener(self, listener):
+        """Call listener(blob, path) whenever a blob is linked into a session directory."""
+        self.listeners.append(listener)
+
+    @staticmethod
+    def blob_name(digest, ext):
+        return f"{digest[:2]}/{digest}.{ext}"
+
+    @staticmethod
+    def blob_ext(blob):
+        return blob.rsplit('.', 1)[-1]
+
+    def dedupe_existing(self):
+        """Move files of existing media_* session directories into the store and hardlink them back."""
+        saved = 0
+        for name in sorted(os.listdir(self.root)):
+            media_dir = os.path.join(self.root, name)
+            if not name.startswith("media_") or not os.path.isdir(media_dir):
+                continue
+            for filename in sorted(os.listdir(media_dir)):
+                path = os.path.join(media_dir, filename)
+                if not os.path.isfile(path) or os.stat(path).st_nlink > 1:
+                    continue
+                digest = hashlib.sha256()
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(65536), b''):
+                        digest.update(chunk)
+                blob_path = os.path.join(self.blob_root, self.blob_name(digest.hexdigest(), filename.rsplit('.', 1)[-1]))
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                if not os.path.exists(blob_path):
+                    try:
+                        os.link(path, blob_path)
+                    except OSError:
+                        shutil.copyfile(path, blob_path)
+                    continue
+                saved += os.path.getsize(path)
+                os.remove(path)
+                try:
+                    os.link(blob_path, path)
+                except OSError:
+                    shutil.copyfile(blob_path, path)
+        return saved
+
+    def _load_index(self):
+        if self.url_index is not None:
+            return
+        with self.lock:
+            if self.url_index is not None:
+                return
+            url_index = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                            url_index[entry["url"]] = entry["blob"]
+                        except (ValueError, KeyError):
+                            continue
+            os.makedirs(self.blob_root, exist_ok=True)
+            self.url_index = url_index
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_media_store():
+    """Process-wide MediaStore rooted at linkedin_posts/."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = MediaStore()
+        return _default_store
+
+
+if __name__ == "__main__":
+    root = sys.argv[1] if len(sys.argv) > 1 else MEDIA_ROOT
+    saved = MediaStore(root).dedupe_existing()
+    print(f"Deduplicated session media under {root}: {saved / (1024 * 1024):.1f} MB freed")
@@ -0,0 +1,159 @@
+# media_variants.py
+import os
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from media_manifest import MediaFile
+from metrics import MEDIA_VARIANTS_RENDERED
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it the originals are served
+    Image = ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+VARIANT_ROOT = os.path.join("linkedin_posts", "variants")
+DEFAULT_WIDTHS = (320, 640, 1080)
+# Formats Pillow re-encodes; animated GIFs and videos are always served as saved
+SOURCE_FORMATS = {"image/jpeg": "jpeg", "image/png": "png", "image/webp": "webp"}
+FORMAT_EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp"}
+
+
+class MediaVariants:
+    """Resized and WebP copies of saved images, rendered once per blob and kept on disk.
+
+    Variants live under <root>/<sha256[:2]>/<sha256>/<width>.<ext>, keyed by the content
+    hash of the original (its MediaStore blob name), so every session linking the same
+    blob shares them. schedule() renders the WebP widths of newly linked images in the
+    background; any other variant is rendered on its first request.
+    """
+
+    def __init__(self, root=VARIANT_ROOT, widths=DEFAULT_WIDTHS, workers=2, quality=80):
+        self.root = root
+        self.widths = tuple(sorted(widths))
+        self.quality = quality
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="media-variants")
+        self.digests = {}
+        self.render_locks = {}
+        self.lock = threading.Lock()
+
+    @property
+    def available(self):
+        return Image is not None
+
+    def varies(self, content_type):
+        """True if responses for this content type depend on the Accept header."""
+        return self.available and content_type in SOURCE_FORMATS
+
+    def select(self, content_type, width=None, accept=None):
+        """(width, format) to serve for a request, or None to serve the original.
+
+        width is rounded up to the next configured bucket; clients that accept WebP get it.
+        """
+        source_format = SOURCE_FORMATS.get(content_type)
+        if not self.available or source_format is None:
+            return None
+        image_format = "webp" if "image/webp" in (accept or "") else source_format
+        bucket = None
+        if width:
+            bucket = next((w for w in self.widths if w >= width), self.widths[-1])
+        if bucket is None and image_format == source_format:
+            return None
+        return bucket, image_format
+
+    def get(self, media, width, image_format):
+        """MediaFile of a variant of media, rendering it first if needed; None if that fails."""
+        try:
+            digest = self.digest(media.path, media.stat_result)
+            path = self.variant_path(digest, width, image_format)
+            if not os.path.exists(path):
+                with self._render_lock(digest):
+                    if not os.path.exists(path):
+                        self._render(media.path, digest, [width], image_format)
+            return MediaFile(path, os.stat(path))
+        except Exception as e:
+            logger.warning(f"Could not render {image_format} variant of {media.path}: {e}")
+            return None
+
+    def schedule(self, blob, path):
+        """MediaStore link listener: render the WebP widths of a newly linked image."""
+        ext = blob.rsplit('.', 1)[-1].lower()
+        if not self.available or ext not in ("jpg", "jpeg", "png", "webp"):
+            return
+        digest = os.path.basename(blob).rsplit('.', 1)[0]
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return
+        with self.lock:
+            self.digests[self._stat_key(stat_result)] = digest
+        if os.path.exists(self.variant_path(digest, self.widths[-1], "webp")):
+            return
+        self.executor.submit(self._render_scheduled, path, digest)
+
+    def digest(self, path, stat_result):
+        """SHA-256 of a media file; hardlinks of one blob share the cached value."""
+        key = self._stat_key(stat_result)
+        with self.lock:
+            digest = self.digests.get(key)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(chunk)
+            digest = sha.hexdigest()
+            with self.lock:
+                self.digests[key] = digest
+        return digest
+
+    def variant_path(self, digest, width, image_format):
+        return os.path.join(self.root, digest[:2], digest, f"{width or 'full'}.{FORMAT_EXTENSIONS[image_format]}")
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _render_scheduled(self, path, digest):
+        try:
+            with self._render_lock(digest):
+                missing = [w for w in self.widths if not os.path.exists(self.variant_path(digest, w, "webp"))]
+                if missing:
+                    self._render(path, digest, missing, "webp")
+        except Exception as e:
+            logger.warning(f"Could not render variants of {path}: {e}")
+
+    def _render(self, source_path, digest, widths, image_format):
+        """Decode the original once and write one variant per width (None keeps its size)."""
+        with Image.open(source_path) as original:
+            image = ImageOps.exif_transpose(original)
+            if image_format == "jpeg" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+            for width in widths:
+                resized = image
+                if width and image.width > width:
+                    resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+                path = self.variant_path(digest, width, image_format)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.part"
+                try:
+                    resized.save(tmp_path, format=image_format.upper(), quality=self.quality, optimize=True)
+                    os.replace(tmp_path, path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                MEDIA_VARIANTS_RENDERED.inc(format=image_format)
+
+    def _render_lock(self, key):
+        with self.lock:
+            lock = self.render_locks.get(key)
+            if lock is None:
+                lock = self.render_locks[key] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _stat_key(stat_result):
+        return (stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns)
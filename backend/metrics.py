@@ -0,0 +1,199 @@
+# metrics.py
+import time
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+# Seconds; covers single selector lookups up to full page loads
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in labels) + "}"
+
+
+class Counter:
+    def __init__(self, name, help, stage=None):
+        self.name = name
+        self.help = help
+        self.stage = stage
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        if self.stage:
+            timings = current_timings()
+            if timings is not None:
+                timings.add_total(self.stage, amount)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{format_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram; observations also go to the thread's StageTimings under stage."""
+
+    def __init__(self, name, help, stage, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.stage = stage
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, seconds, count=1, **labels):
+        """Record count observations of seconds each."""
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series["buckets"][i] += count
+            series["sum"] += seconds * count
+            series["count"] += count
+        timings = current_timings()
+        if timings is not None:
+            timings.add(self.stage, seconds * count, count)
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.time()
+        try:
+            yield
+        finally:
+            self.observe(time.time() - started, **labels)
+
+    def timed(self, **labels):
+        """Decorator that observes every call of the decorated function."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(**labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for key, series in sorted(self.series.items()):
+                for bound, value in zip(self.buckets, series["buckets"]):
+                    lines.append(f"{self.name}_bucket{format_labels(key + (('le', bound),))} {value}")
+                lines.append(f"{self.name}_bucket{format_labels(key + (('le', '+Inf'),))} {series['count']}")
+                lines.append(f"{self.name}_sum{format_labels(key)} {round(series['sum'], 6)}")
+                lines.append(f"{self.name}_count{format_labels(key)} {series['count']}")
+        return lines
+
+
+class StageTimings:
+    """Count and total of every instrumented stage during one scrape, for its session JSON."""
+
+    def __init__(self):
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    def add(self, stage, seconds, count=1):
+        with self.lock:
+            entry = self.stages.setdefault(stage, {"count": 0, "seconds": 0.0})
+            entry["count"] += count
+            entry["seconds"] += seconds
+
+    def add_total(self, stage, amount):
+        with self.lock:
+            entry = self.stages.setdefault(stage, {"total": 0})
+            entry["total"] += amount
+
+    def to_dict(self):
+        with self.lock:
+            result = {}
+            for stage, entry in sorted(self.stages.items()):
+                if "seconds" in entry:
+                    result[stage] = {
+                        "count": entry["count"],
+                        "seconds": round(entry["seconds"], 3),
+                        "avg_ms": round(entry["seconds"] / entry["count"] * 1000, 3) if entry["count"] else 0,
+                    }
+                else:
+                    result[stage] = dict(entry)
+            return result
+
+
+_local = threading.local()
+
+
+def current_timings():
+    stack = getattr(_local, "timings", None)
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def collect_timings(timings):
+    """Add every observation made on this thread to timings while the block runs."""
+    stack = getattr(_local, "timings", None)
+    if stack is None:
+        stack = _local.timings = []
+    stack.append(timings)
+    try:
+        yield timings
+    finally:
+        stack.pop()
+
+
+SETUP_DRIVER_SECONDS = Histogram(
+    "scraper_setup_driver_seconds", "Time to start a Chrome driver", "setup_driver")
+LOGIN_SECONDS = Histogram(
+    "scraper_login_seconds", "Time to log in to LinkedIn through the login form", "login")
+PAGE_LOAD_SECONDS = Histogram(
+    "scraper_page_load_seconds", "Time until a profile's activity page shows posts", "page_load")
+SCROLL_STEP_SECONDS = Histogram(
+    "scraper_scroll_step_seconds", "Time from one scroll until new posts appeared", "scroll_step")
+BATCH_READ_SECONDS = Histogram(
+    "scraper_batch_read_seconds", "Time of one script call reading the fields of many posts", "batch_read")
+EXTRACT_POST_SECONDS = Histogram(
+    "scraper_extract_post_seconds", "Time to extract one post, including queueing its media", "extract_post")
+SELECTOR_LOOKUP_SECONDS = Histogram(
+    "scraper_selector_lookup_seconds", "Time of one candidate selector lookup", "selector_lookup")
+MEDIA_DOWNLOAD_SECONDS = Histogram(
+    "scraper_media_download_seconds", "Time to download or capture one media file", "media_download")
+PERMALINK_MENU_SECONDS = Histogram(
+    "scraper_permalink_menu_seconds", "Time of one post menu copy-link attempt", "permalink_menu")
+MEDIA_BYTES = Counter(
+    "scraper_media_bytes_total", "Bytes of media saved", stage="media_bytes")
+MEDIA_REUSED = Counter(
+    "scraper_media_reused_total", "Media files linked from an earlier session without a download",
+    stage="media_reused")
+POSTS_EXTRACTED = Counter(
+    "scraper_posts_extracted_total", "Posts extracted", stage="posts_extracted")
+JOBS_FINISHED = Counter(
+    "scraper_jobs_finished_total", "Scrape jobs finished, by final status")
+MEDIA_VARIANTS_RENDERED = Counter(
+    "scraper_media_variants_rendered_total", "Resized or WebP media variants written, by format")
+
+METRICS = (
+    SETUP_DRIVER_SECONDS, LOGIN_SECONDS, PAGE_LOAD_SECONDS, SCROLL_STEP_SECONDS, BATCH_READ_SECONDS,
+    EXTRACT_POST_SECONDS, SELECTOR_LOOKUP_SECONDS, MEDIA_DOWNLOAD_SECONDS, PERMALINK_MENU_SECONDS,
+    MEDIA_BYTES, MEDIA_REUSED, POSTS_EXTRACTED, JOBS_FINISHED, MEDIA_VARIANTS_RENDERED,
+)
+
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,139 @@
+# rate_governor.py
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Signals scrapers report; each one slows the account down by its factor
+SLOW_LOAD = "slow_load"
+EMPTY_STATE = "empty_state"
+THROTTLED = "throttled"
+CHALLENGE = "challenge"
+BACKOFF_FACTORS = {SLOW_LOAD: 1.5, EMPTY_STATE: 1.25, THROTTLED: 2.0, CHALLENGE: 4.0}
+
+# Each normal page load brings the slowdown this much closer to full speed
+RECOVERY_FACTOR = 0.8
+
+
+class TokenBucket:
+    """Token bucket that hands out reservations, so waiting threads are served in order."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, rate_scale=1.0):
+        """Take one token and return how many seconds the caller must wait before using it."""
+        with self.lock:
+            now = time.monotonic()
+            rate = self.rate * rate_scale
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / rate
+
+    def available(self):
+        with self.lock:
+            return round(min(self.capacity, self.tokens + (time.monotonic() - self.updated) * self.rate), 2)
+
+
+class AccountGovernor:
+    """Paces navigations, scrolls, menu interactions and media fetches of one account.
+
+    All scrapes using the same credentials share one governor. Actions wait for a
+    token; reported signals (slow loads, empty states, throttling, challenge pages)
+    divide every rate by a growing slowdown factor, and normal page loads let it
+    recover. A challenge additionally pauses the account for challenge_cooldown seconds.
+    """
+
+    def __init__(self, rates, burst=3, max_slowdown=16.0, slow_load_seconds=8.0, challenge_cooldown=60.0):
+        self.buckets = {action: TokenBucket(rate, burst) for action, rate in rates.items()}
+        self.max_slowdown = max_slowdown
+        self.slow_load_seconds = slow_load_seconds
+        self.challenge_cooldown = challenge_cooldown
+        self.slowdown = 1.0
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+        self.waited = {action: 0.0 for action in rates}
+        self.signals = {signal: 0 for signal in BACKOFF_FACTORS}
+        self.last_signal = None
+
+    def acquire(self, action):
+        """Block until the account may perform action; returns the seconds waited."""
+        bucket = self.buckets.get(action)
+        if bucket is None:
+            return 0.0
+        with self.lock:
+            slowdown = self.slowdown
+            pause = max(0.0, self.paused_until - time.time())
+        wait = max(bucket.reserve(1.0 / slowdown), pause)
+        if wait > 0:
+            time.sleep(wait)
+            with self.lock:
+                self.waited[action] += wait
+        return wait
+
+    def report(self, signal):
+        with self.lock:
+            self.signals[signal] += 1
+            self.last_signal = {"signal": signal, "at": time.time()}
+            self.slowdown = min(self.max_slowdown, self.slowdown * BACKOFF_FACTORS[signal])
+            if signal == CHALLENGE:
+                self.paused_until = time.time() + self.challenge_cooldown
+            slowdown = self.slowdown
+        logger.warning(f"Rate governor: {signal}, slowing down to 1/{slowdown:.1f} speed")
+
+    def report_load(self, seconds):
+        """Report how long a page took to load; slow loads back off, normal ones recover."""
+        if seconds > self.slow_load_seconds:
+            self.report(SLOW_LOAD)
+            return
+        with self.lock:
+            self.slowdown = max(1.0, self.slowdown * RECOVERY_FACTOR)
+
+    def state(self):
+        with self.lock:
+            return {
+                "slowdown": round(self.slowdown, 2),
+                "paused_seconds": round(max(0.0, self.paused_until - time.time()), 1),
+                "tokens": {action: bucket.available() for action, bucket in self.buckets.items()},
+                "rates": {action: round(bucket.rate / self.slowdown, 3) for action, bucket in self.buckets.items()},
+                "waited_seconds": {action: round(waited, 2) for action, waited in self.waited.items()},
+                "signals": dict(self.signals),
+                "last_signal": self.last_signal,
+            }
+
+
+class RateGovernor:
+    """One AccountGovernor per LinkedIn account, created on first use."""
+
+    def __init__(self, navigations_per_minute=20, scrolls_per_second=2.0, interactions_per_second=1.0,
+                 media_per_second=10.0, **governor_options):
+        self.rates = {
+            "navigate": navigations_per_minute / 60.0,
+            "scroll": scrolls_per_second,
+            "interact": interactions_per_second,
+            "media": media_per_second,
+        }
+        self.governor_options = governor_options
+        self.accounts = {}
+        self.lock = threading.Lock()
+
+    def for_account(self, email):
+        key = email.strip().lower()
+        with self.lock:
+            if key not in self.accounts:
+                self.accounts[key] = AccountGovernor(self.rates, **self.governor_options)
+            return self.accounts[key]
+
+    def stats(self):
+        with self.lock:
+            accounts = dict(self.accounts)
+        return {
+            "rates": self.rates,
+            "accounts": {email: governor.state() for email, governor in accounts.items()},
+        }
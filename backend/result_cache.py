@@ -0,0 +1,114 @@
+# result_cache.py
+import copy
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError
+
+logger = logging.getLogger(__name__)
+
+CACHE_HIT = "hit"
+CACHE_SHARED = "shared"
+CACHE_MISS = "miss"
+
+
+class ResultCache:
+    """In-memory TTL cache with single-flight loading.
+
+    get_or_load() returns a cached value while it is younger than ttl seconds. Callers
+    asking for a key that is already being loaded wait for that load instead of
+    starting their own. Entries are evicted by age and, least recently used first,
+    once there are more than max_entries. Failed loads are not cached; callers that
+    were waiting on one retry the load themselves.
+    """
+
+    def __init__(self, ttl=600, max_entries=128):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.counters = {CACHE_HIT: 0, CACHE_SHARED: 0, CACHE_MISS: 0}
+
+    def get_or_load(self, key, loader, force_refresh=False, check_cancelled=None, poll_interval=0.5):
+        """Return (value, source) where source is "hit", "shared" or "miss".
+
+        force_refresh skips the cached value but still joins a load already in flight,
+        which is fresh anyway. check_cancelled is called while waiting and may raise.
+        The caller that ran the loader gets the loaded value itself; everyone else gets
+        a deep copy.
+        """
+        while True:
+            with self.lock:
+                self._evict()
+                entry = self.entries.get(key)
+                if entry is not None and not force_refresh:
+                    self.entries.move_to_end(key)
+                    self.counters[CACHE_HIT] += 1
+                    return copy.deepcopy(entry[1]), CACHE_HIT
+
+                future = self.in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self.in_flight[key] = future
+
+            if leader:
+                return self._load(key, loader, future), CACHE_MISS
+
+            while True:
+                if check_cancelled:
+                    check_cancelled()
+                try:
+                    value = future.result(timeout=poll_interval)
+                except TimeoutError:
+                    continue
+                except Exception as e:
+                    logger.info(f"Shared load of {key} failed ({e}); loading again")
+                    break
+                with self.lock:
+                    self.counters[CACHE_SHARED] += 1
+                return copy.deepcopy(value), CACHE_SHARED
+
+    def invalidate(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def stats(self):
+        with self.lock:
+            self._evict()
+            return {
+                "ttl": self.ttl,
+                "max_entries": self.max_entries,
+                "entries": len(self.entries),
+                "in_flight": len(self.in_flight),
+                **self.counters,
+            }
+
+    def _load(self, key, loader, future):
+        try:
+            value = loader()
+        except BaseException as e:
+            with self.lock:
+                self.in_flight.pop(key, None)
+                self.counters[CACHE_MISS] += 1
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            self.in_flight.pop(key, None)
+            self.counters[CACHE_MISS] += 1
+            if self.ttl > 0:
+                self.entries[key] = (time.time(), value)
+                self.entries.move_to_end(key)
+                self._evict()
+        future.set_result(value)
+        return value
+
+    def _evict(self):
+        oldest_allowed = time.time() - self.ttl
+        for key in [key for key, (stored_at, _) in self.entries.items() if stored_at < oldest_allowed]:
+            del self.entries[key]
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
@@ -0,0 +1,123 @@
+# selector_registry.py
+import os
+import json
+import time
+import threading
+
+SELECTOR_STATS_PATH = "linkedin_posts/selector_stats.json"
+
+# A selector tried this often without a single match is reported as dead
+DEAD_AFTER_ATTEMPTS = 50
+# ...and tried after the others once it has missed this often without ever matching
+DEMOTE_AFTER_ATTEMPTS = 10
+
+
+class SelectorRegistry:
+    """Hit-rate and latency statistics per candidate selector of a post field.
+
+    Candidates are listed most specific first and the first match wins, so ordered()
+    keeps that authored priority: it only moves selectors that have never matched in
+    DEMOTE_AFTER_ATTEMPTS tries behind the rest. When LinkedIn's markup changes, the
+    selectors that stopped matching stop costing a lookup on every post. Statistics are kept in memory and written to path at most every save_interval
+    seconds, and on flush().
+    """
+
+    def __init__(self, path=SELECTOR_STATS_PATH, save_interval=30.0):
+        self.path = path
+        self.save_interval = save_interval
+        self.lock = threading.Lock()
+        self.fields = None
+        self.dirty = False
+        self.saved_at = time.time()
+
+    def ordered(self, field, selectors):
+        """selectors of field in their given order, with ones that never match moved to the end."""
+        self._load()
+        with self.lock:
+            stats = self.fields.get(field, {})
+
+            def never_matches(selector):
+                entry = stats.get(selector)
+                return bool(entry) and entry["attempts"] >= DEMOTE_AFTER_ATTEMPTS and not entry["hits"]
+
+            demoted = [selector for selector in selectors if never_matches(selector)]
+            return [selector for selector in selectors if selector not in demoted] + demoted
+
+    def record(self, field, selector, hits, seconds=0.0, attempts=1):
+        """Count attempts lookups of selector (hits of them matched) taking seconds in total."""
+        self._load()
+        with self.lock:
+            entry = self.fields.setdefault(field, {}).setdefault(
+                selector, {"attempts": 0, "hits": 0, "seconds": 0.0}
+            )
+            entry["attempts"] += attempts
+            entry["hits"] += int(hits)
+            entry["seconds"] += seconds
+            self.dirty = True
+        self._maybe_save()
+
+    def stats(self):
+        self._load()
+        with self.lock:
+            return {
+                field: [
+                    {
+                        "selector": selector,
+                        "attempts": entry["attempts"],
+                        "hits": entry["hits"],
+                        "hit_rate": round(entry["hits"] / entry["attempts"], 3) if entry["attempts"] else None,
+                        "avg_ms": round(entry["seconds"] / entry["attempts"] * 1000, 3) if entry["attempts"] else None,
+                        "dead": entry["attempts"] >= DEAD_AFTER_ATTEMPTS and not entry["hits"],
+                    }
+                    for selector, entry in selectors.items()
+                ]
+                for field, selectors in self.fields.items()
+            }
+
+    def flush(self):
+        self._load()
+        with self.lock:
+            if self.dirty:
+                self._save()
+
+    def _maybe_save(self):
+        with self.lock:
+            if self.dirty and time.time() - self.saved_at >= self.save_interval:
+                self._save()
+
+    def _load(self):
+        if self.fields is not None:
+            return
+        with self.lock:
+            if self.fields is not None:
+                return
+            fields = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        fields = json.load(f)
+                except (OSError, ValueError):
+                    fields = {}
+            self.fields = fields
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.fields, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+        self.saved_at = time.time()
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_selector_registry():
+    """Process-wide SelectorRegistry persisted at SELECTOR_STATS_PATH."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = SelectorRegistry()
+        return _default_registry
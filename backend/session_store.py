@@ -0,0 +1,602 @@
+# session_store.py
+import os
+import re
+import json
+import base64
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+SESSIONS_DIR = "linkedin_posts"
+DB_PATH = os.path.join(SESSIONS_DIR, "sessions.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    filename TEXT,
+    created_at TEXT NOT NULL,
+    total_posts INTEGER NOT NULL DEFAULT 0,
+    profiles_scraped TEXT NOT NULL DEFAULT '[]',
+    meta TEXT NOT NULL DEFAULT '{}',
+    source_mtime REAL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_created ON sessions(created_at);
+
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL REFERENCES sessions(session_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    post_number INTEGER,
+    profile_url TEXT,
+    author_name TEXT,
+    post_type TEXT,
+    timestamp TEXT,
+    data TEXT NOT NULL,
+    UNIQUE (session_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_posts_profile ON posts(profile_url);
+CREATE INDEX IF NOT EXISTS idx_posts_author ON posts(author_name);
+CREATE INDEX IF NOT EXISTS idx_posts_type ON posts(post_type);
+CREATE INDEX IF NOT EXISTS idx_posts_timestamp ON posts(timestamp);
+"""
+
+# One row per post across all sessions (its latest version), plus the engagement
+# counts of every session it was scraped in
+CANONICAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS canonical_posts (
+    urn TEXT PRIMARY KEY,
+    post_url TEXT,
+    profile_url TEXT,
+    author_name TEXT,
+    post_type TEXT,
+    timestamp TEXT,
+    sort_time TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    last_session_id TEXT,
+    reactions INTEGER,
+    comments INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_canonical_profile ON canonical_posts(profile_url, sort_time);
+CREATE INDEX IF NOT EXISTS idx_canonical_sort_time ON canonical_posts(sort_time);
+
+CREATE TABLE IF NOT EXISTS engagement_snapshots (
+    urn TEXT NOT NULL REFERENCES canonical_posts(urn) ON DELETE CASCADE,
+    session_id TEXT NOT NULL,
+    captured_at TEXT NOT NULL,
+    reactions INTEGER,
+    comments INTEGER,
+    PRIMARY KEY (urn, session_id)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_urn_time ON engagement_snapshots(urn, captured_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_session ON engagement_snapshots(session_id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    content, author_name, hashtags,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# bm25 column weights for content, author_name, hashtags
+FTS_WEIGHTS = (1.0, 2.0, 3.0)
+
+HASHTAG_RE = re.compile(r'#(\w+)', re.UNICODE)
+POST_URN_RE = re.compile(r'urn:li:(?:activity|ugcPost|share):\d+')
+ACTIVITY_ID_RE = re.compile(r'activity[:-](\d+)')
+# The suffix must end the word, so "3 Bob Smith and others" is 3, not 3 billion
+ENGAGEMENT_COUNT_RE = re.compile(r'(\d[\d.,\s]*)\s*(?:([KkMmBb])(?![A-Za-z]))?')
+COUNT_SUFFIXES = {"k": 1000, "m": 1000000, "b": 1000000000}
+SEARCH_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Filename prefixes tried by the old file-based /session/{id} lookup
+SESSION_FILE_PREFIXES = ("linkedin_posts_", "session_")
+
+
+def session_id_from_filename(filename):
+    name = filename[:-len(".json")] if filename.endswith(".json") else filename
+    for prefix in SESSION_FILE_PREFIXES:
+        if name.startswith(prefix):
+            return name[len(prefix):]
+    return name
+
+
+def session_created_at(data, session_id, mtime):
+    """When a session file was scraped: its recorded timestamp, else the time in its
+    YYYYMMDD_HHMMSS session id, and only as a last resort the file's mtime (which a
+    clone or checkout resets)."""
+    if isinstance(data, dict) and data.get("timestamp"):
+        try:
+            return datetime.fromisoformat(str(data["timestamp"]).replace("Z", "+00:00")).isoformat()
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(session_id[:15], "%Y%m%d_%H%M%S").isoformat()
+    except ValueError:
+        return datetime.fromtimestamp(mtime).isoformat()
+
+
+def post_urn(post_url):
+    """Canonical URN of a post from its post_url (or a bare URN / activity id), or None."""
+    value = str(post_url or "")
+    if value.isdigit():
+        return f"urn:li:activity:{value}"
+    match = POST_URN_RE.search(value)
+    if match:
+        return match.group(0)
+    match = ACTIVITY_ID_RE.search(value)
+    return f"urn:li:activity:{match.group(1)}" if match else None
+
+
+def parse_engagement_count(text):
+    """Integer from an engagement string such as "1,234", "1.2K" or "12 comments"; None if absent."""
+    if isinstance(text, int):
+        return text
+    match = ENGAGEMENT_COUNT_RE.search(str(text or ""))
+    if not match:
+        return None
+    number, suffix = re.sub(r'\s', '', match.group(1)).rstrip('.,'), match.group(2)
+    if suffix:
+        # "1.2K" / "1,2K": the separator is a decimal point
+        return int(round(float(number.replace(',', '.')) * COUNT_SUFFIXES[suffix.lower()]))
+    return int(number.replace(',', '').replace('.', ''))
+
+
+def extract_hashtags(text):
+    return " ".join(tag.lower() for tag in HASHTAG_RE.findall(text or ""))
+
+
+def fts_query(query):
+    """Turn free text into an FTS5 query: every word must match, last word as a prefix."""
+    tokens = SEARCH_TOKEN_RE.findall(query or "")
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(f"p:{position}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Position encoded by encode_cursor; raises ValueError for malformed cursors."""
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, position = decoded.split(":", 1)
+        if prefix != "p":
+            raise ValueError(cursor)
+        return int(position)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+class SessionStore:
+    """SQLite-backed store of scrape sessions and their posts.
+
+    Sessions saved by the API go straight in through save_session(). Session JSON
+    files under linkedin_posts/ (both the bare post list and the metadata object
+    format) are imported on startup and whenever the directory's mtime changes,
+    i.e. a file was added, removed or replaced; a scan re-imports only files whose
+    own mtime changed.
+    """
+
+    def __init__(self, db_path=DB_PATH, sessions_dir=SESSIONS_DIR):
+        self.db_path = db_path
+        self.sessions_dir = sessions_dir
+        self.local = threading.local()
+        self.import_lock = threading.Lock()
+        self.scanned_dir_mtime = None
+        self.skipped_files = {}
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+            conn.executescript(CANONICAL_SCHEMA)
+        self.fts_enabled = self._init_fts()
+        self._init_canonical()
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self.local.conn = conn
+        return conn
+
+    def save_session(self, session_id, posts, profiles, created_at=None, meta=None,
+                     filename=None, source_mtime=None):
+        """Insert or replace a session and all of its posts (and their search index rows) in one transaction."""
+        created_at = created_at or datetime.now().isoformat()
+        meta = meta or {}
+        conn = self.connection()
+        with conn:
+            if self.fts_enabled:
+                conn.execute(
+                    "DELETE FROM posts_fts WHERE rowid IN (SELECT id FROM posts WHERE session_id = ?)",
+                    (session_id,)
+                )
+            conn.execute("DELETE FROM posts WHERE session_id = ?", (session_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions "
+                "(session_id, filename, created_at, total_posts, profiles_scraped, meta, source_mtime) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session_id, filename, created_at, len(posts), json.dumps(profiles),
+                 json.dumps(meta, ensure_ascii=False), source_mtime)
+            )
+            conn.executemany(
+                "INSERT INTO posts "
+                "(session_id, position, post_number, profile_url, author_name, post_type, timestamp, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (session_id, position, post.get('post_number'), post.get('profile_url'),
+                     post.get('author_name'), post.get('post_type'), post.get('timestamp'),
+                     json.dumps(post, ensure_ascii=False))
+                    for position, post in enumerate(posts)
+                ]
+            )
+            if self.fts_enabled:
+                self._index_session(conn, session_id)
+            self._upsert_canonical(conn, session_id, created_at, posts)
+
+    def list_posts(self, profile_url=None, limit=20, offset=0):
+        """Latest version of every post scraped so far (one per URN), newest first."""
+        self.refresh()
+        sql = "SELECT * FROM canonical_posts"
+        params = []
+        if profile_url:
+            sql += " WHERE profile_url = ?"
+            params.append(profile_url.rstrip('/'))
+        sql += " ORDER BY sort_time DESC LIMIT ? OFFSET ?"
+        params.extend([limit + 1, offset])
+        rows = self.connection().execute(sql, params).fetchall()
+        return {
+            "posts": [self._canonical_post(row) for row in rows[:limit]],
+            "limit": limit,
+            "offset": offset,
+            "next_offset": offset + limit if len(rows) > limit else None,
+        }
+
+    def get_post(self, urn):
+        self.refresh()
+        row = self.connection().execute(
+            "SELECT * FROM canonical_posts WHERE urn = ?", (post_urn(urn),)
+        ).fetchone()
+        return self._canonical_post(row) if row else None
+
+    def engagement_history(self, urn):
+        """Reactions and comments of a post in every session that scraped it, oldest first; None if unknown."""
+        self.refresh()
+        urn = post_urn(urn)
+        conn = self.connection()
+        if conn.execute("SELECT 1 FROM canonical_posts WHERE urn = ?", (urn,)).fetchone() is None:
+            return None
+        rows = conn.execute(
+            "SELECT session_id, captured_at, reactions, comments FROM engagement_snapshots "
+            "WHERE urn = ? ORDER BY captured_at",
+            (urn,)
+        ).fetchall()
+        return {"urn": urn, "snapshots": [dict(row) for row in rows]}
+
+    def list_sessions(self):
+        self.refresh()
+        rows = self.connection().execute(
+            "SELECT session_id, filename, created_at, total_posts FROM sessions ORDER BY created_at DESC"
+        ).fetchall()
+        return [
+            {
+                "session_id": row["session_id"],
+                "filename": row["filename"],
+                "timestamp": row["created_at"],
+                "total_posts": row["total_posts"],
+            }
+            for row in rows
+        ]
+
+    def get_session(self, session_id):
+        """Session metadata plus all posts in saved order, or None."""
+        self.refresh()
+        conn = self.connection()
+        row = conn.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        posts = [
+            json.loads(post_row["data"])
+            for post_row in conn.execute(
+                "SELECT data FROM posts WHERE session_id = ? ORDER BY position", (session_id,)
+            )
+        ]
+        data = json.loads(row["meta"])
+        data.update({
+            "profiles_scraped": json.loads(row["profiles_scraped"]),
+            "total_posts": row["total_posts"],
+            "posts": posts,
+        })
+        return data
+
+    def get_session_page(self, session_id, limit, cursor=None, fields=None):
+        """One page of a session's posts, read through the (session_id, position) index.
+
+        cursor is the opaque next_cursor of the previous page; fields optionally limits
+        each post to those keys. Cost depends on the page size, not the session size.
+        """
+        self.refresh()
+        conn = self.connection()
+        row = conn.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+
+        after = decode_cursor(cursor) if cursor else -1
+        rows = conn.execute(
+            "SELECT position, data FROM posts WHERE session_id = ? AND position > ? "
+            "ORDER BY position LIMIT ?",
+            (session_id, after, limit + 1)
+        ).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        posts = [json.loads(post_row["data"]) for post_row in rows]
+        if fields:
+            posts = [{key: post[key] for key in fields if key in post} for post in posts]
+
+        data = json.loads(row["meta"])
+        data.update({
+            "profiles_scraped": json.loads(row["profiles_scraped"]),
+            "total_posts": row["total_posts"],
+            "posts": posts,
+            "limit": limit,
+            "next_cursor": encode_cursor(rows[-1]["position"]) if has_more else None,
+        })
+        return data
+
+    def search(self, query=None, profile_url=None, post_type=None, since=None, until=None,
+               limit=20, offset=0):
+        """Ranked full-text search over content, author names and hashtags of every stored post.
+
+        since/until compare against the post timestamp, or the session time for posts
+        without one. Without a query, matching posts are returned newest first.
+        """
+        self.refresh()
+        match = fts_query(query)
+        where = []
+        params = []
+
+        if match and self.fts_enabled:
+            select = (
+                "SELECT p.session_id, p.position, p.data, "
+                "bm25(posts_fts, ?, ?, ?) AS score, "
+                "snippet(posts_fts, 0, '<mark>', '</mark>', '…', 16) AS snippet "
+                "FROM posts_fts JOIN posts p ON p.id = posts_fts.rowid "
+                "JOIN sessions s ON s.session_id = p.session_id"
+            )
+            params.extend(FTS_WEIGHTS)
+            where.append("posts_fts MATCH ?")
+            params.append(match)
+            order = "score"
+        else:
+            select = (
+                "SELECT p.session_id, p.position, p.data, NULL AS score, NULL AS snippet "
+                "FROM posts p JOIN sessions s ON s.session_id = p.session_id"
+            )
+            if match:
+                # Without FTS5 fall back to a substring scan
+                for token in SEARCH_TOKEN_RE.findall(query):
+                    where.append("(json_extract(p.data, '$.content') LIKE ? OR p.author_name LIKE ?)")
+                    params.extend([f"%{token}%", f"%{token}%"])
+            order = "COALESCE(NULLIF(p.timestamp, ''), s.created_at) DESC"
+
+        if profile_url:
+            where.append("rtrim(p.profile_url, '/') = rtrim(?, '/')")
+            params.append(profile_url)
+        if post_type:
+            where.append("p.post_type = ?")
+            params.append(post_type)
+        if since:
+            where.append("COALESCE(NULLIF(p.timestamp, ''), s.created_at) >= ?")
+            params.append(since)
+        if until:
+            where.append("COALESCE(NULLIF(p.timestamp, ''), s.created_at) <= ?")
+            params.append(until)
+
+        sql = select
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order} LIMIT ? OFFSET ?"
+        params.extend([limit + 1, offset])
+
+        rows = self.connection().execute(sql, params).fetchall()
+        results = [
+            {
+                "session_id": row["session_id"],
+                "position": row["position"],
+                "score": -row["score"] if row["score"] is not None else None,
+                "snippet": row["snippet"],
+                "post": json.loads(row["data"]),
+            }
+            for row in rows[:limit]
+        ]
+        return {
+            "results": results,
+            "limit": limit,
+            "offset": offset,
+            "next_offset": offset + limit if len(rows) > limit else None,
+        }
+
+    def refresh(self):
+        """Import session files written outside save_session(); one stat while the directory is unchanged.
+
+        A file rewritten in place without replacing it leaves the directory's mtime
+        alone and is only picked up by the next scan.
+        """
+        try:
+            dir_mtime = os.stat(self.sessions_dir).st_mtime_ns
+        except OSError:
+            return
+        if dir_mtime == self.scanned_dir_mtime:
+            return
+        with self.import_lock:
+            if dir_mtime == self.scanned_dir_mtime:
+                return
+            self.import_legacy()
+            self.scanned_dir_mtime = dir_mtime
+
+    def import_legacy(self):
+        """Import every session JSON file that is new or changed since it was last imported."""
+        known = {
+            row["filename"]: row["source_mtime"]
+            for row in self.connection().execute("SELECT filename, source_mtime FROM sessions")
+        }
+        imported = 0
+        for filename in os.listdir(self.sessions_dir):
+            if not filename.endswith('.json'):
+                continue
+            filepath = os.path.join(self.sessions_dir, filename)
+            try:
+                mtime = os.path.getmtime(filepath)
+                if known.get(filename) == mtime or self.skipped_files.get(filename) == mtime:
+                    continue
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.error(f"Error reading session file {filename}: {str(e)}")
+                continue
+
+            if isinstance(data, list):
+                # Old format - just array of posts
+                posts, profiles, meta = data, [], {}
+            elif isinstance(data, dict) and isinstance(data.get("posts"), list):
+                posts = data["posts"]
+                profiles = data.get("profiles_scraped", [])
+                meta = {k: v for k, v in data.items() if k not in ("posts", "profiles_scraped", "total_posts")}
+            else:
+                # Some other JSON file (e.g. seen_activity.json); don't re-read it until it changes
+                self.skipped_files[filename] = mtime
+                continue
+
+            session_id = session_id_from_filename(filename)
+            self.save_session(
+                session_id, posts, profiles,
+                created_at=session_created_at(data, session_id, mtime),
+                meta=meta, filename=filename, source_mtime=mtime
+            )
+            imported += 1
+
+        if imported:
+            logger.info(f"Imported {imported} session files into {self.db_path}")
+        return imported
+
+    def _init_fts(self):
+        conn = self.connection()
+        try:
+            with conn:
+                conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, search falls back to substring matching: {e}")
+            return False
+
+        # Backfill posts stored before the search index existed
+        indexed = conn.execute("SELECT COUNT(*) FROM posts_fts").fetchone()[0]
+        stored = conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+        if stored and indexed != stored:
+            with conn:
+                conn.execute("DELETE FROM posts_fts")
+                for row in conn.execute("SELECT DISTINCT session_id FROM posts").fetchall():
+                    self._index_session(conn, row["session_id"])
+            logger.info(f"Indexed {stored} stored posts for full-text search")
+        return True
+
+    def _init_canonical(self):
+        conn = self.connection()
+        if conn.execute("SELECT 1 FROM canonical_posts LIMIT 1").fetchone() is not None:
+            return
+        sessions = conn.execute("SELECT session_id, created_at FROM sessions ORDER BY created_at").fetchall()
+        if not sessions:
+            return
+        # Build canonical posts from sessions stored before the table existed, oldest first
+        with conn:
+            for session in sessions:
+                posts = [
+                    json.loads(row["data"])
+                    for row in conn.execute(
+                        "SELECT data FROM posts WHERE session_id = ? ORDER BY position", (session["session_id"],)
+                    )
+                ]
+                self._upsert_canonical(conn, session["session_id"], session["created_at"], posts)
+        total = conn.execute("SELECT COUNT(*) FROM canonical_posts").fetchone()[0]
+        logger.info(f"Built {total} canonical posts from {len(sessions)} stored sessions")
+
+    def _upsert_canonical(self, conn, session_id, captured_at, posts):
+        """Record a session's posts by URN: newer sessions replace the stored version, each adds a snapshot."""
+        conn.execute("DELETE FROM engagement_snapshots WHERE session_id = ?", (session_id,))
+        rows = {}
+        for post in posts:
+            urn = post_urn(post.get('post_url'))
+            if not urn:
+                continue
+            engagement = post.get('engagement') or {}
+            rows[urn] = (
+                urn, post.get('post_url'), (post.get('profile_url') or '').rstrip('/') or None,
+                post.get('author_name'), post.get('post_type'), post.get('timestamp'),
+                post.get('timestamp') or captured_at, captured_at, captured_at, session_id,
+                parse_engagement_count(engagement.get('reactions')),
+                parse_engagement_count(engagement.get('comments')),
+                json.dumps(post, ensure_ascii=False)
+            )
+        if not rows:
+            return
+
+        conn.executemany(
+            "INSERT INTO canonical_posts "
+            "(urn, post_url, profile_url, author_name, post_type, timestamp, sort_time, first_seen, "
+            "last_seen, last_session_id, reactions, comments, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(urn) DO UPDATE SET "
+            "post_url = excluded.post_url, profile_url = excluded.profile_url, "
+            "author_name = excluded.author_name, post_type = excluded.post_type, "
+            "timestamp = excluded.timestamp, sort_time = excluded.sort_time, last_seen = excluded.last_seen, "
+            "last_session_id = excluded.last_session_id, reactions = excluded.reactions, "
+            "comments = excluded.comments, data = excluded.data "
+            "WHERE excluded.last_seen >= canonical_posts.last_seen",
+            list(rows.values())
+        )
+        conn.executemany(
+            "UPDATE canonical_posts SET first_seen = ? WHERE urn = ? AND first_seen > ?",
+            [(captured_at, urn, captured_at) for urn in rows]
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO engagement_snapshots (urn, session_id, captured_at, reactions, comments) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(row[0], session_id, captured_at, row[10], row[11]) for row in rows.values()]
+        )
+
+    @staticmethod
+    def _canonical_post(row):
+        return {
+            "urn": row["urn"],
+            "first_seen": row["first_seen"],
+            "last_seen": row["last_seen"],
+            "last_session_id": row["last_session_id"],
+            "reactions": row["reactions"],
+            "comments": row["comments"],
+            "post": json.loads(row["data"]),
+        }
+
+    def _index_session(self, conn, session_id):
+        rows = conn.execute(
+            "SELECT id, author_name, data FROM posts WHERE session_id = ?", (session_id,)
+        ).fetchall()
+        entries = []
+        for row in rows:
+            content = json.loads(row["data"]).get("content") or ""
+            entries.append((row["id"], content, row["author_name"] or "", extract_hashtags(content)))
+        conn.executemany(
+            "INSERT INTO posts_fts (rowid, content, author_name, hashtags) VALUES (?, ?, ?, ?)",
+            entries
+        )
@@ -0,0 +1,55 @@
+# conftest.py
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Backend modules import each other top-level style, as when run from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class MediaHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        status, body, content_type, *delay = self.server.routes.get(self.path, (404, b"missing", "text/plain"))
+        if delay:
+            time.sleep(delay[0])
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def media_server():
+    """Local HTTP server; set server.routes[path] = (status, body, content_type[, delay_seconds])."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MediaHandler)
+    server.routes = {}
+    server.requests = []
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class BrowserDriver:
+    """Just the WebDriver calls MediaDownloader makes to copy the browser's cookies."""
+
+    def get_cookies(self):
+        return [{"name": "li_at", "value": "token"}]
+
+    def execute_script(self, script, *args):
+        return "Mozilla/5.0 (tests)"
+
+
+@pytest.fixture
+def browser_driver():
+    return BrowserDriver()
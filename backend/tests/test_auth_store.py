@@ -0,0 +1,102 @@
+# test_auth_store.py
+import os
+import time
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from auth_store import AuthStore, account_key
+
+FEED = "https://www.linkedin.com/feed/"
+COOKIES = [
+    {"name": "li_at", "value": "secret-token", "domain": ".linkedin.com", "path": "/", "secure": True},
+    {"name": "tracker", "value": "x", "domain": ".example.com", "path": "/"},
+]
+
+
+class CookieDriver:
+    """Keeps the cookies it is given; logged_in decides where a visit to the feed lands."""
+
+    def __init__(self, cookies=(), logged_in=True):
+        self.cookies = list(cookies)
+        self.logged_in = logged_in
+        self.current_url = "about:blank"
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Network.setCookie":
+            self.cookies.append(params)
+
+    def get(self, url):
+        self.current_url = url if self.logged_in else "https://www.linkedin.com/login"
+
+    def find_elements(self, by, value):
+        return [object()] if self.logged_in and self.current_url == FEED else []
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.delenv("AUTH_STORE_KEY", raising=False)
+    return AuthStore(root=str(tmp_path / ".auth"), validate_timeout=0.1)
+
+
+def test_cookies_are_encrypted_and_restored(store):
+    account = account_key("a@example.com", "pw")
+    store.save(CookieDriver(COOKIES, logged_in=True), account)
+
+    files = [name for name in os.listdir(store.root) if name.endswith(".session")]
+    assert len(files) == 1 and "example" not in files[0]
+    with open(os.path.join(store.root, files[0]), "rb") as f:
+        assert b"secret-token" not in f.read()
+    assert oct(os.stat(os.path.join(store.root, ".key")).st_mode & 0o777) == "0o600"
+
+    driver = CookieDriver()
+    assert store.restore(driver, account)
+    assert [cookie["name"] for cookie in driver.cookies] == ["li_at"]
+
+
+def test_a_different_password_gets_a_different_session(store):
+    store.save(CookieDriver(COOKIES), account_key("a@example.com", "pw"))
+
+    assert store.load(account_key("a@example.com", "pw")) is not None
+    assert store.load(account_key("a@example.com", "other")) is None
+
+
+def test_expired_sessions_are_forgotten(store):
+    account = account_key("a@example.com", "pw")
+    store.save(CookieDriver(COOKIES), account)
+
+    assert not store.restore(CookieDriver(logged_in=False), account)
+    assert store.load(account) is None
+
+
+def test_old_sessions_are_not_loaded(store, monkeypatch):
+    account = account_key("a@example.com", "pw")
+    store.save(CookieDriver(COOKIES), account)
+
+    later = time.time() + store.max_age + 1
+    monkeypatch.setattr("auth_store.time.time", lambda: later)
+    assert store.load(account) is None
+
+
+def test_sessions_under_another_key_are_ignored(store, monkeypatch):
+    from cryptography.fernet import Fernet
+
+    account = account_key("a@example.com", "pw")
+    store.save(CookieDriver(COOKIES), account)
+
+    monkeypatch.setenv("AUTH_STORE_KEY", Fernet.generate_key().decode())
+    assert AuthStore(root=store.root).load(account) is None
+
+
+def test_logged_out_drivers_are_not_saved(store):
+    account = account_key("a@example.com", "pw")
+    driver = CookieDriver(COOKIES, logged_in=False)
+    driver.get(FEED)
+
+    store.save(driver, account)
+
+    assert store.load(account) is None
@@ -0,0 +1,174 @@
+# test_driver_pool.py
+import sys
+import time
+import threading
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+import driver_pool
+from driver_pool import DriverPool, DriverPoolTimeout
+
+
+def lock_is_free(pool):
+    """True if another thread can take the pool's lock right now."""
+    result = []
+
+    def probe():
+        acquired = pool.condition.acquire(timeout=1)
+        if acquired:
+            pool.condition.release()
+        result.append(acquired)
+
+    thread = threading.Thread(target=probe)
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class PoolDriver:
+    current_url = "https://www.linkedin.com/feed/"
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.healthy = True
+        self.checked_unlocked = []
+        self.quit_unlocked = None
+
+    def execute_script(self, script, *args):
+        if "readyState" in script:
+            self.checked_unlocked.append(lock_is_free(self.pool))
+            if not self.healthy:
+                raise RuntimeError("browser gone")
+        return 0
+
+    def quit(self):
+        self.quit_unlocked = lock_is_free(self.pool)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = DriverPool(max_per_account=1, max_memory_mb=0)
+    monkeypatch.setattr(driver_pool, "setup_driver", lambda headless=True, profile="default": PoolDriver(pool))
+    monkeypatch.setattr(driver_pool, "login_linkedin", lambda driver, email, password, **kwargs: None)
+    return pool
+
+
+def test_reuse_checks_health_outside_the_lock(pool):
+    first = pool.acquire("a@example.com", "pw")
+    pool.release(first)
+
+    again = pool.acquire("a@example.com", "pw")
+
+    assert again is first
+    assert first.driver.checked_unlocked == [True]
+    assert pool.counters["reused"] == 1
+
+
+def test_unhealthy_driver_is_quit_outside_the_lock_and_replaced(pool):
+    first = pool.acquire("a@example.com", "pw")
+    pool.release(first)
+    first.driver.healthy = False
+
+    replacement = pool.acquire("a@example.com", "pw")
+
+    assert replacement is not first
+    assert first.driver.quit_unlocked is True
+    assert pool.counters["unhealthy"] == 1
+    assert pool.stats()["accounts"]["a@example.com"]["default"]["in_use"] == 1
+
+
+def test_idle_drivers_are_quit_outside_the_lock(pool):
+    first = pool.acquire("a@example.com", "pw")
+    pool.release(first)
+    first.last_used -= pool.idle_timeout + 1
+
+    replacement = pool.acquire("a@example.com", "pw")
+
+    assert replacement is not first
+    assert first.driver.quit_unlocked is True
+    assert first.driver.checked_unlocked == []
+
+
+def test_acquire_times_out_when_the_account_is_at_its_limit(pool):
+    pool.acquire("a@example.com", "pw")
+
+    with pytest.raises(DriverPoolTimeout):
+        pool.acquire("a@example.com", "pw", timeout=0.05)
+
+
+
+def test_waiting_for_a_driver_stops_when_the_job_is_cancelled(pool):
+    pool.acquire("a@example.com", "pw")
+    cancelled = threading.Event()
+
+    def check_cancelled():
+        if cancelled.is_set():
+            raise RuntimeError("cancelled")
+
+    threading.Timer(0.1, cancelled.set).start()
+    started = time.time()
+    with pytest.raises(RuntimeError, match="cancelled"):
+        pool.acquire("a@example.com", "pw", check_cancelled=check_cancelled, poll_interval=0.02)
+    assert time.time() - started < 2
+
+def test_the_cap_counts_every_profile_of_an_account(pool):
+    pool.acquire("a@example.com", "pw", profile="default")
+
+    with pytest.raises(DriverPoolTimeout):
+        pool.acquire("a@example.com", "pw", timeout=0.05, profile="lean")
+    assert pool.acquire("b@example.com", "pw", profile="lean").profile == "lean"
+
+
+def test_idle_driver_of_another_profile_is_retired_to_make_room(pool):
+    default = pool.acquire("a@example.com", "pw", profile="default")
+    pool.release(default)
+
+    lean = pool.acquire("a@example.com", "pw", profile="lean")
+
+    assert lean.profile == "lean" and lean is not default
+    assert default.driver.quit_unlocked is True
+    assert pool.stats()["accounts"]["a@example.com"] == {
+        "default": {"idle": [], "in_use": 0},
+        "lean": {"idle": [], "in_use": 1},
+    }
+
+
+@pytest.fixture
+def browser_process():
+    """A running process standing in for chromedriver, with a child like Chrome's."""
+    psutil = pytest.importorskip("psutil")
+    process = subprocess.Popen([sys.executable, "-c", (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+        "time.sleep(30)\n"
+    )])
+    deadline = time.time() + 5
+    while not psutil.Process(process.pid).children() and time.time() < deadline:
+        time.sleep(0.05)
+    children = psutil.Process(process.pid).children(recursive=True)
+    yield process
+    for child in children:
+        child.kill()
+    process.kill()
+    process.wait()
+
+
+def test_memory_covers_the_driver_process_and_its_children(browser_process):
+    driver = SimpleNamespace(service=SimpleNamespace(process=browser_process))
+
+    total = driver_pool.browser_memory_bytes(driver)
+
+    own = driver_pool.psutil.Process(browser_process.pid).memory_full_info().uss
+    assert total > own > 0
+
+
+def test_drivers_over_the_memory_limit_are_recycled(browser_process):
+    pooled = SimpleNamespace(driver=SimpleNamespace(service=SimpleNamespace(process=browser_process)))
+
+    assert DriverPool(max_memory_mb=1)._over_memory(pooled)
+    assert not DriverPool(max_memory_mb=100000)._over_memory(pooled)
+    browser_process.kill()
+    browser_process.wait()
+    assert DriverPool(max_memory_mb=100000)._over_memory(pooled)
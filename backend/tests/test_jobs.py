@@ -0,0 +1,69 @@
+# test_jobs.py
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from jobs import ScrapeJobManager, QueueFull, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED
+
+
+def scrape_request(*profile_urls):
+    return SimpleNamespace(profile_urls=list(profile_urls) or ["https://www.linkedin.com/in/a/"])
+
+
+def test_jobs_submitted_in_the_same_second_get_distinct_session_ids():
+    manager = ScrapeJobManager(lambda job: {"ok": True})
+    jobs = [manager.submit(scrape_request()) for _ in range(5)]
+    for job in jobs:
+        job.future.result(timeout=5)
+    manager.shutdown()
+
+    assert len({job.session_id for job in jobs}) == 5
+    assert all(job.session_id[:8].isdigit() and job.session_id[8] == "_" for job in jobs)
+
+
+def test_job_status_follows_the_runner():
+    def runner(job):
+        if job.request.profile_urls[0].endswith("/fail/"):
+            raise RuntimeError("boom")
+        return {"posts": []}
+
+    manager = ScrapeJobManager(runner)
+    ok = manager.submit(scrape_request("https://www.linkedin.com/in/ok/"))
+    failed = manager.submit(scrape_request("https://www.linkedin.com/in/fail/"))
+    ok.future.result(timeout=5)
+    failed.future.result(timeout=5)
+    manager.shutdown()
+
+    assert ok.status == JOB_COMPLETED and ok.result == {"posts": []}
+    assert failed.status == JOB_FAILED and failed.error == "boom"
+
+
+def test_cancelling_a_running_job():
+    started = threading.Event()
+
+    def runner(job):
+        started.set()
+        while True:
+            job.check_cancelled()
+            threading.Event().wait(0.01)
+
+    manager = ScrapeJobManager(runner)
+    job = manager.submit(scrape_request())
+    assert started.wait(5)
+    manager.cancel(job.job_id)
+    job.future.result(timeout=5)
+    manager.shutdown()
+
+    assert job.status == JOB_CANCELLED
+
+
+def test_queue_limit():
+    release = threading.Event()
+    manager = ScrapeJobManager(lambda job: release.wait(5), max_workers=1, max_queued=2)
+    manager.submit(scrape_request())
+    manager.submit(scrape_request())
+    with pytest.raises(QueueFull):
+        manager.submit(scrape_request())
+    release.set()
+    manager.shutdown()
@@ -0,0 +1,194 @@
+# test_main.py
+import os
+import json
+import importlib
+
+import pytest
+
+
+class ScrapeDriver:
+    current_url = "https://www.linkedin.com/feed/"
+
+    def execute_script(self, script, *args):
+        return 0
+
+    def get_cookies(self):
+        return []
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture(scope="module")
+def main(tmp_path_factory):
+    """main imported in an empty working directory, with Chrome replaced by ScrapeDriver."""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("backend"))
+    try:
+        import driver_pool
+        driver_pool.setup_driver = lambda headless=True, profile="default": ScrapeDriver()
+        driver_pool.login_linkedin = lambda driver, email, password, **kwargs: None
+        module = importlib.import_module("main")
+        module.driver_pool.auth_store = None
+        yield module
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def scraped(main, monkeypatch):
+    """Make every profile scrape return these posts."""
+    posts = []
+
+    def scrape_posts(driver, profile_url, scrolls, max_posts, **kwargs):
+        return [dict(post) for post in posts]
+
+    monkeypatch.setattr(main, "scrape_posts", scrape_posts)
+    return posts
+
+
+def run_job(main, profile_url, **fields):
+    request = main.ScrapeRequest(email="a@example.com", password="pw", profile_urls=[profile_url],
+                                 incremental=True, **fields)
+    job = main.scrape_sessions.submit(request)
+    job.future.result(timeout=10)
+    return job
+
+
+def activity_post(activity_id):
+    return {"post_number": 1, "content": "x", "post_url": f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}"}
+
+
+def test_watermarks_are_recorded_once_the_session_is_saved(main, scraped):
+    scraped.append(activity_post(101))
+
+    job = run_job(main, "https://www.linkedin.com/in/saved/")
+
+    assert job.status == "completed"
+    assert os.path.exists(f"linkedin_posts/linkedin_posts_{job.session_id}.json")
+    assert "101" in main.activity_watermarks.known_activity_ids("https://www.linkedin.com/in/saved/")
+
+
+def test_unsaved_posts_are_not_marked_as_seen(main, scraped, monkeypatch):
+    scraped.append(activity_post(202))
+    monkeypatch.setattr(main, "save_scrape_results", lambda *args, **kwargs: False)
+
+    run_job(main, "https://www.linkedin.com/in/unsaved/")
+
+    assert "202" not in main.activity_watermarks.known_activity_ids("https://www.linkedin.com/in/unsaved/")
+
+
+def test_cancelled_jobs_do_not_mark_posts_as_seen(main, monkeypatch):
+    def scrape_posts(driver, profile_url, scrolls, max_posts, session_id=None, **kwargs):
+        for running in list(main.scrape_sessions.jobs.values()):
+            if running.session_id == session_id:
+                running.cancel()
+        return [activity_post(303)]
+
+    monkeypatch.setattr(main, "scrape_posts", scrape_posts)
+    request = main.ScrapeRequest(email="a@example.com", password="pw", incremental=True,
+                                 profile_urls=["https://www.linkedin.com/in/cancelled/"])
+    job = main.scrape_sessions.submit(request)
+    job.future.result(timeout=10)
+
+    assert job.status == "cancelled"
+    assert "303" not in main.activity_watermarks.known_activity_ids("https://www.linkedin.com/in/cancelled/")
+
+
+def test_posts_can_be_looked_up_by_url_urn_or_activity_id(main, scraped):
+    from fastapi.testclient import TestClient
+
+    scraped.append(activity_post(404))
+    run_job(main, "https://www.linkedin.com/in/lookup/")
+    client = TestClient(main.app)
+    post_url = "https://www.linkedin.com/feed/update/urn:li:activity:404"
+
+    for ref in (post_url, "urn:li:activity:404", "404"):
+        response = client.get(f"/posts/{ref}")
+        assert response.status_code == 200, ref
+        assert response.json()["urn"] == "urn:li:activity:404"
+    history = client.get(f"/posts/{post_url}/engagement")
+    assert history.status_code == 200
+    assert history.json()["urn"] == "urn:li:activity:404"
+    assert client.get("/posts/urn:li:activity:405").status_code == 404
+
+
+def test_session_pages_over_http(main, scraped):
+    from fastapi.testclient import TestClient
+
+    scraped.extend(activity_post(activity_id) for activity_id in (501, 502, 503))
+    job = run_job(main, "https://www.linkedin.com/in/paged/")
+    client = TestClient(main.app)
+
+    first = client.get(f"/session/{job.session_id}", params={"limit": 2, "fields": "post_url"}).json()["data"]
+    rest = client.get(f"/session/{job.session_id}", params={"limit": 2, "cursor": first["next_cursor"]}).json()["data"]
+
+    assert [post["post_url"][-3:] for post in first["posts"] + rest["posts"]] == ["501", "502", "503"]
+    assert set(first["posts"][0]) == {"post_url"}
+    assert rest["next_cursor"] is None
+    assert client.get(f"/session/{job.session_id}", params={"cursor": "bogus"}).status_code == 400
+
+
+@pytest.fixture
+def streamed(main, monkeypatch):
+    """Like scraped, but each post is also handed to on_post, as the viewer does while extracting."""
+    posts = []
+
+    def scrape_posts(driver, profile_url, scrolls, max_posts, on_post=None, **kwargs):
+        extracted = [dict(post) for post in posts]
+        for post in extracted:
+            on_post(post)
+        return extracted
+
+    monkeypatch.setattr(main, "scrape_posts", scrape_posts)
+    return posts
+
+
+def scrape_body(profile_url):
+    return {"email": "a@example.com", "password": "pw", "profile_urls": [profile_url]}
+
+
+def test_scrape_streams_ndjson_events(main, streamed):
+    from fastapi.testclient import TestClient
+
+    streamed.extend(activity_post(activity_id) for activity_id in (601, 602))
+    client = TestClient(main.app)
+
+    with client.stream("POST", "/scrape?stream=true", json=scrape_body("https://www.linkedin.com/in/ndjson/")) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.iter_lines() if line]
+
+    kinds = [event["event"] for event in events]
+    assert kinds[0] == "job" and kinds[-1] == "done"
+    assert [event["post"]["post_url"][-3:] for event in events if event["event"] == "post"] == ["601", "602"]
+    job = main.scrape_sessions.get(events[0]["job_id"])
+    job.future.result(timeout=10)
+    # Posts went out on the stream; the job keeps a summary, not a second copy
+    assert isinstance(job.result, main.ScrapeResponse)
+    assert job.result.posts == [] and job.result.total_posts == 2
+
+
+def test_scrape_streams_server_sent_events(main, streamed):
+    from fastapi.testclient import TestClient
+
+    streamed.append(activity_post(701))
+    client = TestClient(main.app)
+
+    with client.stream("POST", "/scrape", json=scrape_body("https://www.linkedin.com/in/sse/"),
+                       headers={"Accept": "text/event-stream"}) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+
+    names = [line[len("event: "):] for line in body.splitlines() if line.startswith("event: ")]
+    assert names[0] == "job" and names[-1] == "done"
+    assert names.count("post") == 1
+
+
+def test_metrics_endpoint_uses_the_prometheus_text_format(main, scraped):
+    from fastapi.testclient import TestClient
+
+    run_job(main, "https://www.linkedin.com/in/metrics/")
+    response = TestClient(main.app).get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'scraper_jobs_finished_total{status="completed"}' in response.text
@@ -0,0 +1,83 @@
+# test_media_downloader.py
+import os
+
+from media_store import MediaStore
+from media_downloader import MediaDownloader
+from metrics import MEDIA_BYTES
+from rate_governor import AccountGovernor, THROTTLED
+
+
+def media_bytes_total():
+    return MEDIA_BYTES.values.get((("source", "http"),), 0)
+
+
+def test_download_fills_local_media_paths(tmp_path, media_server, browser_driver):
+    media_server.routes["/dms/image/a.jpg"] = (200, b"\xff\xd8jpeg-bytes", "image/jpeg")
+    store = MediaStore(root=str(tmp_path))
+    downloader = MediaDownloader("sess", store=store, retries=0)
+    post = {"post_number": 1}
+    bytes_before = media_bytes_total()
+
+    downloader.submit(post, f"{media_server.base_url}/dms/image/a.jpg", 1, browser_driver)
+    downloader.wait_for([post])
+    downloader.close()
+
+    assert len(post["local_media_paths"]) == 1
+    local_path = post["local_media_paths"][0]
+    assert local_path.startswith("media_sess/post_1_media_1_")
+    with open(os.path.join(store.root, local_path), "rb") as f:
+        assert f.read() == b"\xff\xd8jpeg-bytes"
+    assert media_bytes_total() - bytes_before == len(b"\xff\xd8jpeg-bytes")
+
+
+def test_stored_media_is_reused_without_a_request(tmp_path, media_server, browser_driver):
+    media_server.routes["/dms/image/a.jpg"] = (200, b"jpeg", "image/jpeg")
+    store = MediaStore(root=str(tmp_path))
+    url = f"{media_server.base_url}/dms/image/a.jpg"
+
+    first = MediaDownloader("one", store=store, retries=0)
+    first_post = {"post_number": 1}
+    first.submit(first_post, url, 1, browser_driver)
+    first.wait_for([first_post])
+    first.close()
+
+    second = MediaDownloader("two", store=store, retries=0)
+    second_post = {"post_number": 1}
+    second.submit(second_post, url, 1, browser_driver)
+    second.wait_for([second_post])
+    second.close()
+
+    assert media_server.requests == ["/dms/image/a.jpg"]
+    assert second_post["local_media_paths"][0].startswith("media_two/")
+
+
+def test_throttled_response_is_reported_to_the_governor(tmp_path, media_server, browser_driver):
+    media_server.routes["/dms/image/a.jpg"] = (429, b"slow down", "text/plain")
+    governor = AccountGovernor({"media": 1000.0})
+    downloader = MediaDownloader("sess", store=MediaStore(root=str(tmp_path)), governor=governor)
+    post = {"post_number": 1}
+
+    downloader.submit(post, f"{media_server.base_url}/dms/image/a.jpg", 1, browser_driver)
+    downloader.wait_for([post])
+    downloader.close()
+
+    assert media_server.requests == ["/dms/image/a.jpg"]
+    assert governor.signals[THROTTLED] == 1
+    assert governor.slowdown > 1.0
+    assert "local_media_paths" not in post
+
+
+def test_wait_for_waits_for_when_done_callbacks(tmp_path, media_server, browser_driver):
+    media_server.routes["/dms/image/slow.jpg"] = (200, b"jpeg", "image/jpeg", 0.2)
+    downloader = MediaDownloader("sess", store=MediaStore(root=str(tmp_path)), retries=0)
+    post = {"post_number": 1}
+    streamed = []
+
+    downloader.submit(post, f"{media_server.base_url}/dms/image/slow.jpg", 1, browser_driver)
+    downloader.when_done(post, lambda ready: streamed.append(list(ready.get("local_media_paths", []))))
+    downloader.wait_for([post])
+
+    # Posts returned after wait_for (and shared with other jobs) already carry their media
+    assert len(post["local_media_paths"]) == 1
+    assert streamed == [post["local_media_paths"]]
+    downloader.close()
@@ -0,0 +1,98 @@
+# test_media_manifest.py
+import os
+
+import pytest
+
+from media_manifest import MediaManifest, RangeNotSatisfiable, etag_matches, parse_range, iter_file_range
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    media_dir = tmp_path / "media_s1"
+    media_dir.mkdir()
+    (media_dir / "post_1.jpg").write_bytes(b"jpeg bytes")
+    (media_dir / "post_2.mp4.part").write_bytes(b"partial")
+    return tmp_path
+
+
+def test_lookup_lists_a_session_once(media_root):
+    manifest = MediaManifest(str(media_root))
+
+    first = manifest.lookup("s1", "post_1.jpg")
+    again = manifest.lookup("s1", "post_1.jpg")
+
+    assert first is again
+    assert (first.size, first.content_type) == (10, "image/jpeg")
+    assert manifest.stats() == {"sessions": 1, "files": 1, "hits": 2, "misses": 0, "scans": 1}
+
+
+def test_misses_rescan_only_after_the_directory_changes(media_root):
+    manifest = MediaManifest(str(media_root))
+    assert manifest.lookup("s1", "post_2.mp4.part") is None
+    assert manifest.lookup("s1", "post_3.png") is None
+    assert manifest.stats()["scans"] == 1
+
+    new_file = media_root / "media_s1" / "post_3.png"
+    new_file.write_bytes(b"png")
+    # Make sure the directory mtime moves even on coarse-grained filesystems
+    stat = os.stat(media_root / "media_s1")
+    os.utime(media_root / "media_s1", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert manifest.lookup("s1", "post_3.png").content_type == "image/png"
+    assert manifest.stats()["scans"] == 2
+
+
+def test_unknown_sessions_and_forget(media_root):
+    manifest = MediaManifest(str(media_root))
+    assert manifest.lookup("missing", "post_1.jpg") is None
+
+    manifest.lookup("s1", "post_1.jpg")
+    manifest.forget("s1")
+    assert manifest.stats()["sessions"] == 0
+
+
+def test_hardlinked_copies_share_an_etag(media_root):
+    os.link(media_root / "media_s1" / "post_1.jpg", media_root / "media_s1" / "post_9.jpg")
+    manifest = MediaManifest(str(media_root))
+
+    assert manifest.lookup("s1", "post_1.jpg").etag == manifest.lookup("s1", "post_9.jpg").etag
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ("*", True),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"x", "abc"', True),
+    ('"abcd"', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-3", (0, 3)),
+    ("bytes=4-", (4, 9)),
+    ("bytes=-3", (7, 9)),
+    ("bytes=-50", (0, 9)),
+    ("bytes=5-500", (5, 9)),
+    ("bytes=0-1,4-5", None),
+    ("bytes=5-2", None),
+    ("items=0-3", None),
+    ("bytes=a-b", None),
+    (None, None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 10) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=10-", "bytes=-0"])
+def test_unsatisfiable_ranges(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, 10)
+
+
+def test_iter_file_range(media_root):
+    path = media_root / "media_s1" / "post_1.jpg"
+
+    assert b"".join(iter_file_range(str(path), 2, 6, chunk_size=2)) == b"eg by"
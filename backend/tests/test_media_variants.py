@@ -0,0 +1,75 @@
+# test_media_variants.py
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from media_manifest import MediaFile
+from media_variants import MediaVariants
+
+
+@pytest.fixture
+def variants(tmp_path):
+    variants = MediaVariants(root=str(tmp_path / "variants"), widths=(320, 640))
+    yield variants
+    variants.close()
+
+
+@pytest.fixture
+def photo(tmp_path):
+    path = tmp_path / "photo.jpg"
+    Image.new("RGB", (1000, 500), (200, 80, 40)).save(path, format="JPEG")
+    return MediaFile(str(path), os.stat(path))
+
+
+@pytest.mark.parametrize("content_type, width, accept, expected", [
+    ("image/jpeg", None, "image/webp,*/*", (None, "webp")),
+    ("image/jpeg", None, "*/*", None),
+    ("image/jpeg", 200, "*/*", (320, "jpeg")),
+    ("image/png", 500, "image/webp", (640, "webp")),
+    ("image/jpeg", 4000, None, (640, "jpeg")),
+    ("image/gif", 200, "image/webp", None),
+    ("video/mp4", 200, "image/webp", None),
+])
+def test_select(variants, content_type, width, accept, expected):
+    assert variants.select(content_type, width, accept) == expected
+
+
+def test_variants_are_rendered_once_and_resized(variants, photo, monkeypatch):
+    variant = variants.get(photo, 320, "webp")
+
+    assert variant.content_type == "image/webp"
+    with Image.open(variant.path) as image:
+        assert image.size == (320, 160)
+    monkeypatch.setattr(variants, "_render", lambda *args: pytest.fail("rendered again"))
+    assert variants.get(photo, 320, "webp").path == variant.path
+
+
+def test_unreadable_originals_fall_back_to_none(variants, tmp_path):
+    path = tmp_path / "broken.jpg"
+    path.write_bytes(b"not an image")
+
+    assert variants.get(MediaFile(str(path), os.stat(path)), 320, "webp") is None
+
+
+def test_schedule_renders_webp_widths_under_the_blob_hash(variants, photo):
+    # Blobs are named by their hash; a made-up one shows the file isn't hashed again
+    digest = "f" * 64
+
+    variants.schedule(f"{digest[:2]}/{digest}.jpg", photo.path)
+    variants.executor.shutdown(wait=True)
+
+    for width in (320, 640):
+        assert os.path.exists(variants.variant_path(digest, width, "webp"))
+    assert variants.digest(photo.path, photo.stat_result) == digest
+
+
+def test_schedule_skips_media_it_cannot_render(variants, tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video")
+
+    variants.schedule("ab/abcdef.mp4", str(video))
+    variants.executor.shutdown(wait=True)
+
+    assert not os.path.exists(variants.root)
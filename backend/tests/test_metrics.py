@@ -0,0 +1,63 @@
+# test_metrics.py
+import threading
+
+from metrics import Counter, Histogram, StageTimings, collect_timings, render_metrics, JOBS_FINISHED
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test timings", "test", buckets=(0.1, 1))
+    histogram.observe(0.05, mode="a")
+    histogram.observe(0.5, count=2, mode="a")
+    histogram.observe(5, mode="a")
+
+    assert histogram.render() == [
+        "# HELP test_seconds Test timings",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{mode="a",le="0.1"} 1',
+        'test_seconds_bucket{mode="a",le="1"} 3',
+        'test_seconds_bucket{mode="a",le="+Inf"} 4',
+        'test_seconds_sum{mode="a"} 6.05',
+        'test_seconds_count{mode="a"} 4',
+    ]
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("test_total", "Test count")
+    counter.inc(status='say "hi"\nnow')
+    counter.inc(2)
+
+    assert counter.render()[2:] == [
+        "test_total 2",
+        'test_total{status="say \\"hi\\"\\nnow"} 1',
+    ]
+
+
+def test_observations_are_collected_per_thread():
+    histogram = Histogram("test_seconds", "Test timings", "step")
+    counter = Counter("test_total", "Test count", stage="items")
+    timings = StageTimings()
+
+    with collect_timings(timings):
+        histogram.observe(0.25)
+        histogram.observe(0.75)
+        counter.inc(3)
+        # Other threads don't report into this thread's timings
+        other = threading.Thread(target=histogram.observe, args=(10,))
+        other.start()
+        other.join()
+    histogram.observe(1)
+
+    assert timings.to_dict() == {
+        "items": {"total": 3},
+        "step": {"count": 2, "seconds": 1.0, "avg_ms": 500.0},
+    }
+
+
+def test_render_metrics_includes_every_metric():
+    JOBS_FINISHED.inc(status="completed")
+
+    text = render_metrics()
+
+    assert text.endswith("\n")
+    assert "# TYPE scraper_scroll_step_seconds histogram" in text
+    assert 'scraper_jobs_finished_total{status="completed"}' in text
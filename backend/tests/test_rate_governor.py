@@ -0,0 +1,79 @@
+# test_rate_governor.py
+import pytest
+
+import rate_governor
+from rate_governor import (
+    AccountGovernor, RateGovernor, TokenBucket, THROTTLED, CHALLENGE, BACKOFF_FACTORS, RECOVERY_FACTOR
+)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record sleeps instead of waiting."""
+    calls = []
+    monkeypatch.setattr(rate_governor.time, "sleep", calls.append)
+    return calls
+
+
+def test_bucket_serves_its_burst_then_asks_callers_to_wait():
+    bucket = TokenBucket(rate=2.0, capacity=3)
+
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    # Reservations queue up: each further caller waits one more token interval
+    assert waits[3] == pytest.approx(0.5, abs=0.01)
+    assert waits[4] == pytest.approx(1.0, abs=0.01)
+
+
+def test_slowdown_scales_the_wait(sleeps):
+    governor = AccountGovernor({"scroll": 1.0}, burst=1)
+    governor.acquire("scroll")
+    governor.report(THROTTLED)
+
+    waited = governor.acquire("scroll")
+
+    assert waited == pytest.approx(BACKOFF_FACTORS[THROTTLED], abs=0.01)
+    assert sleeps == [waited]
+    assert governor.state()["waited_seconds"]["scroll"] == pytest.approx(waited, abs=0.01)
+
+
+def test_signals_back_off_up_to_the_limit_and_normal_loads_recover():
+    governor = AccountGovernor({"navigate": 1.0}, max_slowdown=5.0, slow_load_seconds=8.0)
+    governor.report(THROTTLED)
+    governor.report_load(9.0)
+    assert governor.slowdown == pytest.approx(2.0 * BACKOFF_FACTORS["slow_load"])
+
+    governor.report(THROTTLED)
+    assert governor.slowdown == 5.0
+
+    governor.report_load(1.0)
+    assert governor.slowdown == pytest.approx(5.0 * RECOVERY_FACTOR)
+    for _ in range(50):
+        governor.report_load(1.0)
+    assert governor.slowdown == 1.0
+    assert governor.state()["signals"][THROTTLED] == 2
+
+
+def test_challenge_pauses_the_account(sleeps):
+    governor = AccountGovernor({"navigate": 100.0}, challenge_cooldown=30.0)
+    governor.report(CHALLENGE)
+
+    waited = governor.acquire("navigate")
+
+    assert waited == pytest.approx(30.0, abs=0.5)
+    assert governor.state()["last_signal"]["signal"] == CHALLENGE
+
+
+def test_unknown_actions_are_not_paced(sleeps):
+    assert AccountGovernor({"navigate": 1.0}).acquire("download") == 0.0
+    assert sleeps == []
+
+
+def test_accounts_get_their_own_governor():
+    governors = RateGovernor(navigations_per_minute=30)
+
+    assert governors.for_account("A@example.com ") is governors.for_account("a@example.com")
+    assert governors.for_account("b@example.com") is not governors.for_account("a@example.com")
+    assert governors.rates["navigate"] == 0.5
+    assert set(governors.stats()["accounts"]) == {"a@example.com", "b@example.com"}
@@ -0,0 +1,111 @@
+# test_result_cache.py
+import threading
+
+import pytest
+
+from result_cache import ResultCache, CACHE_HIT, CACHE_SHARED, CACHE_MISS
+
+
+def test_cached_values_are_copies_of_the_loaded_one():
+    cache = ResultCache(ttl=60)
+    loaded, source = cache.get_or_load("a", lambda: [{"n": 1}])
+    cached, cached_source = cache.get_or_load("a", lambda: pytest.fail("loaded twice"))
+
+    assert (source, cached_source) == (CACHE_MISS, CACHE_HIT)
+    assert cached == loaded and cached is not loaded
+    cached[0]["n"] = 2
+    assert cache.get_or_load("a", lambda: None)[0] == [{"n": 1}]
+
+
+def test_force_refresh_and_expiry_load_again():
+    cache = ResultCache(ttl=60)
+    cache.get_or_load("a", lambda: 1)
+
+    assert cache.get_or_load("a", lambda: 2, force_refresh=True) == (2, CACHE_MISS)
+    cache.entries["a"] = (0, 2)
+    assert cache.get_or_load("a", lambda: 3) == (3, CACHE_MISS)
+
+
+def test_zero_ttl_caches_nothing():
+    cache = ResultCache(ttl=0)
+    cache.get_or_load("a", lambda: 1)
+
+    assert cache.get_or_load("a", lambda: 2) == (2, CACHE_MISS)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(ttl=60, max_entries=2)
+    cache.get_or_load("a", lambda: "a")
+    cache.get_or_load("b", lambda: "b")
+    cache.get_or_load("a", lambda: None)
+    cache.get_or_load("c", lambda: "c")
+
+    assert list(cache.entries) == ["a", "c"]
+
+
+def test_concurrent_callers_share_one_load():
+    cache = ResultCache(ttl=60)
+    started, waiting, release = threading.Event(), threading.Event(), threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"posts": 3}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_load("a", slow_loader)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(
+        target=lambda: results.append(cache.get_or_load(
+            "a", slow_loader, force_refresh=True, check_cancelled=waiting.set, poll_interval=0.01
+        ))
+    )
+    follower.start()
+    # check_cancelled only runs once the follower is waiting on the leader's load
+    waiting.wait(5)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert sorted(source for _, source in results) == [CACHE_MISS, CACHE_SHARED]
+    assert all(value == {"posts": 3} for value, _ in results)
+
+
+def test_failed_load_is_not_cached_and_waiters_retry():
+    cache = ResultCache(ttl=60)
+    started, waiting, release = threading.Event(), threading.Event(), threading.Event()
+
+    def failing_loader():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("scrape failed")
+
+    errors, results = [], []
+
+    def lead():
+        try:
+            cache.get_or_load("a", failing_loader)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(
+        target=lambda: results.append(cache.get_or_load(
+            "a", lambda: "retried", check_cancelled=waiting.set, poll_interval=0.01
+        ))
+    )
+    follower.start()
+    waiting.wait(5)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(errors) == 1
+    assert results == [("retried", CACHE_MISS)]
+    assert cache.stats()["in_flight"] == 0
@@ -0,0 +1,43 @@
+# test_selector_registry.py
+import json
+
+from selector_registry import SelectorRegistry, DEMOTE_AFTER_ATTEMPTS, DEAD_AFTER_ATTEMPTS
+
+SELECTORS = [".specific-name", ".actor-title", 'img[alt*="profile"]']
+
+
+def registry(tmp_path):
+    return SelectorRegistry(path=str(tmp_path / "selector_stats.json"))
+
+
+def test_authored_order_is_kept_even_when_a_fallback_hits_more(tmp_path):
+    reg = registry(tmp_path)
+    reg.record("avatar", ".specific-name", hits=1, attempts=20)
+    reg.record("avatar", 'img[alt*="profile"]', hits=20, attempts=20)
+
+    assert reg.ordered("avatar", SELECTORS) == SELECTORS
+
+
+def test_selectors_that_never_match_move_to_the_end(tmp_path):
+    reg = registry(tmp_path)
+    reg.record("avatar", ".specific-name", hits=0, attempts=DEMOTE_AFTER_ATTEMPTS)
+    reg.record("avatar", ".actor-title", hits=0, attempts=DEMOTE_AFTER_ATTEMPTS - 1)
+
+    assert reg.ordered("avatar", SELECTORS) == [".actor-title", 'img[alt*="profile"]', ".specific-name"]
+
+    reg.record("avatar", ".specific-name", hits=1)
+    assert reg.ordered("avatar", SELECTORS) == SELECTORS
+
+
+def test_stats_flag_dead_selectors_and_persist(tmp_path):
+    reg = registry(tmp_path)
+    reg.record("content", ".gone", hits=0, seconds=0.5, attempts=DEAD_AFTER_ATTEMPTS)
+    reg.record("content", ".live", hits=3, seconds=0.3, attempts=4)
+    reg.flush()
+
+    stats = {entry["selector"]: entry for entry in reg.stats()["content"]}
+    assert stats[".gone"]["dead"] and not stats[".live"]["dead"]
+    assert stats[".live"]["hit_rate"] == 0.75
+    with open(tmp_path / "selector_stats.json", encoding="utf-8") as f:
+        assert json.load(f)["content"][".live"]["hits"] == 3
+    assert registry(tmp_path).ordered("content", [".gone", ".live"]) == [".live", ".gone"]
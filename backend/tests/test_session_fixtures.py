@@ -0,0 +1,58 @@
+# test_session_fixtures.py
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from session_fixtures import generate_session, write_media_files
+from media_manifest import MediaManifest
+
+SAVED_MEDIA_PATH = re.compile(r"^media_(?P<session>[^/]+)/post_(?P<post>\d+)_media_(?P<index>[1-9]\d*)_[0-9a-f]{8}\.(jpg|mp4)$")
+
+
+def test_generated_media_paths_have_the_saved_shape():
+    session = generate_session(30, session_id="20250101_120000")
+    paths = [(post, path) for post in session["posts"] for path in post["local_media_paths"]]
+
+    assert paths
+    for post, path in paths:
+        match = SAVED_MEDIA_PATH.match(path)
+        assert match, path
+        assert match["session"] == "20250101_120000"
+        assert int(match["post"]) == post["post_number"]
+    multi = next(post for post, _ in paths if len(post["local_media_paths"]) > 1)
+    assert [SAVED_MEDIA_PATH.match(p)["index"] for p in multi["local_media_paths"]] == ["1", "2"]
+
+
+def test_written_media_resolves_through_the_manifest(tmp_path):
+    session = generate_session(10, session_id="20250101_120000")
+    written = write_media_files(session, str(tmp_path))
+    manifest = MediaManifest(str(tmp_path))
+
+    paths = [path for post in session["posts"] for path in post["local_media_paths"]]
+    assert written == len(paths)
+    for path in paths:
+        directory, filename = path.split("/")
+        media = manifest.lookup(directory[len("media_"):], filename)
+        assert media is not None, path
+
+
+def test_written_images_render_variants(tmp_path):
+    pytest.importorskip("PIL")
+    from media_variants import MediaVariants
+
+    session = generate_session(10, session_id="20250101_120000")
+    write_media_files(session, str(tmp_path))
+    image_path = next(path for post in session["posts"] for path in post["local_media_paths"] if path.endswith(".jpg"))
+    directory, filename = image_path.split("/")
+    media = MediaManifest(str(tmp_path)).lookup(directory[len("media_"):], filename)
+    variants = MediaVariants(root=str(tmp_path / "variants"))
+
+    variant = variants.get(media, 320, "webp")
+    variants.close()
+
+    assert variant is not None and variant.content_type == "image/webp"
+    assert variant.size < media.size
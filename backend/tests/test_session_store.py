@@ -0,0 +1,175 @@
+# test_session_store.py
+import os
+import json
+from datetime import datetime
+
+import pytest
+
+from session_store import SessionStore, encode_cursor, parse_engagement_count
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1.2K", 1200),
+    ("1,2K", 1200),
+    ("3.4M reactions", 3400000),
+    ("1,234", 1234),
+    ("1 234", 1234),
+    ("3 comments", 3),
+    ("12 reposts", 12),
+    ("3 Bob Smith and others", 3),
+    ("5 Mary and 4 others", 5),
+    ("2 Karen Lee", 2),
+    (42, 42),
+])
+def test_parse_engagement_count(text, expected):
+    assert parse_engagement_count(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "No reactions yet"])
+def test_parse_engagement_count_without_a_number(text):
+    assert parse_engagement_count(text) is None
+
+
+def post(number, activity_id, reactions="10", content="hello"):
+    return {
+        "post_number": number,
+        "content": content,
+        "engagement": {"reactions": reactions, "comments": "1 comment"},
+        "post_url": f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}",
+        "profile_url": "https://www.linkedin.com/in/someone/",
+    }
+
+
+def write_session(sessions_dir, name, data, mtime=None):
+    path = sessions_dir / f"linkedin_posts_{name}.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def bump_dir_mtime(sessions_dir):
+    """Move the directory mtime on, even on filesystems with coarse timestamps."""
+    stat = os.stat(sessions_dir)
+    os.utime(sessions_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def sessions_dir(tmp_path):
+    path = tmp_path / "linkedin_posts"
+    path.mkdir()
+    return path
+
+
+def open_store(sessions_dir):
+    return SessionStore(db_path=str(sessions_dir / "sessions.db"), sessions_dir=str(sessions_dir))
+
+
+def test_import_uses_recorded_timestamp_then_session_id(sessions_dir):
+    checkout_time = datetime(2026, 1, 1).timestamp()
+    write_session(sessions_dir, "20250101_090000",
+                  {"timestamp": "2025-03-01T10:00:00", "posts": [post(1, 1)]}, mtime=checkout_time)
+    write_session(sessions_dir, "20250202_120000", [post(1, 2)], mtime=checkout_time)
+    write_session(sessions_dir, "manual", [post(1, 3)], mtime=checkout_time)
+
+    sessions = {s["session_id"]: s["timestamp"] for s in open_store(sessions_dir).list_sessions()}
+
+    assert sessions["20250101_090000"] == "2025-03-01T10:00:00"
+    assert sessions["20250202_120000"] == "2025-02-02T12:00:00"
+    assert sessions["manual"] == datetime.fromtimestamp(checkout_time).isoformat()
+
+
+def test_latest_version_follows_scrape_time_not_file_mtime(sessions_dir):
+    # The older scrape was written (checked out) last
+    write_session(sessions_dir, "20250301_000000", [post(1, 7, reactions="50")], mtime=1000)
+    write_session(sessions_dir, "20250101_000000", [post(1, 7, reactions="5")], mtime=2000)
+
+    latest = open_store(sessions_dir).get_post("urn:li:activity:7")
+
+    assert latest["reactions"] == 50
+    assert latest["last_session_id"] == "20250301_000000"
+
+
+def test_refresh_reimports_a_replaced_file(sessions_dir):
+    write_session(sessions_dir, "20250101_000000", [post(1, 1, content="first")], mtime=1000)
+    store = open_store(sessions_dir)
+    assert store.get_session("20250101_000000")["posts"][0]["content"] == "first"
+
+    replacement = sessions_dir / "replacement.tmp"
+    replacement.write_text(json.dumps([post(1, 1, content="second")]), encoding="utf-8")
+    os.replace(replacement, sessions_dir / "linkedin_posts_20250101_000000.json")
+    bump_dir_mtime(sessions_dir)
+
+    assert store.get_session("20250101_000000")["posts"][0]["content"] == "second"
+
+
+def test_refresh_only_scans_when_the_directory_changes(sessions_dir, monkeypatch):
+    write_session(sessions_dir, "20250101_000000", [post(1, 1)])
+    store = open_store(sessions_dir)
+    store.list_sessions()
+    scans = []
+    monkeypatch.setattr(store, "import_legacy", lambda: scans.append(1))
+
+    for _ in range(3):
+        store.list_sessions()
+        store.list_posts()
+    assert scans == []
+
+    write_session(sessions_dir, "20250102_000000", [post(1, 2)])
+    bump_dir_mtime(sessions_dir)
+    store.list_sessions()
+    assert scans == [1]
+
+
+def test_saved_sessions_are_visible_without_a_scan(sessions_dir, monkeypatch):
+    store = open_store(sessions_dir)
+    store.list_sessions()
+    monkeypatch.setattr(store, "import_legacy", lambda: pytest.fail("scanned the directory"))
+
+    store.save_session("20250103_000000", [post(1, 3)], ["https://www.linkedin.com/in/someone/"])
+
+    assert [s["session_id"] for s in store.list_sessions()] == ["20250103_000000"]
+    assert store.get_post("urn:li:activity:3")["urn"] == "urn:li:activity:3"
+
+
+def test_search_finds_imported_posts(sessions_dir):
+    write_session(sessions_dir, "20250101_000000", [post(1, 1, content="Scaling browser automation"),
+                                                    post(2, 2, content="Quarterly review")])
+    store = open_store(sessions_dir)
+
+    hits = store.search("browser")
+
+    assert [hit["post"]["content"] for hit in hits["results"]] == ["Scaling browser automation"]
+
+
+def test_session_pages_follow_the_cursor(sessions_dir):
+    store = open_store(sessions_dir)
+    store.save_session("20250104_000000", [post(n, n) for n in range(1, 6)],
+                       ["https://www.linkedin.com/in/someone/"])
+
+    pages = [store.get_session_page("20250104_000000", 2)]
+    while pages[-1]["next_cursor"]:
+        pages.append(store.get_session_page("20250104_000000", 2, cursor=pages[-1]["next_cursor"]))
+
+    assert [[p["post_number"] for p in page["posts"]] for page in pages] == [[1, 2], [3, 4], [5]]
+    assert all(page["total_posts"] == 5 for page in pages)
+    assert store.get_session_page("missing", 2) is None
+
+
+def test_session_pages_can_return_selected_fields(sessions_dir):
+    store = open_store(sessions_dir)
+    store.save_session("20250104_000000", [post(1, 1)], ["https://www.linkedin.com/in/someone/"])
+
+    page = store.get_session_page("20250104_000000", 10, fields=["content", "unknown"])
+
+    assert page["posts"] == [{"content": "hello"}]
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(1)[::-1], "cTo1"])
+def test_malformed_cursors_are_rejected(sessions_dir, cursor):
+    store = open_store(sessions_dir)
+    store.save_session("20250104_000000", [post(1, 1)], ["https://www.linkedin.com/in/someone/"])
+
+    with pytest.raises(ValueError):
+        store.get_session_page("20250104_000000", 10, cursor=cursor)
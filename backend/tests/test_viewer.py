@@ -0,0 +1,111 @@
+# test_viewer.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import viewer
+import selector_registry
+from viewer import load_posts, extract_posts_windowed, LOAD_STATE_JS, RECYCLED_ATTR
+from fake_driver import FakeDriver, NullDownloader
+
+
+class ScriptedFeed:
+    """Answers LOAD_STATE_JS polls from a list of (count, height) states, repeating the last."""
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.scrolls = 0
+
+    def execute_script(self, script, selectors, scroll, with_urns):
+        assert script == LOAD_STATE_JS
+        self.scrolls += bool(scroll)
+        count, height = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        return {'count': count, 'height': height, 'empty': False}
+
+
+def test_a_taller_page_does_not_end_the_step_before_posts_arrive(monkeypatch):
+    monkeypatch.setattr(viewer.time, 'sleep', lambda seconds: None)
+    # A spinner grows the page right after the scroll; the posts arrive a few polls later
+    feed = ScriptedFeed([(10, 6000), (10, 6200), (10, 6200), (10, 6200), (20, 12000)])
+
+    stats = load_posts(feed, max_posts=20, max_scrolls=5, idle_timeout=5.0, poll_interval=0)
+
+    assert feed.scrolls == 1
+    assert stats['stop_reason'] == 'max_posts'
+    assert [step['posts'] for step in stats['steps']] == [20]
+
+
+class Placeholders(ScriptedFeed):
+    """Every scroll adds a placeholder that grows the page, but no posts ever load."""
+
+    def execute_script(self, script, selectors, scroll, with_urns):
+        self.scrolls += bool(scroll)
+        return {'count': 10, 'height': 6000 + 200 * self.scrolls, 'empty': False}
+
+
+def test_height_growth_without_posts_is_not_the_end_of_the_feed():
+    feed = Placeholders([])
+
+    stats = load_posts(feed, max_posts=20, max_scrolls=2, idle_timeout=0.01, poll_interval=0)
+
+    assert feed.scrolls == 2
+    assert stats['stop_reason'] == 'max_scrolls'
+
+
+def test_no_growth_at_all_is_the_end_of_the_feed():
+    feed = ScriptedFeed([(10, 6000)])
+
+    stats = load_posts(feed, max_posts=20, max_scrolls=5, idle_timeout=0.01, poll_interval=0)
+
+    assert feed.scrolls == 1
+    assert stats['stop_reason'] == 'end_of_feed'
+
+
+@pytest.fixture
+def feed(tmp_path, monkeypatch):
+    """A FakeDriver feed of 45 posts, 10 more per scroll, with a throwaway selector registry."""
+    monkeypatch.setattr(selector_registry, "_default_registry",
+                        selector_registry.SelectorRegistry(path=str(tmp_path / "selector_stats.json")))
+    driver = FakeDriver(total=45, page_size=10)
+    driver.get("https://www.linkedin.com/in/someone/recent-activity/all/")
+    return driver
+
+
+def test_windowed_extraction_recycles_every_processed_post(feed):
+    posts, stats = extract_posts_windowed(feed, 100, "s1", NullDownloader(), window_size=10,
+                                          max_scrolls=50, idle_timeout=0)
+
+    assert len(posts) == 45
+    assert len({post["post_url"] for post in posts}) == 45
+    assert [post["post_number"] for post in posts] == list(range(1, 46))
+    assert stats["stop_reason"] == "end_of_feed" and stats["windowed"]
+    # Every post node left in the DOM is marked done and emptied
+    assert all(node.attrs.get(RECYCLED_ATTR) and not node.children for node in feed.feed.children)
+
+
+def test_windowed_extraction_stops_at_max_posts(feed):
+    posts, stats = extract_posts_windowed(feed, 15, "s1", NullDownloader(), window_size=10,
+                                          max_scrolls=50, idle_timeout=0)
+
+    assert len(posts) == 15
+    assert stats["stop_reason"] == "max_posts"
+    assert feed.loaded < feed.total
+
+
+def test_windowed_extraction_skips_and_stops_at_known_posts(feed):
+    first, _ = extract_posts_windowed(feed, 100, "s1", NullDownloader(), window_size=10,
+                                      max_scrolls=50, idle_timeout=0)
+    known = {viewer.activity_id_from_urn(post["post_url"]) for post in first[12:]}
+    # The same feed again, fresh from the server
+    refreshed = FakeDriver(total=45, page_size=10)
+    refreshed.get("https://www.linkedin.com/in/someone/recent-activity/all/")
+
+    posts, stats = extract_posts_windowed(refreshed, 100, "s2", NullDownloader(), window_size=10,
+                                          max_scrolls=50, idle_timeout=0, known_activity_ids=known)
+
+    assert [post["post_url"] for post in posts[:12]] == [post["post_url"] for post in first[:12]]
+    assert stats["stop_reason"] == "known_posts"
+    assert len(posts) < 20
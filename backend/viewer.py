@@ -1,23 +1,68 @@
 import os
+import re
 import time
 import json
 import getpass
 import requests
-import hashlib
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-def setup_driver(headless=False):
-    """Setup Chrome driver with anti-detection tweaks."""
+from media_downloader import (
+    MediaDownloader, browser_headers, save_media_response, reuse_stored_media, media_filename
+)
+from media_store import get_media_store
+from auth_store import get_auth_store, account_key, is_logged_out_url, is_linkedin_url, LINKEDIN_URL
+from selector_registry import get_selector_registry
+from metrics import (
+    SETUP_DRIVER_SECONDS, LOGIN_SECONDS, PAGE_LOAD_SECONDS, SCROLL_STEP_SECONDS, BATCH_READ_SECONDS,
+    EXTRACT_POST_SECONDS, SELECTOR_LOOKUP_SECONDS, MEDIA_DOWNLOAD_SECONDS, PERMALINK_MENU_SECONDS,
+    MEDIA_BYTES, POSTS_EXTRACTED
+)
+
+DRIVER_PROFILES = ("default", "lean")
+
+# Requests the lean profile blocks: fonts, static images and tracking. Post media is
+# downloaded separately, and blob: URLs (canvas capture) and videos are left alone.
+LEAN_BLOCKED_URLS = [
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.svg", "*.webp",
+    "*media.licdn.com/dms/image/*",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*", "*/li/track*", "*/sensorCollect*",
+]
+LEAN_WINDOW_SIZE = "1280,900"
+
+# Hosts whose /dms/ URLs are post media; add a replay server's host for offline tests
+MEDIA_HOSTS = tuple(
+    host.strip() for host in os.environ.get("LINKEDIN_MEDIA_HOSTS", "media.licdn.com").split(",") if host.strip()
+)
+
+# chromedriver to use; defaults to backend/chromedriver when present, otherwise Selenium
+# Manager finds (or downloads) one matching the installed Chrome
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH") or os.path.join(os.path.dirname(__file__), "chromedriver")
+
+@SETUP_DRIVER_SECONDS.timed()
+def setup_driver(headless=False, profile="default"):
+    """Setup Chrome driver with anti-detection tweaks.
+
+    profile="lean" uses a smaller window, disables autoplay and blocks the requests in
+    LEAN_BLOCKED_URLS, which scraping does not need.
+    """
+    if profile not in DRIVER_PROFILES:
+        raise ValueError(f"Unknown driver profile: {profile}")
+
     options = Options()
-    options.add_argument("--start-maximized")
+    if profile == "lean":
+        options.add_argument(f"--window-size={LEAN_WINDOW_SIZE}")
+        options.add_argument("--autoplay-policy=user-gesture-required")
+    else:
+        options.add_argument("--start-maximized")
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
@@ -25,19 +70,33 @@ def setup_driver(headless=False):
     if headless:
         options.add_argument("--headless=new")
 
-    chromedriver_path = os.path.join(os.path.dirname(__file__), "chromedriver")
-    service = Service(executable_path=chromedriver_path)
+    if os.path.exists(CHROMEDRIVER_PATH):
+        service = Service(executable_path=CHROMEDRIVER_PATH)
+    else:
+        service = Service()
 
     driver = webdriver.Chrome(service=service, options=options)
     driver.execute_script(
         "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
     )
 
+    if profile == "lean":
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+
     return driver
 
-def login_linkedin(driver, email, password):
-    """Login to LinkedIn with updated selectors and explicit URL."""
-    driver.get("https://www.linkedin.com/login")
+class LoginChallengeRequired(Exception):
+    """Raised when LinkedIn asks for a CAPTCHA/2FA and nobody is there to solve it."""
+
+@LOGIN_SECONDS.timed()
+def login_linkedin(driver, email, password, interactive=False):
+    """Login to LinkedIn with updated selectors and explicit URL.
+
+    If a verification challenge appears, an interactive caller is asked to solve it in
+    the browser; otherwise LoginChallengeRequired is raised instead of blocking.
+    """
+    driver.get(f"{LINKEDIN_URL}/login")
 
     try:
         username_input = WebDriverWait(driver, 15).until(
@@ -70,6 +129,10 @@ def login_linkedin(driver, email, password):
             print("Successfully logged in!")
         except TimeoutException:
             print("Login submitted, but may require CAPTCHA/2FA.")
+            if not interactive:
+                raise LoginChallengeRequired(
+                    "LinkedIn asked for verification; log in once interactively (python viewer.py)"
+                )
             print("Please complete verification in the browser...")
             input("Press Enter here after completing verification: ")
 
@@ -82,13 +145,132 @@ def construct_posts_url(profile_url):
     base_url = profile_url.rstrip('/').split('/recent-activity')[0]
     return f"{base_url}/recent-activity/all/"
 
+def activity_id_from_urn(value):
+    """Numeric activity id from a data-urn or post URL, or None."""
+    match = re.search(r'activity[:-](\d+)', value or '')
+    return match.group(1) if match else None
+
+POST_URN_PATTERN = re.compile(r'urn:li:(?:activity|ugcPost|share):\d+')
+
+def post_url_from_urn(value):
+    """Permalink for a post URN (activity, ugcPost or share) found in value, or None."""
+    match = POST_URN_PATTERN.search(value or '')
+    return f"{LINKEDIN_URL}/feed/update/{match.group(0)}" if match else None
+
+POST_SELECTORS = [
+    'div.feed-shared-update-v2',
+    'div[data-urn*="activity"]',
+    '.update-components-actor'
+]
+
+# Optionally scrolls to the bottom, then reports how many posts are loaded (and their
+# data-urns when asked) in one round trip.
+LOAD_STATE_JS = """
+const selectors = arguments[0];
+const scroll = arguments[1];
+const withUrns = arguments[2];
+
+if (scroll) {
+    window.scrollTo(0, document.body.scrollHeight);
+}
+
+let count = 0;
+for (const selector of selectors) {
+    count = document.querySelectorAll(selector).length;
+    if (count) {
+        break;
+    }
+}
+
+const state = {
+    count: count,
+    height: document.body.scrollHeight,
+    empty: !!document.querySelector('.artdeco-empty-state')
+};
+if (withUrns) {
+    state.urns = Array.from(document.querySelectorAll('[data-urn*="activity:"]'))
+        .map((el) => el.getAttribute('data-urn'));
+}
+return state;
+"""
+
+def load_posts(driver, max_posts, max_scrolls=10, idle_timeout=3.0, poll_interval=0.25,
+               known_activity_ids=None, stop_after_known=3, should_stop=None, governor=None):
+    """Scroll until max_posts posts are loaded, the feed stops growing, or max_scrolls is hit.
+
+    Instead of a fixed sleep per scroll, the post count is polled and the next scroll starts
+    as soon as new posts appear; idle_timeout seconds without growth is treated as the end
+    of the feed. Page height is only a secondary signal: spinners and placeholders grow the
+    page without adding posts, so a taller page doesn't end a step early, it only keeps a
+    step without new posts from being taken for the end of the feed.
+    Returns timing stats for the scroll phase.
+    """
+    started = time.time()
+    with_urns = bool(known_activity_ids)
+    state = driver.execute_script(LOAD_STATE_JS, POST_SELECTORS, False, with_urns)
+    steps = []
+    stop_reason = 'max_scrolls'
+
+    def reached_known(state):
+        if not with_urns:
+            return False
+        loaded_ids = [activity_id_from_urn(urn) for urn in state.get('urns') or []]
+        known_loaded = sum(1 for activity_id in loaded_ids if activity_id in known_activity_ids)
+        return known_loaded >= min(stop_after_known, len(known_activity_ids))
+
+    for i in range(max_scrolls):
+        if state['count'] >= max_posts:
+            stop_reason = 'max_posts'
+            break
+        if reached_known(state):
+            stop_reason = 'known_posts'
+            print("Reached already scraped posts, stopping scroll")
+            break
+        if should_stop and should_stop():
+            stop_reason = 'stopped'
+            break
+
+        if governor:
+            governor.acquire('scroll')
+        step_started = time.time()
+        previous = state
+        state = driver.execute_script(LOAD_STATE_JS, POST_SELECTORS, True, with_urns)
+        height = state['height']
+        while state['count'] <= previous['count']:
+            if time.time() - step_started >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+            state = driver.execute_script(LOAD_STATE_JS, POST_SELECTORS, False, with_urns)
+            height = max(height, state['height'])
+
+        steps.append({
+            'scroll': i + 1,
+            'posts': state['count'],
+            'seconds': round(time.time() - step_started, 3)
+        })
+        SCROLL_STEP_SECONDS.observe(time.time() - step_started, mode='load')
+        if state['count'] <= previous['count'] and height <= previous['height']:
+            stop_reason = 'end_of_feed'
+            break
+    else:
+        if state['count'] >= max_posts:
+            stop_reason = 'max_posts'
+
+    stats = {
+        'scrolls': len(steps),
+        'posts_loaded': state['count'],
+        'stop_reason': stop_reason,
+        'seconds': round(time.time() - started, 3),
+        'steps': steps
+    }
+    print(f"Loaded {stats['posts_loaded']} posts in {stats['scrolls']} scrolls "
+          f"({stats['seconds']}s, {stop_reason})")
+    return stats
+
 def download_media_file(driver, url, session_id, post_number, media_index):
     """Download media files with DOM capture for blob URLs"""
     try:
-        media_dir = f"linkedin_posts/media_{session_id}"
-        os.makedirs(media_dir, exist_ok=True)
-        
-        url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
+        store = get_media_store()
         
         if url.startswith('blob:'):
             print(f"DOM-based blob capture: {url[:100]}...")
@@ -162,22 +344,17 @@ def download_media_file(driver, url, session_id, post_number, media_index):
                     media_type = result.get('mediaType', 'image')
                     
                     ext = 'jpg'
-                    if media_type == 'video':
-                        filename = f"post_{post_number}_video_frame_{media_index}_{url_hash}.{ext}"
-                    else:
-                        filename = f"post_{post_number}_image_{media_index}_{url_hash}.{ext}"
-                    
-                    filepath = os.path.join(media_dir, filename)
+                    kind = 'video_frame' if media_type == 'video' else 'image'
+                    filename = media_filename(post_number, media_index, url, ext, kind)
                     
                     if ',' in data_url:
                         base64_data = data_url.split(',', 1)[1]
                         
                         import base64
-                        with open(filepath, 'wb') as f:
-                            f.write(base64.b64decode(base64_data))
+                        blob = store.put_bytes(base64.b64decode(base64_data), ext)
                         
                         print(f"DOM CAPTURE SAVED: {filename}")
-                        return f"media_{session_id}/{filename}"
+                        return store.link(blob, session_id, filename)
                     
                 return None
                     
@@ -186,46 +363,19 @@ def download_media_file(driver, url, session_id, post_number, media_index):
                 return None
                 
         else:
+            local_path = reuse_stored_media(url, session_id, post_number, media_index, store)
+            if local_path:
+                return local_path
+
             print(f"Downloading regular URL: {url[:100]}...")
             
-            cookies = driver.get_cookies()
-            cookie_dict = {cookie['name']: cookie['value'] for cookie in cookies}
-            
-            headers = {
-                'User-Agent': driver.execute_script("return navigator.userAgent"),
-                'Referer': 'https://www.linkedin.com/',
-                'Accept': '*/*'
-            }
+            cookie_dict, headers = browser_headers(driver)
             
             try:
                 response = requests.get(url, cookies=cookie_dict, headers=headers, timeout=60, stream=True)
                 
                 if response.status_code == 200:
-                    content_type = response.headers.get('content-type', '').lower()
-                    
-                    ext_map = {
-                        'video/mp4': 'mp4',
-                        'image/jpeg': 'jpg',
-                        'image/png': 'png',
-                        'image/gif': 'gif'
-                    }
-                    
-                    ext = 'mp4'
-                    for ct, extension in ext_map.items():
-                        if ct in content_type:
-                            ext = extension
-                            break
-                    
-                    filename = f"post_{post_number}_media_{media_index}_{url_hash}.{ext}"
-                    filepath = os.path.join(media_dir, filename)
-                    
-                    with open(filepath, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-                    
-                    print(f"Downloaded: {filename}")
-                    return f"media_{session_id}/{filename}"
+                    return save_media_response(response, session_id, post_number, media_index, url, store)
                     
             except Exception as req_error:
                 print(f"Request error: {req_error}")
@@ -235,32 +385,48 @@ def download_media_file(driver, url, session_id, post_number, media_index):
         print(f"Error downloading {url[:100]}: {e}")
         return None
 
-def extract_post_url_via_menu(post_element, post_number, driver):
-    """Extract post URL by URN or menu method"""
+@PERMALINK_MENU_SECONDS.timed()
+def extract_post_url_via_menu(post_element, post_number, driver, governor=None, clipboard_timeout=2.0):
+    """Extract post URL by URN or menu method
+
+    The menu method clicks through the post's menu and reads the clipboard, so it is
+    slow; scrape_posts only uses it in resolve_permalinks for posts no URN was found for.
+    A rate governor, if given, paces the menu clicks.
+    """
     try:
         urn = post_element.get_attribute("data-urn")
         if urn and "activity:" in urn:
             activity_id = urn.split("activity:")[1]
-            post_url = f"https://www.linkedin.com/feed/update/urn:li:activity:{activity_id}"
+            post_url = f"{LINKEDIN_URL}/feed/update/urn:li:activity:{activity_id}"
             print(f"Generated URL from URN: {post_url}")
             return post_url
 
         print(f"URN not found, trying menu method for post #{post_number}")
         
         try:
+            if governor:
+                governor.acquire('interact')
             menu_button = post_element.find_element(By.CSS_SELECTOR, 'button[aria-label*="menu"]')
+            # Clear the clipboard so a previous post's link is never read back
+            driver.execute_script("navigator.clipboard.writeText('').catch(() => {});")
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", menu_button)
             driver.execute_script("arguments[0].click();", menu_button)
-            time.sleep(1)
 
-            copy_button = driver.find_element(By.XPATH, "//span[contains(text(), 'Copy link')]/ancestor::button")
+            copy_button = WebDriverWait(driver, 3).until(EC.element_to_be_clickable(
+                (By.XPATH, "//span[contains(text(), 'Copy link')]/ancestor::button")
+            ))
             driver.execute_script("arguments[0].click();", copy_button)
-            time.sleep(0.5)
 
-            post_url = driver.execute_script("return navigator.clipboard.readText();")
-            if post_url and "linkedin.com" in post_url:
-                print(f"Clipboard URL: {post_url}")
-                return post_url
+            # Poll until the link lands on the clipboard instead of sleeping a fixed time
+            deadline = time.time() + clipboard_timeout
+            while True:
+                post_url = driver.execute_script("return navigator.clipboard.readText();")
+                if post_url and is_linkedin_url(post_url):
+                    print(f"Clipboard URL: {post_url}")
+                    return post_url
+                if time.time() >= deadline:
+                    break
+                time.sleep(0.1)
         except Exception as menu_error:
             print(f"Menu method failed: {menu_error}")
         
@@ -270,16 +436,226 @@ def extract_post_url_via_menu(post_element, post_number, driver):
         print(f"Error extracting post URL for post #{post_number}: {e}")
         return None
 
-def extract_post_content(post_element, post_number, driver, session_id=None):
-    """Extract detailed content from a single post, including media URLs, post permalink, and author avatar.
-    
-    Args:
-        post_element: The selenium web element for the post
-        post_number: The post number in the sequence
-        driver: The selenium webdriver instance
-        session_id: Optional session ID for media downloads
+AUTHOR_SELECTORS = [
+    '.update-components-actor__name',
+    '.feed-shared-actor__name',
+    '.update-components-actor__title',
+    'button[aria-label*="View"][aria-label*="profile"] span.visually-hidden',
+    '.feed-shared-actor__title'
+]
+
+AVATAR_SELECTORS = [
+    '.update-components-actor__image img',
+    '.feed-shared-actor__avatar img',
+    '.ivm-image-view-model img.presence-entity__image',
+    'img.feed-shared-actor__avatar-image',
+    'img.EntityPhoto-circle-3',
+    'img.EntityPhoto-circle-4',
+    'img[alt*="profile"]'
+]
+
+CONTENT_SELECTORS = [
+    'span.break-words',
+    '.feed-shared-text',
+    '.update-components-text',
+    '.attributed-text-segment-list__content',
+    '[data-attributed-text]'
+]
+
+TIME_SELECTOR = 'time, .update-components-actor__sub-description time'
+REACTIONS_SELECTOR = '.social-counts-reactions__count'
+COMMENTS_SELECTOR = '.social-counts-comments'
+ARTICLE_SELECTOR = '.update-components-article'
+
+MEDIA_SKIP_TERMS = ['avatar', 'profile', 'entity-photo', 'presence-entity', 'actor']
+
+# Best post URN for an element: its own or an ancestor's data-urn, any other attribute of
+# the element, then a permalink anchor outside nested (reshared) updates. Shared by the
+# scripts below.
+FIND_URN_JS = """
+const URN_PATTERN = /urn:li:(?:activity|ugcPost|share):\\d+/;
+// Containers of a reshared original (or any other update) nested inside a post
+const NESTED_UPDATE_SELECTOR = '[data-urn], .update-components-mini-update-v2, .feed-shared-mini-update-v2';
+const ownedBy = (post, el) => {
+    const nested = el.closest(NESTED_UPDATE_SELECTOR);
+    return !nested || nested === post || nested.contains(post);
+};
+const findUrn = (post) => {
+    const holder = post.closest('[data-urn*="urn:li:"]');
+    const own = holder ? (holder.getAttribute('data-urn') || '').match(URN_PATTERN) : null;
+    if (own) {
+        return own[0];
+    }
+    for (const attr of post.attributes) {
+        const match = attr.value.match(URN_PATTERN);
+        if (match) {
+            return match[0];
+        }
+    }
+    // Links of a reshared original point at that post, so only the post's own links count
+    for (const anchor of post.querySelectorAll('a[href*="urn:li:"], a[href*="/feed/update/"]')) {
+        const match = decodeURIComponent(anchor.getAttribute('href') || '').match(URN_PATTERN);
+        if (match && ownedBy(post, anchor)) {
+            return match[0];
+        }
+    }
+    return '';
+};
+"""
+
+# URNs of all elements passed in, in one round trip.
+DERIVE_URNS_JS = FIND_URN_JS + """
+return arguments[0].map((post) => findUrn(post));
+"""
+
+# Reads every field of every post element passed in, in a single WebDriver round trip.
+# Mirrors the per-element lookups in extract_post_content, and returns per-selector
+# [attempts, hits, milliseconds] of the candidate lists for the SelectorRegistry.
+EXTRACT_POSTS_JS = FIND_URN_JS + """
+const postElements = arguments[0];
+const selectors = arguments[1];
+const selectorStats = {
+    author: selectors.author.map(() => [0, 0, 0]),
+    avatar: selectors.avatar.map(() => [0, 0, 0]),
+    content: selectors.content.map(() => [0, 0, 0])
+};
+
+const first = (root, selector) => {
+    try {
+        return root.querySelector(selector);
+    } catch (e) {
+        return null;
+    }
+};
+const textOf = (el) => (el.innerText || el.textContent || '').trim();
+const firstValue = (post, field, read) => {
+    const candidates = selectors[field];
+    for (let i = 0; i < candidates.length; i++) {
+        const started = performance.now();
+        const el = first(post, candidates[i]);
+        const value = el ? read(el) : '';
+        const entry = selectorStats[field][i];
+        entry[0] += 1;
+        entry[2] += performance.now() - started;
+        if (value) {
+            entry[1] += 1;
+            return value;
+        }
+    }
+    return '';
+};
+
+const posts = postElements.map((post) => {
+    const fields = {
+        author_name: '',
+        author_avatar: '',
+        content: '',
+        timestamp: '',
+        engagement: {},
+        images: [],
+        videos: [],
+        has_article: false,
+        urn: findUrn(post)
+    };
+
+    fields.author_name = firstValue(post, 'author', (el) => textOf(el).split('\\n')[0]);
+    fields.author_avatar = firstValue(post, 'avatar', (el) => {
+        const src = el.src || '';
+        return src.includes('data:image') ? '' : src;
+    });
+    fields.content = firstValue(post, 'content', textOf);
+
+    const timeEl = first(post, selectors.time);
+    if (timeEl) {
+        fields.timestamp = timeEl.getAttribute('datetime') || textOf(timeEl);
+    }
+
+    const reactionsEl = first(post, selectors.reactions);
+    if (reactionsEl) {
+        fields.engagement.reactions = textOf(reactionsEl);
+    }
+    const commentsEl = first(post, selectors.comments);
+    if (commentsEl) {
+        fields.engagement.comments = textOf(commentsEl);
+    }
+
+    fields.images = Array.from(post.querySelectorAll('img')).map((img) => ({
+        src: img.src || '',
+        alt: img.getAttribute('alt') || '',
+        classes: img.getAttribute('class') || ''
+    }));
+    fields.videos = Array.from(post.querySelectorAll('video')).map((video) => video.src || '');
+    fields.has_article = !!first(post, selectors.article);
+
+    return fields;
+});
+
+return {posts: posts, selectorStats: selectorStats};
+"""
+
+def is_post_media_image(src, alt, classes):
+    """True for post images; skips avatars, profile photos and reaction icons."""
+    if not src or not any(f"{host}/dms" in src for host in MEDIA_HOSTS):
+        return False
+    if any(skip_term in classes.lower() + alt.lower() for skip_term in MEDIA_SKIP_TERMS):
+        return False
+    return 'reactions-icon' not in classes
+
+def collect_post_media(post_data, images, videos, driver, session_id=None, downloader=None):
+    """Fill media_urls, local_media_paths and post_type from (src, alt, classes) images and video srcs.
+
+    With a MediaDownloader, HTTP media is only queued and local_media_paths is filled
+    in by downloader.wait_for(); blob URLs are still captured inline from the live DOM.
     """
-    post_data = {
+    post_number = post_data['post_number']
+    media_urls = []
+    local_media_paths = []
+
+    def save(src):
+        media_index = len(media_urls)
+        if downloader and not src.startswith('blob:'):
+            downloader.submit(post_data, src, media_index, driver)
+            return
+        source = 'blob' if src.startswith('blob:') else 'http'
+        with MEDIA_DOWNLOAD_SECONDS.time(source=source):
+            local_path = download_media_file(driver, src, session_id, post_number, media_index)
+        if local_path:
+            saved_path = os.path.join(get_media_store().root, local_path)
+            if os.path.exists(saved_path):
+                MEDIA_BYTES.inc(os.path.getsize(saved_path), source=source)
+        if downloader:
+            downloader.add_local(post_data, media_index, local_path)
+        elif local_path:
+            local_media_paths.append(local_path)
+
+    for src, alt, classes in images:
+        if is_post_media_image(src, alt, classes) and src not in media_urls:
+            media_urls.append(src)
+            print(f"Added post media: {src[:50]}...")
+
+            if session_id:
+                save(src)
+
+    for src in videos:
+        if src and src not in media_urls:
+            media_urls.append(src)
+            print(f"Added video URL: {src[:50]}...")
+
+            if session_id:
+                save(src)
+
+    post_data['media_urls'] = media_urls
+
+    if local_media_paths:
+        post_data['local_media_paths'] = local_media_paths
+
+    if any('video' in url.lower() or 'mp4' in url.lower() for url in media_urls):
+        post_data['post_type'] = 'video'
+    elif media_urls:
+        post_data['post_type'] = 'image'
+
+def new_post_data(post_number):
+    return {
         'post_number': post_number,
         'content': '',
         'timestamp': '',
@@ -291,147 +667,409 @@ def extract_post_content(post_element, post_number, driver, session_id=None):
         'author_avatar': ''
     }
 
+def first_match(post_element, field, selectors, read):
+    """First non-empty read(element) over field's selectors, trying the historically best first.
+
+    Every lookup is timed and recorded in the SelectorRegistry.
+    """
+    registry = get_selector_registry()
+    for selector in registry.ordered(field, selectors):
+        started = time.time()
+        try:
+            value = read(post_element.find_element(By.CSS_SELECTOR, selector))
+        except NoSuchElementException:
+            value = ''
+        seconds = time.time() - started
+        SELECTOR_LOOKUP_SECONDS.observe(seconds, field=field, path='element')
+        registry.record(field, selector, bool(value), seconds)
+        if value:
+            return value
+    return ''
+
+def extract_post_content(post_element, post_number, driver, session_id=None, downloader=None,
+                         defer_permalink=False):
+    """Extract detailed content from a single post, including media URLs, post permalink, and author avatar.
+
+    Per-element path: one WebDriver round trip per selector tried. extract_posts_batch
+    is the faster default; this remains as its fallback.
+    
+    Args:
+        post_element: The selenium web element for the post
+        post_number: The post number in the sequence
+        driver: The selenium webdriver instance
+        session_id: Optional session ID for media downloads
+        downloader: Optional MediaDownloader that downloads media in the background
+        defer_permalink: Leave post_url empty instead of using the menu method when the
+            element has no data-urn (see resolve_permalinks)
+    """
+    post_data = new_post_data(post_number)
+
+    def author_name(element):
+        return element.text.strip().split('\n')[0]
+
+    def avatar_src(element):
+        src = element.get_attribute('src')
+        return src if src and 'data:image' not in src else ''
+
     try:
-        author_selectors = [
-            '.update-components-actor__name',
-            '.feed-shared-actor__name',
-            '.update-components-actor__title',
-            'button[aria-label*="View"][aria-label*="profile"] span.visually-hidden',
-            '.feed-shared-actor__title'
-        ]
-        
-        for selector in author_selectors:
-            try:
-                author_element = post_element.find_element(By.CSS_SELECTOR, selector)
-                author_name = author_element.text.strip()
-                if author_name:
-                    post_data['author_name'] = author_name.split('\n')[0]
-                    break
-            except NoSuchElementException:
-                continue
-        
-        avatar_selectors = [
-            '.update-components-actor__image img',
-            '.feed-shared-actor__avatar img',
-            '.ivm-image-view-model img.presence-entity__image',
-            'img.feed-shared-actor__avatar-image',
-            'img.EntityPhoto-circle-3',
-            'img.EntityPhoto-circle-4',
-            'img[alt*="profile"]'
-        ]
-        
-        for selector in avatar_selectors:
-            try:
-                avatar_img = post_element.find_element(By.CSS_SELECTOR, selector)
-                avatar_src = avatar_img.get_attribute('src')
-                if avatar_src and 'data:image' not in avatar_src:
-                    post_data['author_avatar'] = avatar_src
-                    print(f"Found avatar: {avatar_src[:50]}...")
-                    break
-            except NoSuchElementException:
-                continue
-                
+        post_data['author_name'] = first_match(post_element, 'author', AUTHOR_SELECTORS, author_name)
+        post_data['author_avatar'] = first_match(post_element, 'avatar', AVATAR_SELECTORS, avatar_src)
+        if post_data['author_avatar']:
+            print(f"Found avatar: {post_data['author_avatar'][:50]}...")
     except Exception as e:
         print(f"Could not extract author info: {e}")
 
-    content_selectors = [
-        'span.break-words',
-        '.feed-shared-text',
-        '.update-components-text',
-        '.attributed-text-segment-list__content',
-        '[data-attributed-text]'
-    ]
-    for selector in content_selectors:
-        try:
-            content_element = post_element.find_element(By.CSS_SELECTOR, selector)
-            post_data['content'] = content_element.text.strip()
-            if post_data['content']:
-                break
-        except NoSuchElementException:
-            continue
+    post_data['content'] = first_match(
+        post_element, 'content', CONTENT_SELECTORS, lambda element: element.text.strip()
+    )
 
     try:
-        time_element = post_element.find_element(By.CSS_SELECTOR, 'time, .update-components-actor__sub-description time')
+        time_element = post_element.find_element(By.CSS_SELECTOR, TIME_SELECTOR)
         post_data['timestamp'] = time_element.get_attribute('datetime') or time_element.text
     except NoSuchElementException:
         pass
 
     try:
-        reaction_element = post_element.find_element(By.CSS_SELECTOR, '.social-counts-reactions__count')
+        reaction_element = post_element.find_element(By.CSS_SELECTOR, REACTIONS_SELECTOR)
         post_data['engagement']['reactions'] = reaction_element.text.strip()
     except NoSuchElementException:
         pass
 
     try:
-        comment_element = post_element.find_element(By.CSS_SELECTOR, '.social-counts-comments')
+        comment_element = post_element.find_element(By.CSS_SELECTOR, COMMENTS_SELECTOR)
         post_data['engagement']['comments'] = comment_element.text.strip()
     except NoSuchElementException:
         pass
 
-    media_urls = []
-    local_media_paths = []
-    
-    all_images = post_element.find_elements(By.TAG_NAME, 'img')
-    for img in all_images:
-        src = img.get_attribute('src')
-        alt = img.get_attribute('alt') or ''
-        classes = img.get_attribute('class') or ''
-        
-        if src and 'media.licdn.com/dms' in src:
-            if any(skip_term in classes.lower() + alt.lower() for skip_term in 
-                   ['avatar', 'profile', 'entity-photo', 'presence-entity', 'actor']):
-                continue
-            
-            if 'reactions-icon' in classes:
-                continue
-                
-            if src not in media_urls:
-                media_urls.append(src)
-                print(f"Added post media: {src[:50]}...")
-                
-                if session_id:
-                    local_path = download_media_file(driver, src, session_id, post_number, len(media_urls))
-                    if local_path:
-                        local_media_paths.append(local_path)
-
-    all_videos = post_element.find_elements(By.TAG_NAME, 'video')
-    for video in all_videos:
-        src = video.get_attribute('src')
-        if src and src not in media_urls:
-            media_urls.append(src)
-            print(f"Added video URL: {src[:50]}...")
-            
-            if session_id:
-                local_path = download_media_file(driver, src, session_id, post_number, len(media_urls))
-                if local_path:
-                    local_media_paths.append(local_path)
-
-    post_data['media_urls'] = media_urls
-    
-    if local_media_paths:
-        post_data['local_media_paths'] = local_media_paths
+    images = [
+        (img.get_attribute('src'), img.get_attribute('alt') or '', img.get_attribute('class') or '')
+        for img in post_element.find_elements(By.TAG_NAME, 'img')
+    ]
+    videos = [video.get_attribute('src') for video in post_element.find_elements(By.TAG_NAME, 'video')]
+    collect_post_media(post_data, images, videos, driver, session_id, downloader)
 
-    if any('video' in url.lower() or 'mp4' in url.lower() for url in media_urls):
-        post_data['post_type'] = 'video'
-    elif media_urls:
-        post_data['post_type'] = 'image'
-    else:
-        article_elements = post_element.find_elements(By.CSS_SELECTOR, '.update-components-article')
+    if not post_data['media_urls']:
+        article_elements = post_element.find_elements(By.CSS_SELECTOR, ARTICLE_SELECTOR)
         if article_elements:
             post_data['post_type'] = 'article'
 
-    post_data['post_url'] = extract_post_url_via_menu(post_element, post_number, driver)
+    if defer_permalink:
+        post_data['post_url'] = post_url_from_urn(post_element.get_attribute('data-urn')) or ''
+    else:
+        post_data['post_url'] = extract_post_url_via_menu(post_element, post_number, driver)
 
-    print(f"Post #{post_number}: {post_data['post_type']} - {len(media_urls)} media files")
+    print(f"Post #{post_number}: {post_data['post_type']} - {len(post_data['media_urls'])} media files")
     if post_data['author_name']:
         print(f"Author: {post_data['author_name']}")
     
     return post_data
 
-def scrape_posts(driver, profile_url, scrolls=10, max_posts=50):
-    """Scrape posts with optional media download capability"""
+def read_posts_batch(post_elements, driver):
+    """Read the raw fields of every post element with a single execute_script call."""
+    registry = get_selector_registry()
+    selectors = {
+        'author': registry.ordered('author', AUTHOR_SELECTORS),
+        'avatar': registry.ordered('avatar', AVATAR_SELECTORS),
+        'content': registry.ordered('content', CONTENT_SELECTORS),
+        'time': TIME_SELECTOR,
+        'reactions': REACTIONS_SELECTOR,
+        'comments': COMMENTS_SELECTOR,
+        'article': ARTICLE_SELECTOR
+    }
+    with BATCH_READ_SECONDS.time():
+        result = driver.execute_script(EXTRACT_POSTS_JS, list(post_elements), selectors)
+    for field, counts in result['selectorStats'].items():
+        for selector, (attempts, hits, milliseconds) in zip(selectors[field], counts):
+            if attempts:
+                # The script only reports totals, so every lookup counts with the average time
+                SELECTOR_LOOKUP_SECONDS.observe(milliseconds / 1000 / attempts, count=attempts,
+                                                field=field, path='batch')
+                registry.record(field, selector, hits, milliseconds / 1000, attempts=attempts)
+    return result['posts']
+
+def build_post_from_fields(fields, post_element, post_number, driver, session_id=None, downloader=None,
+                           defer_permalink=False):
+    """Turn one result of read_posts_batch into the post dict extract_post_content returns."""
+    post_data = new_post_data(post_number)
+    post_data['author_name'] = fields.get('author_name') or ''
+    post_data['author_avatar'] = fields.get('author_avatar') or ''
+    post_data['content'] = fields.get('content') or ''
+    post_data['timestamp'] = fields.get('timestamp') or ''
+    post_data['engagement'] = fields.get('engagement') or {}
+
+    images = [(img['src'], img['alt'], img['classes']) for img in fields.get('images', [])]
+    collect_post_media(post_data, images, fields.get('videos', []), driver, session_id, downloader)
+
+    if not post_data['media_urls'] and fields.get('has_article'):
+        post_data['post_type'] = 'article'
+
+    post_url = post_url_from_urn(fields.get('urn'))
+    if post_url or defer_permalink:
+        post_data['post_url'] = post_url or ''
+    else:
+        post_data['post_url'] = extract_post_url_via_menu(post_element, post_number, driver)
+
+    print(f"Post #{post_number}: {post_data['post_type']} - {len(post_data['media_urls'])} media files")
+    if post_data['author_name']:
+        print(f"Author: {post_data['author_name']}")
+
+    return post_data
+
+def extract_posts_batch(post_elements, driver, session_id=None, start_number=1, downloader=None):
+    """Extract many posts with one execute_script call instead of per-field find_element calls.
+
+    Returns the same post dicts as extract_post_content. Raises if the script fails so
+    callers can fall back to the per-element path.
+    """
+    raw_posts = read_posts_batch(post_elements, driver)
+    return [
+        build_post_from_fields(fields, post_element, start_number + offset, driver, session_id, downloader)
+        for offset, (post_element, fields) in enumerate(zip(post_elements, raw_posts))
+    ]
+
+def resolve_permalinks(unresolved, driver, stats=None, governor=None):
+    """Fill post_url for (post_data, post_element) pairs extracted without one.
+
+    URNs are first derived for all of them in one script call; the slow menu method only
+    runs for posts that still have none. Counts and seconds are added to stats.
+    """
+    started = time.time()
+    derived = 0
+    menu_resolved = 0
+    remaining = []
+
+    if unresolved:
+        try:
+            urns = driver.execute_script(DERIVE_URNS_JS, [post_element for _, post_element in unresolved])
+        except Exception as e:
+            print(f"Could not derive URNs: {e}")
+            urns = [''] * len(unresolved)
+        for (post_data, post_element), urn in zip(unresolved, urns):
+            post_url = post_url_from_urn(urn)
+            if post_url:
+                post_data['post_url'] = post_url
+                derived += 1
+            else:
+                remaining.append((post_data, post_element))
+
+    for post_data, post_element in remaining:
+        post_data['post_url'] = extract_post_url_via_menu(
+            post_element, post_data['post_number'], driver, governor=governor
+        )
+        if post_data['post_url']:
+            menu_resolved += 1
+
+    if stats is not None:
+        stats['unresolved'] = stats.get('unresolved', 0) + len(unresolved)
+        stats['derived'] = stats.get('derived', 0) + derived
+        stats['menu_attempts'] = stats.get('menu_attempts', 0) + len(remaining)
+        stats['menu_resolved'] = stats.get('menu_resolved', 0) + menu_resolved
+        stats['seconds'] = round(stats.get('seconds', 0) + time.time() - started, 3)
+
+def extract_post_elements(post_elements, driver, session_id, downloader, start_number=1,
+                          batch=True, on_post=None, should_stop=None, permalink_stats=None,
+                          governor=None):
+    """Extract a list of post elements, batched when possible, skipping empty posts.
+
+    Posts without a URN get their post_url in a separate resolve_permalinks pass after
+    the rest are extracted; on_post is called for them once it is set.
+    """
+    raw_posts = None
+    if batch and post_elements:
+        try:
+            raw_posts = read_posts_batch(post_elements, driver)
+        except Exception as e:
+            print(f"Batched extraction failed, falling back to per-element: {e}")
+
+    extracted_posts = []
+    unresolved = []
+    for i, post_element in enumerate(post_elements):
+        if should_stop and should_stop():
+            break
+        post_number = start_number + i
+        started = time.time()
+        try:
+            print(f"\nProcessing post {post_number}")
+            if raw_posts is not None:
+                post_data = build_post_from_fields(
+                    raw_posts[i], post_element, post_number, driver, session_id, downloader,
+                    defer_permalink=True
+                )
+            else:
+                post_data = extract_post_content(
+                    post_element, post_number, driver, session_id, downloader, defer_permalink=True
+                )
+            EXTRACT_POST_SECONDS.observe(
+                time.time() - started, path='batch' if raw_posts is not None else 'element'
+            )
+            if post_data['content'].strip() or post_data['media_urls']:
+                extracted_posts.append(post_data)
+                POSTS_EXTRACTED.inc()
+                if not post_data['post_url']:
+                    unresolved.append((post_data, post_element))
+                elif on_post:
+                    on_post(post_data)
+        except Exception as e:
+            print(f"Skipping post #{post_number} due to error: {e}")
+            continue
+
+    if unresolved:
+        print(f"Resolving permalinks for {len(unresolved)} posts without a URN")
+        resolve_permalinks(unresolved, driver, permalink_stats, governor=governor)
+        if on_post:
+            for post_data, _ in unresolved:
+                on_post(post_data)
+    return extracted_posts
+
+RECYCLED_ATTR = 'data-scraper-done'
+
+# Returns up to `limit` loaded post elements that have not been extracted yet, with their
+# data-urns and the number still pending, optionally scrolling first. One round trip.
+WINDOW_STATE_JS = """
+const selectors = arguments[0];
+const scroll = arguments[1];
+const limit = arguments[2];
+const doneAttr = arguments[3];
+
+if (scroll) {
+    window.scrollTo(0, document.body.scrollHeight);
+}
+
+let pending = [];
+for (const selector of selectors) {
+    const found = document.querySelectorAll(selector);
+    if (found.length) {
+        pending = Array.from(found).filter((el) => !el.closest('[' + doneAttr + ']'));
+        break;
+    }
+}
+
+const window_ = pending.slice(0, limit);
+return {
+    posts: window_,
+    urns: window_.map((el) => el.getAttribute('data-urn') || ''),
+    pending: pending.length,
+    height: document.body.scrollHeight
+};
+"""
+
+# Drops the contents of extracted post nodes and hides them, so images, videos and
+# subtrees can be garbage collected while the feed keeps loading below.
+RECYCLE_POSTS_JS = """
+const doneAttr = arguments[1];
+for (const el of arguments[0]) {
+    el.setAttribute(doneAttr, '1');
+    el.replaceChildren();
+    el.style.display = 'none';
+}
+"""
+
+def extract_posts_windowed(driver, max_posts, session_id, downloader, window_size=10,
+                           max_scrolls=10, idle_timeout=3.0, poll_interval=0.25, batch=True,
+                           known_activity_ids=None, stop_after_known=3, on_post=None,
+                           should_stop=None, permalink_stats=None, governor=None):
+    """Extract posts window_size at a time while the feed loads, recycling processed nodes.
+
+    Only unprocessed posts are fetched from the page, and each extracted post node is
+    emptied and hidden, so the DOM and the browser's memory stay bounded however many
+    posts are scraped. Progress is tracked by activity id, so a post LinkedIn re-renders
+    is not extracted twice. Returns (posts, stats); stats has the shape of load_posts().
+    """
+    started = time.time()
+    extracted_posts = []
+    seen_ids = set()
+    known_loaded = 0
+    steps = []
+    scroll = False
+    stop_reason = None
+
+    while stop_reason is None:
+        if scroll and governor:
+            governor.acquire('scroll')
+        step_started = time.time()
+        state = driver.execute_script(WINDOW_STATE_JS, POST_SELECTORS, scroll, window_size, RECYCLED_ATTR)
+        if scroll:
+            # Wait for the next page of posts instead of sleeping a fixed time
+            while not state['posts'] and time.time() - step_started < idle_timeout:
+                time.sleep(poll_interval)
+                state = driver.execute_script(WINDOW_STATE_JS, POST_SELECTORS, False, window_size, RECYCLED_ATTR)
+            steps.append({
+                'scroll': len(steps) + 1,
+                'posts': len(extracted_posts) + state['pending'],
+                'seconds': round(time.time() - step_started, 3)
+            })
+            SCROLL_STEP_SECONDS.observe(time.time() - step_started, mode='windowed')
+        if not state['posts']:
+            stop_reason = 'end_of_feed'
+            break
+
+        window = []
+        for post_element, urn in zip(state['posts'], state['urns']):
+            activity_id = activity_id_from_urn(urn)
+            if activity_id:
+                if activity_id in seen_ids:
+                    continue
+                seen_ids.add(activity_id)
+                if known_activity_ids and activity_id in known_activity_ids:
+                    known_loaded += 1
+                    continue
+            window.append(post_element)
+        window = window[:max_posts - len(extracted_posts)]
+
+        extracted_posts.extend(extract_post_elements(
+            window, driver, session_id, downloader,
+            start_number=len(extracted_posts) + 1, batch=batch,
+            on_post=on_post, should_stop=should_stop, permalink_stats=permalink_stats,
+            governor=governor
+        ))
+        driver.execute_script(RECYCLE_POSTS_JS, state['posts'], RECYCLED_ATTR)
+
+        if len(extracted_posts) >= max_posts:
+            stop_reason = 'max_posts'
+        elif known_activity_ids and known_loaded >= min(stop_after_known, len(known_activity_ids)):
+            print("Reached already scraped posts, stopping")
+            stop_reason = 'known_posts'
+        elif should_stop and should_stop():
+            stop_reason = 'stopped'
+        else:
+            # Only scroll once every loaded post has been processed
+            scroll = state['pending'] <= len(state['posts'])
+            if scroll and len(steps) >= max_scrolls:
+                stop_reason = 'max_scrolls'
+
+    stats = {
+        'scrolls': len(steps),
+        'posts_loaded': len(extracted_posts),
+        'stop_reason': stop_reason,
+        'seconds': round(time.time() - started, 3),
+        'steps': steps,
+        'windowed': True
+    }
+    print(f"Extracted {len(extracted_posts)} posts in {stats['scrolls']} scrolls "
+          f"({stats['seconds']}s, {stop_reason})")
+    return extracted_posts, stats
+
+def scrape_posts(driver, profile_url, scrolls=10, max_posts=50, session_id=None,
+                 on_post=None, should_stop=None, batch=True, downloader=None,
+                 known_activity_ids=None, stop_after_known=3, scroll_idle_timeout=3.0,
+                 stats=None, window_size=None, governor=None):
+    """Scrape posts with optional media download capability
+
+    Args:
+        session_id: Media directory suffix; generated from the current time if omitted
+        batch: Read all post fields in one script call; falls back to per-element on failure
+        on_post: Optional callback invoked with each extracted post dict
+        should_stop: Optional callable; scraping stops early once it returns True
+        window_size: Extract posts this many at a time while scrolling and recycle their
+            DOM nodes (see extract_posts_windowed); for feeds of hundreds of posts
+        governor: Optional rate_governor.AccountGovernor that paces navigation, scrolls
+            and menu clicks, and is told about slow loads, empty states and challenges
+    """
     posts_url = construct_posts_url(profile_url)
+    if governor:
+        governor.acquire('navigate')
     print(f"Navigating to: {posts_url}")
+    load_started = time.time()
     driver.get(posts_url)
 
     try:
@@ -442,42 +1080,83 @@ def scrape_posts(driver, profile_url, scrolls=10, max_posts=50):
         )
     except TimeoutException:
         print("Posts didn't load.")
+        if governor:
+            governor.report('challenge' if is_logged_out_url(driver.current_url) else 'slow_load')
         return []
 
+    PAGE_LOAD_SECONDS.observe(time.time() - load_started)
+
     if driver.find_elements(By.CSS_SELECTOR, '.artdeco-empty-state'):
         print("Profile appears to have no visible posts or is private.")
+        if governor:
+            governor.report('empty_state')
         return []
+    if governor:
+        governor.report_load(time.time() - load_started)
 
-    print(f"Scrolling to load posts...")
-    for i in range(scrolls):
-        driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.END)
-        time.sleep(2)
+    if not session_id:
+        session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    post_selectors = [
-        'div.feed-shared-update-v2',
-        'div[data-urn*="activity"]',
-        '.update-components-actor'
-    ]
+    own_downloader = downloader is None
+    if own_downloader:
+        downloader = MediaDownloader(session_id)
 
-    all_posts = []
-    for selector in post_selectors:
-        posts = driver.find_elements(By.CSS_SELECTOR, selector)
-        if posts:
-            all_posts = posts
-            break
+    permalink_stats = {}
+    try:
+        if window_size:
+            print(f"Extracting posts while scrolling, {window_size} at a time...")
+            extracted_posts, scroll_stats = extract_posts_windowed(
+                driver, max_posts, session_id, downloader, window_size=window_size,
+                max_scrolls=scrolls, idle_timeout=scroll_idle_timeout, batch=batch,
+                known_activity_ids=known_activity_ids, stop_after_known=stop_after_known,
+                on_post=on_post, should_stop=should_stop, permalink_stats=permalink_stats,
+                governor=governor
+            )
+            if stats is not None:
+                stats['scroll'] = scroll_stats
+        else:
+            print(f"Scrolling to load posts...")
+            scroll_stats = load_posts(
+                driver, max_posts, max_scrolls=scrolls, idle_timeout=scroll_idle_timeout,
+                known_activity_ids=known_activity_ids, stop_after_known=stop_after_known,
+                should_stop=should_stop, governor=governor
+            )
+            if stats is not None:
+                stats['scroll'] = scroll_stats
+            if should_stop and should_stop():
+                return []
 
-    session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    extracted_posts = []
-    for i, post_element in enumerate(all_posts[:max_posts]):
-        try:
-            print(f"\nProcessing post {i+1}/{min(len(all_posts), max_posts)}")
-            post_data = extract_post_content(post_element, i + 1, driver, session_id)
-            if post_data['content'].strip() or post_data['media_urls']:
-                extracted_posts.append(post_data)
-        except Exception as e:
-            print(f"Skipping post #{i+1} due to error: {e}")
-            continue
+            all_posts = []
+            for selector in POST_SELECTORS:
+                posts = driver.find_elements(By.CSS_SELECTOR, selector)
+                if posts:
+                    all_posts = posts
+                    break
+
+            if known_activity_ids and all_posts:
+                urns = driver.execute_script(
+                    "return arguments[0].map((el) => el.getAttribute('data-urn') || '');", all_posts
+                )
+                all_posts = [
+                    post_element for post_element, urn in zip(all_posts, urns)
+                    if activity_id_from_urn(urn) not in known_activity_ids
+                ]
+                print(f"{len(all_posts)} posts not scraped before")
+
+            extracted_posts = extract_post_elements(
+                all_posts[:max_posts], driver, session_id, downloader,
+                batch=batch, on_post=on_post, should_stop=should_stop,
+                permalink_stats=permalink_stats, governor=governor
+            )
+
+        if stats is not None and permalink_stats:
+            stats['permalinks'] = permalink_stats
+
+        # Media was only queued during extraction; collect the downloaded paths now
+        downloader.wait_for(extracted_posts)
+    finally:
+        if own_downloader:
+            downloader.close()
 
     return extracted_posts
 
@@ -522,10 +1201,16 @@ def main():
     scrolls = int(input("Number of scrolls (default 10): ") or "10")
     max_posts = int(input("Max posts to extract (default 50): ") or "50")
 
+    auth_store = get_auth_store()
+    account = account_key(email, password)
+
     driver = setup_driver(headless=False)
     try:
-        login_linkedin(driver, email, password)
+        if not auth_store.restore(driver, account):
+            login_linkedin(driver, email, password, interactive=True)
         posts = scrape_posts(driver, profile_url, scrolls, max_posts)
+        # Store the (refreshed) session so the API and later runs can skip the login form
+        auth_store.save(driver, account)
         if posts:
             display_posts(posts)
             save_posts_to_file(posts)
@@ -0,0 +1,80 @@
+import os
+import json
+import threading
+from datetime import datetime
+
+from viewer import construct_posts_url, activity_id_from_urn
+
+WATERMARKS_PATH = "linkedin_posts/seen_activity.json"
+MAX_URNS_PER_PROFILE = 5000
+
+
+class ActivityWatermarks:
+    """Persistent per-profile index of activity ids that have already been scraped.
+
+    Incremental scrapes pass known_activity_ids(profile_url) to scrape_posts, which
+    stops scrolling once it reaches known posts and only extracts new ones.
+    """
+
+    def __init__(self, path=WATERMARKS_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.profiles = None
+
+    def known_activity_ids(self, profile_url):
+        self._load()
+        with self.lock:
+            entry = self.profiles.get(construct_posts_url(profile_url), {})
+            return set(entry.get("activity_ids", []))
+
+    def record(self, profile_url, posts):
+        """Add the activity ids of freshly scraped posts and persist the index."""
+        new_ids = []
+        for post in posts:
+            activity_id = activity_id_from_urn(post.get('post_url') or '')
+            if activity_id:
+                new_ids.append(activity_id)
+        if not new_ids:
+            return
+
+        self._load()
+        key = construct_posts_url(profile_url)
+        with self.lock:
+            entry = self.profiles.setdefault(key, {"activity_ids": []})
+            seen = set(entry["activity_ids"])
+            # Newest first, so the cap drops the oldest ids
+            entry["activity_ids"] = (
+                [activity_id for activity_id in new_ids if activity_id not in seen] + entry["activity_ids"]
+            )[:MAX_URNS_PER_PROFILE]
+            entry["updated_at"] = datetime.now().isoformat()
+            self._save()
+
+    def stats(self):
+        self._load()
+        with self.lock:
+            return {
+                profile: {"known_posts": len(entry["activity_ids"]), "updated_at": entry.get("updated_at")}
+                for profile, entry in self.profiles.items()
+            }
+
+    def _load(self):
+        if self.profiles is not None:
+            return
+        with self.lock:
+            if self.profiles is not None:
+                return
+            profiles = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        profiles = json.load(f)
+                except (OSError, ValueError):
+                    profiles = {}
+            self.profiles = profiles
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.profiles, f)
+        os.replace(tmp_path, self.path)
@@ -2,7 +2,7 @@
 import React, { useState } from "react";
 import URLForm from "./components/URLForm";
 import PostList from "./components/PostList";
-import { scrapePosts } from "./services/api";
+import { streamScrapePosts, cancelScrapeJob, ScrapeEvent } from "./services/api";
 import { Linkedin } from "lucide-react";
 
 interface Post {
@@ -12,6 +12,7 @@ interface Post {
   engagement?: Record<string, string>;
   post_type?: string;
   media_urls?: string[];
+  local_media_paths?: string[];
   post_url?: string;
   profile_url?: string;
   author_name?: string;
@@ -23,6 +24,8 @@ const App: React.FC = () => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [showForm, setShowForm] = useState(true);
+  const [jobId, setJobId] = useState<string | null>(null);
+  const [cancelling, setCancelling] = useState(false);
 
   // Handle file upload
   const handleFileUpload = (uploadedPosts: Post[]) => {
@@ -56,35 +59,69 @@ const App: React.FC = () => {
     setLoading(true);
     setError(null);
     setPosts([]);
+    setJobId(null);
+    setCancelling(false);
+
+    // Extract author info from URL
+    const enrichPost = (post: Post) => {
+      if (url && !post.author_name) {
+        const match = url.match(/linkedin\.com\/in\/([^\/]+)/);
+        if (match) {
+          post.author_name = match[1].replace(/-/g, ' ').replace(/\b\w/g, l => l.toUpperCase());
+        }
+      }
+      post.profile_url = url;
+      return post;
+    };
 
     try {
-      const data = await scrapePosts(email, password, [url], scrolls, maxPosts);
-      console.log('API Response:', data);
-      
-      const postsData = data.posts || [];
-      
-      // Extract author info from URL
-      const enrichedPosts = postsData.map((post: Post) => {
-        if (url && !post.author_name) {
-          const match = url.match(/linkedin\.com\/in\/([^\/]+)/);
-          if (match) {
-            post.author_name = match[1].replace(/-/g, ' ').replace(/\b\w/g, l => l.toUpperCase());
+      // Posts are shown as soon as the backend has extracted them and saved their media
+      await streamScrapePosts(email, password, [url], (event: ScrapeEvent) => {
+        if (event.event === "job") {
+          setJobId(event.job_id);
+        } else if (event.event === "post") {
+          setPosts((current) => [...current, enrichPost(event.post)]);
+          setShowForm(false); // Hide form once posts start arriving
+        } else if (event.event === "done") {
+          console.log('Scrape finished:', event);
+          if (event.status === "failed") {
+            setError(event.error || "Scrape failed.");
+          } else if (event.status === "cancelled") {
+            setShowForm(true); // Posts received before the cancel stay listed
           }
         }
-        post.profile_url = url;
-        return post;
-      });
-      
-      setPosts(enrichedPosts);
-      setShowForm(false); // Hide form after successful fetch
+      }, scrolls, maxPosts);
     } catch (err) {
       console.error('API Error:', err);
       setError("Failed to fetch posts. Please check your credentials or try again later.");
     } finally {
       setLoading(false);
+      setJobId(null);
     }
   };
 
+  // Stop the running scrape; the stream then ends with a "cancelled" done event
+  const handleCancel = async () => {
+    if (!jobId) return;
+    setCancelling(true);
+    try {
+      await cancelScrapeJob(jobId);
+    } catch (err) {
+      console.error('Cancel Error:', err);
+      setCancelling(false);
+    }
+  };
+
+  const cancelButton = jobId && (
+    <button
+      onClick={handleCancel}
+      disabled={cancelling}
+      className="text-sm text-red-600 hover:text-red-800 disabled:text-gray-400 transition-colors"
+    >
+      {cancelling ? 'Cancelling...' : 'Cancel'}
+    </button>
+  );
+
   return (
     <div className="min-h-screen bg-gray-50">
       {/* Header */}
@@ -121,11 +158,12 @@ const App: React.FC = () => {
         )}
 
         {/* Loading State */}
-        {loading && (
+        {loading && posts.length === 0 && (
           <div className="flex flex-col items-center justify-center py-20">
             <div className="w-16 h-16 border-4 border-gray-200 border-t-[#0077b5] rounded-full animate-spin mb-4"></div>
             <p className="text-gray-600">Scraping LinkedIn posts...</p>
             <p className="text-sm text-gray-500 mt-2">This may take a few moments</p>
+            <div className="mt-4">{cancelButton}</div>
           </div>
         )}
 
@@ -147,8 +185,17 @@ const App: React.FC = () => {
         )}
 
         {/* Posts Grid - Similar to MPSYCH News Section */}
-        {!loading && !error && posts.length > 0 && (
-          <PostList posts={posts} />
+        {!error && posts.length > 0 && (
+          <>
+            {loading && (
+              <div className="flex items-center space-x-3 mb-6 text-sm text-gray-600">
+                <div className="w-4 h-4 border-2 border-gray-200 border-t-[#0077b5] rounded-full animate-spin"></div>
+                <span>{posts.length} posts so far, still scraping...</span>
+                {cancelButton}
+              </div>
+            )}
+            <PostList posts={posts} />
+          </>
         )}
 
         {/* Empty State when no posts and not loading */}
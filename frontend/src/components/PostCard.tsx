@@ -1,6 +1,7 @@
 // frontend/components/PostCard.tsx
 import { useState, useEffect } from "react";
 import { Calendar, Heart, MessageCircle, Share, Image, Play, FileText, ExternalLink, User, ChevronDown, ChevronLeft, ChevronRight } from "lucide-react";
+import { mediaFileUrl, mediaSrcSet, isLocalVideo } from "../services/api";
 
 interface Post {
   post_number: number;
@@ -9,6 +10,7 @@ interface Post {
   engagement?: Record<string, string>;
   post_type?: string;
   media_urls?: string[];
+  local_media_paths?: string[];
   post_url?: string;
   profile_url?: string;
   author_name?: string;
@@ -92,12 +94,17 @@ export default function PostCard({ post, isLast = false, onScrollNext }: Props)
     return url.startsWith('blob:');
   };
 
-  const backgroundMedia = getBackgroundMediaUrls();
+  // Prefer the saved copies: the backend serves them resized and as WebP, and CDN URLs expire
+  const localMedia = (post.local_media_paths || []).filter(Boolean);
+  const usesLocalMedia = localMedia.length > 0;
+  const backgroundMedia = usesLocalMedia ? localMedia : getBackgroundMediaUrls();
   const videoUrls = getVideoUrls();
   const hasBackgroundMedia = backgroundMedia.length > 0;
   const hasVideos = videoUrls.length > 0;
   const currentBackgroundImage = hasBackgroundMedia ? backgroundMedia[currentImageIndex] : null;
-  const currentIsVideo = currentBackgroundImage ? isVideoUrl(currentBackgroundImage) : false;
+  const currentIsVideo = currentBackgroundImage
+    ? (usesLocalMedia ? isLocalVideo(currentBackgroundImage) : isVideoUrl(currentBackgroundImage))
+    : false;
   
   // Default gradient backgrounds if no background media
   const gradients = [
@@ -232,7 +239,7 @@ export default function PostCard({ post, isLast = false, onScrollNext }: Props)
                 </div>
               ) : (
                 <video
-                  src={currentBackgroundImage!}
+                  src={usesLocalMedia ? mediaFileUrl(currentBackgroundImage!) : currentBackgroundImage!}
                   className="w-full max-h-[70vh] min-h-[50vh] object-contain bg-gray-100 transition-opacity duration-500"
                   style={{
                     objectFit: 'contain',
@@ -258,7 +265,9 @@ export default function PostCard({ post, isLast = false, onScrollNext }: Props)
               )
             ) : (
               <img
-                src={currentBackgroundImage!}
+                src={usesLocalMedia ? mediaFileUrl(currentBackgroundImage!, 1080) : currentBackgroundImage!}
+                srcSet={usesLocalMedia ? mediaSrcSet(currentBackgroundImage!) : undefined}
+                sizes="100vw"
                 alt={`Background image ${currentImageIndex + 1}`}
                 className="w-full max-h-[70vh] min-h-[50vh] object-contain bg-gray-100 transition-opacity duration-500"
                 style={{
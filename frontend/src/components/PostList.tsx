@@ -1,6 +1,7 @@
 // frontend/components/PostList.tsx
 import React, { useState, useEffect, useRef } from "react";
 import PostCard from "./PostCard";
+import { mediaFileUrl, isLocalVideo } from "../services/api";
 import { Search, Download, Filter, ArrowUp, Clock, Grid3x3, Layers } from "lucide-react";
 
 interface Post {
@@ -10,6 +11,7 @@ interface Post {
   engagement?: Record<string, string>;
   post_type?: string;
   media_urls?: string[];
+  local_media_paths?: string[];
   post_url?: string;
   profile_url?: string;
   author_name?: string;
@@ -198,7 +200,17 @@ const PostList: React.FC<Props> = ({ posts }) => {
             >
               <div className="bg-white rounded-lg shadow-md hover:shadow-xl transition-all duration-300 hover:-translate-y-1 overflow-hidden h-64">
                 <div className="relative h-32 bg-gradient-to-br from-blue-400 to-indigo-600">
-                  {post.media_urls && post.media_urls[0] && (
+                  {(post.local_media_paths || []).some((path) => !isLocalVideo(path)) ? (
+                    <img
+                      src={mediaFileUrl(post.local_media_paths!.find((path) => !isLocalVideo(path))!, 640)}
+                      alt="Thumbnail"
+                      loading="lazy"
+                      className="w-full h-full object-cover"
+                      onError={(e) => {
+                        (e.target as HTMLImageElement).style.display = 'none';
+                      }}
+                    />
+                  ) : post.media_urls && post.media_urls[0] && (
                     <img
                       src={post.media_urls[0]}
                       alt="Thumbnail"
@@ -1,19 +1,68 @@
 import axios from "axios";
 const API_BASE_URL = "http://127.0.0.1:8000";
 
-export const scrapePosts = async (
+// Width buckets the backend renders image variants at (MEDIA_VARIANT_WIDTHS)
+export const MEDIA_VARIANT_WIDTHS = [320, 640, 1080];
+
+// "media_<session>/<file>" from local_media_paths -> URL of the backend's /media endpoint
+export const mediaFileUrl = (localPath: string, width?: number) => {
+  const [dir, filename] = localPath.split("/").slice(-2);
+  const url = `${API_BASE_URL}/media/${dir.replace(/^media_/, "")}/${filename}`;
+  return width ? `${url}?w=${width}` : url;
+};
+
+export const mediaSrcSet = (localPath: string) =>
+  MEDIA_VARIANT_WIDTHS.map((width) => `${mediaFileUrl(localPath, width)} ${width}w`).join(", ");
+
+export const isLocalVideo = (localPath: string) => /\.(mp4|webm|mov|m4v|avi)$/i.test(localPath);
+
+export const cancelScrapeJob = async (jobId: string) => {
+  const response = await axios.delete(`${API_BASE_URL}/jobs/${jobId}`);
+  return response.data;
+};
+
+export type ScrapeEvent = {
+  event: "job" | "progress" | "post" | "heartbeat" | "done";
+  [key: string]: any;
+};
+
+// Streams NDJSON events from /scrape so posts can be shown as soon as they are extracted
+export const streamScrapePosts = async (
   email: string,
   password: string,
   profileUrls: string[],
+  onEvent: (event: ScrapeEvent) => void,
   scrolls = 10,
   maxPosts = 50
 ) => {
-  const response = await axios.post(`${API_BASE_URL}/scrape`, {
-    email,
-    password,
-    profile_urls: profileUrls,
-    scrolls,
-    max_posts: maxPosts
+  const response = await fetch(`${API_BASE_URL}/scrape?stream=true`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "application/x-ndjson" },
+    body: JSON.stringify({
+      email,
+      password,
+      profile_urls: profileUrls,
+      scrolls,
+      max_posts: maxPosts
+    })
   });
-  return response.data;
+  if (!response.ok || !response.body) {
+    throw new Error(`Scrape request failed with HTTP ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split("\n");
+    buffer = lines.pop() || "";
+    for (const line of lines) {
+      if (line.trim()) {
+        onEvent(JSON.parse(line));
+      }
+    }
+  }
 };